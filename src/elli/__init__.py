@@ -1,18 +1,121 @@
 # Encoding: utf-8
-import sys
+from importlib import import_module as _import_module
+from typing import Any as _Any
 
-from . import database as db
-from .database.materials_db import AIR
-from .dispersions import *
 from .dispersions.base_dispersion import *
 from .experiment import Experiment
-from .importer.accurion import read_accurion_psi_delta
-from .importer.nexus import *
-from .importer.spectraray import *
-from .importer.woollam import read_woollam_psi_delta, read_woollam_rho, scale_to_nm
 from .materials import *
-from .result import Result, ResultList
+from .result import Result, ResultList, StackedResultList
 from .solver2x2 import Solver2x2
 from .solver4x4 import *
 from .structure import *
 from .utils import *
+
+# Names, which are imported from their modules on first access.
+# This keeps the import of the package fast, as the importers, the database
+# and the formula parser load several large dependencies.
+_LAZY_IMPORTS = {
+    "AIR": ".database.materials_db",
+    "Depolarization": ".depolarization",
+    "Distribution": ".depolarization",
+    "GaussianDistribution": ".depolarization",
+    "TriangularDistribution": ".depolarization",
+    "UniformDistribution": ".depolarization",
+    "detect_encoding": ".importer",
+    "read_accurion_psi_delta": ".importer.accurion",
+    "NexusGroupNames": ".importer.nexus",
+    "read_nexus_materials": ".importer.nexus",
+    "read_nexus_psi_delta": ".importer.nexus",
+    "read_nexus_rho": ".importer.nexus",
+    "read_spectraray_mmatrix": ".importer.spectraray",
+    "read_spectraray_psi_delta": ".importer.spectraray",
+    "read_spectraray_rho": ".importer.spectraray",
+    "read_woollam_psi_delta": ".importer.woollam",
+    "read_woollam_rho": ".importer.woollam",
+    "scale_to_nm": ".importer.woollam",
+    "ParallelExecution": ".parallel",
+    "ResultCache": ".result_cache",
+    "SolverSMatrix": ".solver_smatrix",
+}
+_LAZY_IMPORTS.update({name: ".dispersions" for name in dispersions.__all__})
+
+_SUBMODULES = {
+    "db": ".database",
+    "database": ".database",
+    "formula_parser": ".formula_parser",
+    "importer": ".importer",
+    "kkr": ".kkr",
+    "units": ".units",
+}
+
+__all__ = [
+    "BaseDispersion",
+    "Dispersion",
+    "DispersionCache",
+    "DispersionFactory",
+    "DispersionSum",
+    "IndexDispersion",
+    "IndexDispersionSum",
+    "InvalidParameters",
+    "Experiment",
+    "BiaxialMaterial",
+    "BruggemanEMA",
+    "IsotropicMaterial",
+    "LooyengaEMA",
+    "Material",
+    "MaxwellGarnettEMA",
+    "MixtureMaterial",
+    "SingleMaterial",
+    "UniaxialMaterial",
+    "VCAMaterial",
+    "Result",
+    "ResultList",
+    "StackedResultList",
+    "Solver",
+    "Solver2x2",
+    "Solver4x4",
+    "Propagator",
+    "PropagatorAnalytic",
+    "PropagatorEig",
+    "PropagatorExpm",
+    "PropagatorLinear",
+    "TransferMatrixCache",
+    "AbstractLayer",
+    "InhomogeneousLayer",
+    "Layer",
+    "RepeatedLayers",
+    "Structure",
+    "TwistedLayer",
+    "VaryingMixtureLayer",
+    "E_X",
+    "E_Y",
+    "E_Z",
+    "calc_pseudo_diel",
+    "calc_rho",
+    "conversion_energy2frequency",
+    "conversion_frequency2energy",
+    "conversion_wavelength_energy",
+    "conversion_wavelength_frequency",
+    "conversion_wavelength_wavenumber",
+    "convert_psi_delta_to_isotropic_mueller_matrix",
+    "get_qwp_thickness",
+    "rotation_euler",
+    "rotation_v",
+    "rotation_v_theta",
+] + list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> _Any:
+    if name in _SUBMODULES:
+        value = _import_module(_SUBMODULES[name], __name__)
+    elif name in _LAZY_IMPORTS:
+        value = getattr(_import_module(_LAZY_IMPORTS[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS) | set(_SUBMODULES))
@@ -1,2 +1,17 @@
 # Encoding: utf-8
-from .refractive_index_info import RII
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    # The database reader needs yaml and rapidfuzz, so it is only imported on first access
+    if name != "RII":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from .refractive_index_info import RII
+
+    globals()[name] = RII
+    return RII
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | {"RII"})
@@ -1,16 +1,21 @@
 # Encoding: utf-8
 """Helper class to use the refractiveindex.info database."""
 
-import io
 import os
+import pickle
 import re
-from collections import namedtuple
-from typing import List, Tuple, Union
+import tempfile
+from collections import Counter, OrderedDict, namedtuple
+from copy import deepcopy
+from hashlib import blake2b
+from typing import Any, Dict, List, Tuple, Union
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 import yaml
 from importlib_resources import files
+from importlib_resources.abc import Traversable
 from rapidfuzz import process
 
 from ..dispersions import (
@@ -33,6 +38,20 @@ WavelengthFilterType = Union[
     None, float, int, List[Union[float, int]], Tuple[Union[float, int]]
 ]
 
+# Directory of the catalog index, see load_catalog
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "pyElli",
+)
+INDEX_VERSION = 2
+
+# Number of stored suggestions of fuzzy queries per RII object, see RII.search
+SEARCH_CACHE_SIZE = 1024
+
+# Created dispersions of the database entries, see RII.get_dispersion
+DISPERSION_CACHE_SIZE = 256
+_DISPERSIONS = OrderedDict()
+
 nt_entry = namedtuple(
     "Entry",
     [
@@ -90,110 +109,24 @@ class RII:
         gold_dispersion = RII.get_dispersion("Au", "Johnson")
     """
 
-    def __init__(self) -> None:
-        self.rii_path = files("elli.database.refractiveindexinfo-database.database")
-
-        with open(self.rii_path.joinpath("catalog-nk.yml"), "r", encoding="utf8") as f:
-            yml_file = yaml.load(f, yaml.SafeLoader)
-
-        pagename_pattern = re.compile(
-            r"(?P<authors>.*) "
-            r"(?P<year>\d{4})[^:]*?: "
-            r"((?P<comment1>.*); )?"
-            r"(?P<type1>.+) (?P<lower_range1>\d+(\.\d*)?(e\W?\d+)?)\W(?P<upper_range1>\d+(\.\d*)?(e\W?\d+)?) µm"
-            r"(, (?P<type2>.+) (?P<lower_range2>\d+(\.\d*)?(e\W?\d+)?).(?P<upper_range2>\d+(\.\d*)?(e\W?\d+)?) µm)?"
-            r"(; (?P<comment2>.*))?"
-        )
-
-        entries = []
-        for sh in yml_file:
-            b_div = pd.NA
-            for b in sh["content"]:
-                if "DIVIDER" not in b:
-                    p_div = pd.NA
-                    for p in b["content"]:
-                        if "DIVIDER" not in p:
-                            infos = pagename_pattern.match(p["name"])
-                            if infos is None:
-                                entries.append(
-                                    nt_entry(
-                                        sh["SHELF"],
-                                        sh["name"],
-                                        b_div,
-                                        b["BOOK"],
-                                        b["name"],
-                                        p["PAGE"],
-                                        p_div,
-                                        None,
-                                        None,
-                                        p["name"],
-                                        None,
-                                        None,
-                                        os.path.join(
-                                            "data-nk", os.path.normpath(p["data"])
-                                        ),
-                                    )
-                                )
-                            else:
-                                entries.append(
-                                    nt_entry(
-                                        sh["SHELF"],
-                                        sh["name"],
-                                        b_div,
-                                        b["BOOK"],
-                                        b["name"],
-                                        p["PAGE"],
-                                        p_div,
-                                        infos.group("authors"),
-                                        infos.group("year"),
-                                        " ".join(
-                                            filter(
-                                                None,
-                                                (
-                                                    infos.group("comment1"),
-                                                    infos.group("comment2"),
-                                                ),
-                                            )
-                                        ),
-                                        infos.group("lower_range1"),
-                                        infos.group("upper_range1"),
-                                        os.path.join(
-                                            "data-nk", os.path.normpath(p["data"])
-                                        ),
-                                    )
-                                )
-                        else:
-                            p_div = p["DIVIDER"]
-                else:
-                    b_div = b["DIVIDER"]
+    def __init__(self, rebuild_index: bool = False) -> None:
+        """Loads the catalog of the database.
 
-        self.catalog = pd.DataFrame(entries, dtype=pd.StringDtype())
+        The parsed catalog is stored as binary index in the user's cache directory
+        (see :func:`load_catalog`), which is rebuilt if the catalog file of the database
+        has changed.
 
-        self.catalog["year"] = pd.to_numeric(
-            self.catalog["year"], errors="coerce"
-        ).convert_dtypes()
-        self.catalog["lower_range"] = 1000 * pd.to_numeric(
-            self.catalog["lower_range"], errors="coerce"
-        )
-        self.catalog["upper_range"] = 1000 * pd.to_numeric(
-            self.catalog["upper_range"], errors="coerce"
+        Args:
+            rebuild_index (bool, optional):
+                Parses the catalog file and rebuilds the index, even if it is up to date.
+                Defaults to False.
+        """
+        self.rii_path = files("elli.database.refractiveindexinfo-database.database")
+        self.catalog, self._filter_lists, self._search_index = load_catalog(
+            self.rii_path, rebuild_index
         )
-
-        book_div = self.catalog["book_divider"].drop_duplicates().dropna().values
-        books = self.catalog["book"].drop_duplicates().dropna().values
-        book_longnames = self.catalog["book_longname"].drop_duplicates().dropna().values
-        pages = self.catalog["page"].drop_duplicates().dropna().values
-        authors = self.catalog["author"].drop_duplicates().dropna().values
-        comments = self.catalog["comment"].drop_duplicates().dropna().values
-
-        self._filter_lists = {
-            "book_divider": book_div,
-            "book": books,
-            "book_longname": book_longnames,
-            "page": pages,
-            "author": authors,
-            "comment": comments,
-        }
+        self._paths = None
+        self._suggestions = OrderedDict()
 
     def search(
         self,
@@ -201,14 +134,21 @@ class RII:
         column: Union[str, List[str]] = "all",
         wavelength_filter: WavelengthFilterType = None,
         fuzzy: bool = True,
+        prefix: bool = False,
     ) -> pd.DataFrame:
         """Search the catalog by the query string in the requested column.
 
+        The search uses an index of the catalog, which is built with the catalog index
+        (see :func:`load_catalog`), and stores the suggestions of fuzzy queries,
+        so repeated and incremental queries, e.g. while typing, are fast.
+
         Args:
             query (str, List[str]): String or list of strings to search.
             column (str, optional): Column-strings or list of strings to search.
             wavelength_filter (float, int, List[float, int]): Wavelengths in nm included in the results. Default to None.
             fuzzy (bool, optional): Search approximate entries. Defaults to True.
+            prefix (bool, optional): Search entries starting with the query,
+                ignoring the case. Takes precedence over the fuzzy search. Defaults to False.
 
         Returns:
             pd.DataFrame: Filtered Catalog dataframe.
@@ -217,49 +157,79 @@ class RII:
             query = [query]
 
         if column == "all":
-            if fuzzy:
+            if fuzzy or prefix:
                 column = list(self._filter_lists.keys())
             else:
                 column = self.catalog.columns
         elif isinstance(column, str):
             column = [column]
 
-        index = self.catalog["shelf"] == ""
-
+        rows = [np.empty(0, dtype=np.intp)]
         for col in column:
             for q in query:
-                if fuzzy:
-                    suggestions = process.extract(
-                        q, self._filter_lists[col], limit=10, score_cutoff=80
+                if prefix:
+                    rows.append(self._prefix_rows(col, q))
+                elif fuzzy:
+                    rows.append(self._fuzzy_rows(col, q))
+                elif col in self._search_index["rows"]:
+                    rows.append(
+                        self._search_index["rows"][col].get(
+                            q, np.empty(0, dtype=np.intp)
+                        )
+                    )
+                else:
+                    rows.append(
+                        np.flatnonzero(
+                            (self.catalog[col] == q).fillna(False).to_numpy(bool)
+                        )
                     )
 
-                    for s, _, _ in suggestions:
-                        index = np.logical_or(index, self.catalog[col] == s)
+        # Unique rows are sorted, so the entries keep the order of the catalog
+        rows = np.unique(np.concatenate(rows))
 
-                else:
-                    index = np.logical_or(index, self.catalog[col] == q)
-
-        result = self.catalog.loc[index]
-
-        if wavelength_filter is None:
-            return result
-        elif isinstance(wavelength_filter, (int, float)):
-            return result.loc[
-                (result.lower_range <= wavelength_filter)
-                & (result.upper_range >= wavelength_filter)
-            ]
-        elif isinstance(wavelength_filter, (list, tuple, np.ndarray)):
-            for wl in wavelength_filter:
-                result = result.loc[
-                    (result["lower_range"] <= wl) & (result["upper_range"] >= wl)
-                ]
-            return result
-        else:
-            raise (
-                ValueError(
+        if wavelength_filter is not None:
+            if not isinstance(wavelength_filter, (int, float, list, tuple, np.ndarray)):
+                raise ValueError(
                     "Wavelength_filter only takes numeric values or a list of numeric values."
                 )
-            )
+
+            lower_range = self._search_index["lower_range"]
+            upper_range = self._search_index["upper_range"]
+            for wl in np.atleast_1d(wavelength_filter):
+                rows = rows[(lower_range[rows] <= wl) & (upper_range[rows] >= wl)]
+
+        return self.catalog.iloc[rows]
+
+    def _fuzzy_rows(self, column: str, query: str) -> npt.NDArray:
+        """Returns the rows of the best approximate matches of a query in a column."""
+        key = (column, query)
+        rows = self._suggestions.get(key)
+        if rows is not None:
+            return rows
+
+        suggestions = process.extract(
+            query, self._filter_lists[column], limit=10, score_cutoff=80
+        )
+        positions = self._search_index["rows"][column]
+        rows = np.concatenate(
+            [np.empty(0, dtype=np.intp)] + [positions[s] for s, _, _ in suggestions]
+        )
+
+        self._suggestions[key] = rows
+        if len(self._suggestions) > SEARCH_CACHE_SIZE:
+            self._suggestions.popitem(last=False)
+        return rows
+
+    def _prefix_rows(self, column: str, query: str) -> npt.NDArray:
+        """Returns the rows of all entries of a column starting with the query."""
+        keys, values = self._search_index["prefixes"][column]
+        query = query.lower()
+        start, stop = np.searchsorted(keys, [query, query + chr(0x10FFFF)])
+
+        positions = self._search_index["rows"][column]
+        return np.concatenate(
+            [np.empty(0, dtype=np.intp)] + [positions[v] for v in values[start:stop]]
+        )
 
     def get_mat(self, book: str, page: str) -> IsotropicMaterial:
         """Load a dispersion from the refractive index database and generates an isotropic material.
@@ -280,6 +250,11 @@ class RII:
         """Load a dispersion from the refractive index database.
         Selection by material and source identifiers.
 
+        The parsed page is stored in the cache directory (see :func:`load_catalog`)
+        and the created dispersions are kept in memory, so repeated loads of the
+        same entry do not read and parse its file again.
+        Every call returns a new dispersion object.
+
         Args:
             book (str): Name of the Material, named 'Book' on the website and the database. E.g. 'Au'
             page (str): Name of the Source, named 'Page' on the website and the database. E.g. 'Johnson'
@@ -287,196 +262,440 @@ class RII:
         Returns:
             Dispersion: A dispersion object containing the tabulated data.
         """
+        path = self._page_path(book, page)
+        stat = os.stat(str(path))
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+
+        dispersion = _DISPERSIONS.get(key)
+        if dispersion is None:
+            dispersion = _create_dispersion(self._read_page(path, key)["DATA"])
+            _DISPERSIONS[key] = dispersion
+            while len(_DISPERSIONS) > DISPERSION_CACHE_SIZE:
+                try:
+                    _DISPERSIONS.popitem(last=False)
+                except KeyError:
+                    break
+        else:
+            # The entry may have been evicted by another thread in the meantime
+            try:
+                _DISPERSIONS.move_to_end(key)
+            except KeyError:
+                pass
 
-        index = self.catalog.loc[
-            (self.catalog["book"] == book) & (self.catalog["page"] == page)
-        ].index
-
-        if len(index) != 1:
-            raise ValueError("No entry found.")
-
-        yml_file = yaml.load(
-            self.rii_path.joinpath(self.catalog.loc[index[0]]["path"]).read_text(),
-            yaml.SafeLoader,
-        )
-
-        dispersion_list = []
-        contains_index_dispersion = False
+        # The cached dispersion is never evaluated or changed, only its copies
+        return deepcopy(dispersion)
 
-        for dispersion_relation in yml_file["DATA"]:
-            if dispersion_relation["type"] == "tabulated nk":
-                df = pd.read_table(
-                    io.StringIO(dispersion_relation["data"]),
-                    sep="\\s+",
-                    names=["Wavelength", "n", "k"],
-                )
-                df["Wavelength"] = df["Wavelength"] * 1000
-                df.set_index("Wavelength", inplace=True)
+    def get_reference(self, book: str, page: str) -> str:
+        """Reads the reference information from the selected dispersion.
 
-                dispersion = Table(lbda=df.index, n=df["n"] + 1j * df["k"])
-                contains_index_dispersion = True
+        Args:
+            book (str): Name of the Material, named 'Book' on the website and the database. E.g. 'Au'
+            page (str): Name of the Source, named 'Page' on the website and the database. E.g. 'Johnson'
 
-            elif dispersion_relation["type"] == "tabulated n":
-                df = pd.read_table(
-                    io.StringIO(dispersion_relation["data"]),
-                    sep="\\s+",
-                    names=["Wavelength", "n"],
-                )
-                df["Wavelength"] = df["Wavelength"] * 1000
-                df.set_index("Wavelength", inplace=True)
+        Returns:
+            str: Reference information.
+        """
+        return self._read_page(self._page_path(book, page))["REFERENCES"]
 
-                dispersion = Table(lbda=df.index, n=df["n"])
-                contains_index_dispersion = True
+    def get_comment(self, book: str, page: str) -> str:
+        """Reads the measurement/calculation information of the selected dispersion.
 
-            elif dispersion_relation["type"] == "tabulated k":
-                df = pd.read_table(
-                    io.StringIO(dispersion_relation["data"]),
-                    sep="\\s+",
-                    names=["Wavelength", "k"],
-                )
-                df["Wavelength"] = df["Wavelength"] * 1000
-                df.set_index("Wavelength", inplace=True)
+        Args:
+            book (str): Name of the Material, named 'Book' on the website and the database. E.g. 'Au'
+            page (str): Name of the Source, named 'Page' on the website and the database. E.g. 'Johnson'
 
-                dispersion = Table(lbda=df.index, n=0 + 1j * df["k"])
-                contains_index_dispersion = True
+        Returns:
+            str: Dispersion information.
+        """
+        return self._read_page(self._page_path(book, page))["COMMENTS"]
+
+    def _page_path(self, book: str, page: str) -> Traversable:
+        """Returns the path of the file of a catalog entry."""
+        if self._paths is None:
+            entries = list(zip(self.catalog["book"], self.catalog["page"]))
+            counts = Counter(entries)
+            self._paths = {
+                entry: path
+                for entry, path in zip(entries, self.catalog["path"])
+                if counts[entry] == 1
+            }
+
+        path = self._paths.get((book, page))
+        if path is None:
+            raise ValueError("No entry found.")
+        return self.rii_path.joinpath(path)
+
+    def _read_page(self, path: Traversable, key: Tuple = None) -> Dict:
+        """Returns the parsed page, from the page cache if it is up to date."""
+        if key is None:
+            stat = os.stat(str(path))
+            key = (str(path), stat.st_mtime_ns, stat.st_size)
+
+        state = (INDEX_VERSION,) + key[1:]
+        cache_path = os.path.join(
+            _cache_dir(self.rii_path, "pages"),
+            blake2b(key[0].encode(), digest_size=16).hexdigest() + ".pkl",
+        )
 
-            elif dispersion_relation["type"] == "formula 1":
-                coeffs = list(
-                    map(float, dispersion_relation["coefficients"].split(" "))
+        parsed = _load_pickle(cache_path, state)
+        if parsed is None:
+            parsed = _parse_page(path.read_text(encoding="utf8"))
+            _store_pickle(cache_path, state, parsed)
+        return parsed
+
+
+def _parse_catalog(rii_path: Traversable) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """Parses the catalog file of the database into the catalog dataframe and
+    the lists of unique values of the searchable columns."""
+    with open(rii_path.joinpath("catalog-nk.yml"), "r", encoding="utf8") as f:
+        yml_file = yaml.load(f, yaml.SafeLoader)
+
+    pagename_pattern = re.compile(
+        r"(?P<authors>.*) "
+        r"(?P<year>\d{4})[^:]*?: "
+        r"((?P<comment1>.*); )?"
+        r"(?P<type1>.+) (?P<lower_range1>\d+(\.\d*)?(e\W?\d+)?)\W(?P<upper_range1>\d+(\.\d*)?(e\W?\d+)?) µm"
+        r"(, (?P<type2>.+) (?P<lower_range2>\d+(\.\d*)?(e\W?\d+)?).(?P<upper_range2>\d+(\.\d*)?(e\W?\d+)?) µm)?"
+        r"(; (?P<comment2>.*))?"
+    )
+
+    entries = []
+    for sh in yml_file:
+        b_div = pd.NA
+        for b in sh["content"]:
+            if "DIVIDER" not in b:
+                p_div = pd.NA
+                for p in b["content"]:
+                    if "DIVIDER" not in p:
+                        infos = pagename_pattern.match(p["name"])
+                        if infos is None:
+                            entries.append(
+                                nt_entry(
+                                    sh["SHELF"],
+                                    sh["name"],
+                                    b_div,
+                                    b["BOOK"],
+                                    b["name"],
+                                    p["PAGE"],
+                                    p_div,
+                                    None,
+                                    None,
+                                    p["name"],
+                                    None,
+                                    None,
+                                    os.path.join(
+                                        "data-nk", os.path.normpath(p["data"])
+                                    ),
+                                )
+                            )
+                        else:
+                            entries.append(
+                                nt_entry(
+                                    sh["SHELF"],
+                                    sh["name"],
+                                    b_div,
+                                    b["BOOK"],
+                                    b["name"],
+                                    p["PAGE"],
+                                    p_div,
+                                    infos.group("authors"),
+                                    infos.group("year"),
+                                    " ".join(
+                                        filter(
+                                            None,
+                                            (
+                                                infos.group("comment1"),
+                                                infos.group("comment2"),
+                                            ),
+                                        )
+                                    ),
+                                    infos.group("lower_range1"),
+                                    infos.group("upper_range1"),
+                                    os.path.join(
+                                        "data-nk", os.path.normpath(p["data"])
+                                    ),
+                                )
+                            )
+                    else:
+                        p_div = p["DIVIDER"]
+            else:
+                b_div = b["DIVIDER"]
+
+    catalog = pd.DataFrame(entries, dtype=pd.StringDtype())
+
+    catalog["year"] = pd.to_numeric(catalog["year"], errors="coerce").convert_dtypes()
+    catalog["lower_range"] = 1000 * pd.to_numeric(
+        catalog["lower_range"], errors="coerce"
+    )
+    catalog["upper_range"] = 1000 * pd.to_numeric(
+        catalog["upper_range"], errors="coerce"
+    )
+
+    book_div = catalog["book_divider"].drop_duplicates().dropna().values
+    books = catalog["book"].drop_duplicates().dropna().values
+    book_longnames = catalog["book_longname"].drop_duplicates().dropna().values
+    pages = catalog["page"].drop_duplicates().dropna().values
+    authors = catalog["author"].drop_duplicates().dropna().values
+    comments = catalog["comment"].drop_duplicates().dropna().values
+
+    filter_lists = {
+        "book_divider": book_div,
+        "book": books,
+        "book_longname": book_longnames,
+        "page": pages,
+        "author": authors,
+        "comment": comments,
+    }
+
+    return catalog, filter_lists
+
+
+def _cache_dir(rii_path: Traversable, *parts: str) -> str:
+    """Returns the directory in the cache directory, which belongs to a database."""
+    digest = blake2b(str(rii_path).encode(), digest_size=8).hexdigest()
+    return os.path.join(CACHE_DIR, f"rii-{digest}", *parts)
+
+
+def _index_path(rii_path: Traversable) -> str:
+    """Returns the path of the catalog index of a database in the cache directory."""
+    return os.path.join(_cache_dir(rii_path), "catalog.pkl")
+
+
+def _catalog_state(rii_path: Traversable) -> Tuple:
+    """Returns the values, which identify the version of the catalog and its index format."""
+    stat = os.stat(str(rii_path.joinpath("catalog-nk.yml")))
+    return INDEX_VERSION, pd.__version__, stat.st_mtime_ns, stat.st_size
+
+
+def _load_pickle(path: str, state: Tuple) -> Any:
+    """Returns the data of a cache file or None, if it is missing or outdated."""
+    try:
+        with open(path, "rb") as file:
+            stored = pickle.load(file)
+        if stored["state"] == state:
+            return stored["data"]
+    except Exception:
+        # Missing, unreadable or incompatible files are rebuilt
+        pass
+    return None
+
+
+def _store_pickle(path: str, state: Tuple, data: Any) -> None:
+    """Writes a cache file atomically. Nothing is stored, if the directory is not writable."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                pickle.dump(
+                    {"state": state, "data": data},
+                    file,
+                    protocol=pickle.HIGHEST_PROTOCOL,
                 )
-                a = coeffs[slice(1, len(coeffs), 2)]
-                b = coeffs[slice(2, len(coeffs), 2)]
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    except OSError:
+        pass
+
+
+def load_catalog(
+    rii_path: Traversable, rebuild: bool = False
+) -> Tuple[pd.DataFrame, Dict[str, np.ndarray], Dict[str, Any]]:
+    """Loads the catalog of a database from its binary index.
+
+    The index is a pickle of the parsed catalog in the cache directory
+    (``$XDG_CACHE_HOME/pyElli`` or ``~/.cache/pyElli``).
+    It is rebuilt if it is missing, if the catalog file was modified after its creation
+    or if it was written by another version of pyElli or pandas.
+    If the cache directory is not writable, the catalog is parsed without storing it.
+    The parsed pages of the database are stored next to the index in the same way.
+
+    The index can also be rebuilt from the command line:
+    ``python -m elli.database.refractive_index_info``
+
+    Args:
+        rii_path (Traversable): Path of the database.
+        rebuild (bool, optional): Rebuilds the index, even if it is up to date.
+            Defaults to False.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, np.ndarray], Dict[str, Any]]:
+            Catalog dataframe, the unique values of the searchable columns
+            and the search index (see :func:`_build_search_index`).
+    """
+    path = _index_path(rii_path)
+    state = _catalog_state(rii_path)
 
-                sell = Sellmeier()
-                for a_i, b_i in zip(a, b):
-                    sell.add(a_i, b_i**2)
+    if not rebuild:
+        index = _load_pickle(path, state)
+        if index is not None:
+            return index
 
-                dispersion = sell + EpsilonInf(coeffs[0])
+    catalog, filter_lists = _parse_catalog(rii_path)
+    index = catalog, filter_lists, _build_search_index(catalog, filter_lists)
+    _store_pickle(path, state, index)
+    return index
 
-            elif dispersion_relation["type"] == "formula 2":
-                coeffs = list(
-                    map(float, dispersion_relation["coefficients"].split(" "))
-                )
-                a = coeffs[slice(1, len(coeffs), 2)]
-                b = coeffs[slice(2, len(coeffs), 2)]
 
-                sell = Sellmeier()
-                for a_i, b_i in zip(a, b):
-                    sell.add(a_i, b_i)
+def _build_search_index(
+    catalog: pd.DataFrame, filter_lists: Dict[str, np.ndarray]
+) -> Dict[str, Any]:
+    """Builds the search index of the catalog.
 
-                dispersion = sell + EpsilonInf(coeffs[0])
+    It contains the rows of every unique value of the searchable columns,
+    their sorted lowercase values for prefix queries and the wavelength ranges
+    of all entries as float arrays.
+    """
+    rows = {}
+    prefixes = {}
+    for column, values in filter_lists.items():
+        rows[column] = {
+            value: np.asarray(positions, dtype=np.intp)
+            for value, positions in catalog.groupby(column, sort=False).indices.items()
+        }
+        keys = np.array([str(value).lower() for value in values], dtype=str)
+        order = np.argsort(keys, kind="stable")
+        prefixes[column] = (keys[order], np.asarray(values, dtype=object)[order])
+
+    return {
+        "rows": rows,
+        "prefixes": prefixes,
+        "lower_range": catalog["lower_range"].to_numpy(float, na_value=np.nan),
+        "upper_range": catalog["upper_range"].to_numpy(float, na_value=np.nan),
+    }
+
+
+def _parse_page(text: str) -> Dict:
+    """Parses the file of a database entry.
+    The tables and formula coefficients are converted into arrays and lists of floats."""
+    page = yaml.load(text, yaml.SafeLoader)
+
+    relations = []
+    for relation in page["DATA"]:
+        relation = dict(relation)
+        if relation["type"].startswith("tabulated"):
+            n_columns = len(relation["type"].split(" ")[1]) + 1
+            relation["data"] = np.array(relation["data"].split(), dtype=float).reshape(
+                -1, n_columns
+            )
+        elif "coefficients" in relation:
+            relation["coefficients"] = list(
+                map(float, str(relation["coefficients"]).split())
+            )
+        relations.append(relation)
 
-            elif dispersion_relation["type"] == "formula 3":
-                coeffs = list(
-                    map(float, dispersion_relation["coefficients"].split(" "))
-                )
-                f = coeffs[slice(1, len(coeffs), 2)]
-                e = coeffs[slice(2, len(coeffs), 2)]
+    return {
+        "REFERENCES": page.get("REFERENCES"),
+        "COMMENTS": page.get("COMMENTS"),
+        "DATA": relations,
+    }
 
-                poly = Polynomial(coeffs[0])
-                for f_i, e_i in zip(f, e):
-                    poly.add(f_i / 1e3**e_i, e_i)
 
-                dispersion = poly
+def _create_dispersion(relations: List[Dict]) -> Union[Dispersion, IndexDispersion]:
+    """Creates the dispersion of the parsed dispersion relations of a page."""
+    dispersion_list = []
+    contains_index_dispersion = False
 
-            elif dispersion_relation["type"] == "formula 4":
-                coeffs = list(
-                    map(float, dispersion_relation["coefficients"].split(" "))
-                )
-                a = coeffs[slice(1, 6, 4)]
-                e1 = coeffs[slice(2, 7, 4)]
-                b = coeffs[slice(3, 8, 4)]
-                e2 = coeffs[slice(4, 9, 4)]
-                f = coeffs[slice(9, len(coeffs), 2)]
-                e = coeffs[slice(10, len(coeffs), 2)]
+    for dispersion_relation in relations:
+        if dispersion_relation["type"] == "tabulated nk":
+            data = dispersion_relation["data"]
+            dispersion = Table(lbda=data[:, 0] * 1000, n=data[:, 1] + 1j * data[:, 2])
+            contains_index_dispersion = True
 
-                poly = Polynomial(coeffs[0])
-                sell = SellmeierCustomExponent()
+        elif dispersion_relation["type"] == "tabulated n":
+            data = dispersion_relation["data"]
+            dispersion = Table(lbda=data[:, 0] * 1000, n=data[:, 1])
+            contains_index_dispersion = True
 
-                for a_i, e1_i, b_i, e2_i in zip(a, e1, b, e2):
-                    sell.add(a_i, e1_i, b_i, e2_i)
+        elif dispersion_relation["type"] == "tabulated k":
+            data = dispersion_relation["data"]
+            dispersion = Table(lbda=data[:, 0] * 1000, n=0 + 1j * data[:, 1])
+            contains_index_dispersion = True
 
-                for f_i, e_i in zip(f, e):
-                    poly.add(f_i / 1e3**e_i, e_i)
+        elif dispersion_relation["type"] == "formula 1":
+            coeffs = dispersion_relation["coefficients"]
+            a = coeffs[slice(1, len(coeffs), 2)]
+            b = coeffs[slice(2, len(coeffs), 2)]
 
-                dispersion = poly + sell
+            sell = Sellmeier()
+            for a_i, b_i in zip(a, b):
+                sell.add(a_i, b_i**2)
 
-            elif dispersion_relation["type"] == "formula 5":
-                coeffs = list(
-                    map(float, dispersion_relation["coefficients"].split(" "))
-                )
-                f = coeffs[slice(1, len(coeffs), 2)]
-                e = coeffs[slice(2, len(coeffs), 2)]
+            dispersion = sell + EpsilonInf(coeffs[0])
 
-                cauchy = CauchyCustomExponent(coeffs[0])
-                for f_i, e_i in zip(f, e):
-                    cauchy.add(f_i / 1e3**e_i, e_i)
+        elif dispersion_relation["type"] == "formula 2":
+            coeffs = dispersion_relation["coefficients"]
+            a = coeffs[slice(1, len(coeffs), 2)]
+            b = coeffs[slice(2, len(coeffs), 2)]
 
-                dispersion = cauchy
-                contains_index_dispersion = True
+            sell = Sellmeier()
+            for a_i, b_i in zip(a, b):
+                sell.add(a_i, b_i)
 
-            else:
-                raise ValueError("Unimplemented Format.")
+            dispersion = sell + EpsilonInf(coeffs[0])
 
-            dispersion_list.append(dispersion)
+        elif dispersion_relation["type"] == "formula 3":
+            coeffs = dispersion_relation["coefficients"]
+            f = coeffs[slice(1, len(coeffs), 2)]
+            e = coeffs[slice(2, len(coeffs), 2)]
 
-        if len(dispersion_list) == 1:
-            return dispersion_list[0]
+            poly = Polynomial(coeffs[0])
+            for f_i, e_i in zip(f, e):
+                poly.add(f_i / 1e3**e_i, e_i)
 
-        if contains_index_dispersion:
-            for i, dispersion in enumerate(dispersion_list):
-                if not isinstance(dispersion, IndexDispersion):
-                    dispersion_list[i] = dispersion.as_index()
+            dispersion = poly
 
-            return IndexDispersionSum(*dispersion_list)
-        return DispersionSum(*dispersion_list)
+        elif dispersion_relation["type"] == "formula 4":
+            coeffs = dispersion_relation["coefficients"]
+            a = coeffs[slice(1, 6, 4)]
+            e1 = coeffs[slice(2, 7, 4)]
+            b = coeffs[slice(3, 8, 4)]
+            e2 = coeffs[slice(4, 9, 4)]
+            f = coeffs[slice(9, len(coeffs), 2)]
+            e = coeffs[slice(10, len(coeffs), 2)]
 
-    def get_reference(self, book: str, page: str) -> str:
-        """Reads the reference information from the selected dispersion.
+            poly = Polynomial(coeffs[0])
+            sell = SellmeierCustomExponent()
 
-        Args:
-            book (str): Name of the Material, named 'Book' on the website and the database. E.g. 'Au'
-            page (str): Name of the Source, named 'Page' on the website and the database. E.g. 'Johnson'
+            for a_i, e1_i, b_i, e2_i in zip(a, e1, b, e2):
+                sell.add(a_i, e1_i, b_i, e2_i)
 
-        Returns:
-            str: Reference information.
-        """
+            for f_i, e_i in zip(f, e):
+                poly.add(f_i / 1e3**e_i, e_i)
 
-        index = self.catalog.loc[
-            (self.catalog["book"] == book) & (self.catalog["page"] == page)
-        ].index
+            dispersion = poly + sell
 
-        if len(index) != 1:
-            raise ValueError("No entry found.")
+        elif dispersion_relation["type"] == "formula 5":
+            coeffs = dispersion_relation["coefficients"]
+            f = coeffs[slice(1, len(coeffs), 2)]
+            e = coeffs[slice(2, len(coeffs), 2)]
 
-        yml_file = yaml.load(
-            self.rii_path.joinpath(self.catalog.loc[index[0]]["path"]).read_text(),
-            yaml.SafeLoader,
-        )
+            cauchy = CauchyCustomExponent(coeffs[0])
+            for f_i, e_i in zip(f, e):
+                cauchy.add(f_i / 1e3**e_i, e_i)
 
-        return yml_file["REFERENCES"]
+            dispersion = cauchy
+            contains_index_dispersion = True
 
-    def get_comment(self, book: str, page: str) -> str:
-        """Reads the measurement/calculation information of the selected dispersion.
+        else:
+            raise ValueError("Unimplemented Format.")
 
-        Args:
-            book (str): Name of the Material, named 'Book' on the website and the database. E.g. 'Au'
-            page (str): Name of the Source, named 'Page' on the website and the database. E.g. 'Johnson'
+        dispersion_list.append(dispersion)
 
-        Returns:
-            str: Dispersion information.
-        """
+    if len(dispersion_list) == 1:
+        return dispersion_list[0]
 
-        index = self.catalog.loc[
-            (self.catalog["book"] == book) & (self.catalog["page"] == page)
-        ].index
+    if contains_index_dispersion:
+        for i, dispersion in enumerate(dispersion_list):
+            if not isinstance(dispersion, IndexDispersion):
+                dispersion_list[i] = dispersion.as_index()
 
-        if len(index) != 1:
-            raise ValueError("No entry found.")
+        return IndexDispersionSum(*dispersion_list)
+    return DispersionSum(*dispersion_list)
 
-        yml_file = yaml.load(
-            self.rii_path.joinpath(self.catalog.loc[index[0]]["path"]).read_text(),
-            yaml.SafeLoader,
-        )
 
-        return yml_file["COMMENTS"]
+if __name__ == "__main__":
+    print(f"Rebuilding the catalog index in {CACHE_DIR}")
+    RII(rebuild_index=True)
@@ -0,0 +1,239 @@
+# Encoding: utf-8
+r"""Depolarization by averaging over distributions of the experimental conditions.
+
+Real samples and instruments do not have a single thickness, angle of incidence
+and wavelength. Non-uniform layers, the angular spread of a focused beam and the
+bandwidth of the spectrometer mix the Mueller matrices of slightly different
+experiments incoherently, which depolarizes the reflected light.
+
+The :class:`Depolarization` engine integrates the Mueller matrix over
+these distributions by Gaussian quadrature. The quadrature rule follows
+from the type of the distribution:
+
+* :class:`GaussianDistribution`: Gauss–Hermite nodes,
+  e.g. for thickness non-uniformity with a standard deviation.
+* :class:`UniformDistribution`: Gauss–Legendre nodes,
+  e.g. for a cone of incidence angles or a rectangular slit function.
+* :class:`TriangularDistribution`: Gauss–Legendre nodes on both flanks,
+  e.g. for the triangular slit function of a monochromator.
+
+All nodes are evaluated in one batched solver call:
+fit parameters are varied as parameter sets, angles as angle batch and
+the bandwidth by a refined wavelength axis.
+
+.. code-block:: python
+
+    depolarization = elli.Depolarization(
+        parameters={"thickness": elli.GaussianDistribution(2)},
+        angle=elli.UniformDistribution(1),
+        bandwidth=elli.TriangularDistribution(2),
+    )
+    mueller_matrix = depolarization.evaluate(elli.Experiment(structure, lbda, 70))
+
+The angular spread is treated in the plane of incidence,
+i.e. the azimuthal rotation of the plane of incidence across the cone is neglected.
+"""
+
+from abc import ABC, abstractmethod
+from copy import copy
+from itertools import product
+from typing import Dict, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .experiment import Experiment
+from .result import _MUELLER_A, _MUELLER_A_INV
+from .solver import Solver, find_parameters
+from .solver4x4 import Solver4x4
+
+
+class Distribution(ABC):
+    """Distribution of the deviations from a nominal value, which defines its quadrature rule."""
+
+    def __init__(self, order: int = 5) -> None:
+        """Creates the distribution.
+
+        Args:
+            order (int, optional): Number of quadrature nodes. Defaults to 5.
+        """
+        if order < 1:
+            raise ValueError("The order of the quadrature needs to be at least 1.")
+        self.order = order
+
+    @abstractmethod
+    def nodes(self) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Returns the quadrature nodes and weights.
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]:
+                Deviations from the nominal value and their weights, which add up to one.
+        """
+
+
+class GaussianDistribution(Distribution):
+    """Normal distribution, integrated with Gauss–Hermite quadrature."""
+
+    def __init__(self, sigma: float, order: int = 5) -> None:
+        """Creates the distribution.
+
+        Args:
+            sigma (float): Standard deviation.
+            order (int, optional): Number of quadrature nodes. Defaults to 5.
+        """
+        super().__init__(order)
+        self.sigma = sigma
+
+    def nodes(self) -> Tuple[npt.NDArray, npt.NDArray]:
+        x, w = np.polynomial.hermite.hermgauss(self.order)
+        return np.sqrt(2) * self.sigma * x, w / np.sqrt(np.pi)
+
+
+class UniformDistribution(Distribution):
+    """Uniform distribution in [-width / 2, width / 2], integrated with Gauss–Legendre quadrature."""
+
+    def __init__(self, width: float, order: int = 5) -> None:
+        """Creates the distribution.
+
+        Args:
+            width (float): Full width of the distribution.
+            order (int, optional): Number of quadrature nodes. Defaults to 5.
+        """
+        super().__init__(order)
+        self.width = width
+
+    def nodes(self) -> Tuple[npt.NDArray, npt.NDArray]:
+        x, w = np.polynomial.legendre.leggauss(self.order)
+        return self.width / 2 * x, w / 2
+
+
+class TriangularDistribution(Distribution):
+    """Triangular distribution in [-fwhm, fwhm], integrated with
+    Gauss–Legendre quadrature on both flanks (2 x order nodes)."""
+
+    def __init__(self, fwhm: float, order: int = 5) -> None:
+        """Creates the distribution.
+
+        Args:
+            fwhm (float): Full width at half maximum, which equals the half width at the base.
+            order (int, optional): Number of quadrature nodes per flank. Defaults to 5.
+        """
+        super().__init__(order)
+        self.fwhm = fwhm
+
+    def nodes(self) -> Tuple[npt.NDArray, npt.NDArray]:
+        x, w = np.polynomial.legendre.leggauss(self.order)
+        # Nodes on [0, 1] with the density of the falling flank, mirrored for the rising flank
+        x, w = (x + 1) / 2, w / 2 * (1 - (x + 1) / 2)
+        return self.fwhm * np.concatenate([-x[::-1], x]), np.concatenate([w[::-1], w])
+
+
+class Depolarization:
+    """Averages the Mueller matrix of an experiment over distributions of
+    fit parameters, the angle of incidence and the wavelength."""
+
+    def __init__(
+        self,
+        parameters: Dict[str, Distribution] = None,
+        angle: Distribution = None,
+        bandwidth: Distribution = None,
+    ) -> None:
+        """Creates the depolarization engine.
+
+        Args:
+            parameters (Dict[str, Distribution], optional):
+                Distributions of named fit parameters of the structure,
+                e.g. lmfit Parameter objects used as layer thickness. Defaults to None.
+            angle (Distribution, optional):
+                Distribution of the angle of incidence (in degrees). Defaults to None.
+            bandwidth (Distribution, optional):
+                Distribution of the wavelength, i.e. the slit function (in nm).
+                Defaults to None.
+        """
+        self.parameters = {} if parameters is None else dict(parameters)
+        self.angle = angle
+        self.bandwidth = bandwidth
+
+    def evaluate(
+        self, experiment: Experiment, solver: Solver = Solver4x4, **solver_kwargs
+    ) -> npt.NDArray:
+        """Evaluates the depolarizing Mueller matrix for reflection.
+
+        Args:
+            experiment (Experiment): Experiment with the nominal conditions.
+            solver (Solver, optional): Choose which solver class is used. Defaults to Solver4x4.
+            solver_kwargs (optional): Keyword arguments for the Solver can be appended as arguments.
+
+        Raises:
+            ValueError: Raised if the experiment already has parameter sets
+                or a parameter is not used in the structure.
+
+        Returns:
+            npt.NDArray: Mueller matrix normalized to the m11 element,
+            with the shape of the Mueller matrix of the experiment.
+        """
+        if experiment.parameter_sets is not None:
+            raise ValueError("Experiments with parameter sets can't be depolarized.")
+
+        lbda = experiment.lbda
+        nodes = copy(experiment)
+
+        if self.parameters:
+            parameter_sets, set_weights = self._parameter_sets(experiment.structure)
+            nodes.set_parameter_sets(parameter_sets)
+
+        if self.angle is not None:
+            offsets, angle_weights = self.angle.nodes()
+            nodes.set_theta(np.asarray(experiment.theta_i)[..., None] + offsets)
+
+        if self.bandwidth is not None:
+            offsets, lbda_weights = self.bandwidth.nodes()
+            nodes.set_lbda((lbda[:, None] + offsets).ravel())
+        else:
+            lbda_weights = np.ones(1)
+
+        jones_matrix = nodes.evaluate(solver, **solver_kwargs).jones_matrix_r
+        jones_matrix = jones_matrix.reshape(
+            jones_matrix.shape[:-3] + (lbda.shape[0], lbda_weights.shape[0], 2, 2)
+        )
+
+        # Kronecker product of J* and J, which gives the Mueller matrix of every node
+        mueller_matrix = np.einsum(
+            "...ij,...kl->...ikjl", np.conjugate(jones_matrix), jones_matrix
+        ).reshape(jones_matrix.shape[:-2] + (4, 4))
+        mueller_matrix = np.real(_MUELLER_A @ mueller_matrix @ _MUELLER_A_INV)
+
+        # The axes of the nodes are: parameter sets (leading), angles (behind the angle
+        # axes of the experiment) and bandwidth (behind the wavelengths)
+        mueller_matrix = np.einsum("...bij,b->...ij", mueller_matrix, lbda_weights)
+        if self.angle is not None:
+            mueller_matrix = np.einsum(
+                "...alij,a->...lij", mueller_matrix, angle_weights
+            )
+        if self.parameters:
+            mueller_matrix = np.tensordot(set_weights, mueller_matrix, axes=(0, 0))
+
+        return mueller_matrix / mueller_matrix[..., 0, 0][..., None, None]
+
+    def _parameter_sets(
+        self, structure: "Structure"
+    ) -> Tuple[Dict[str, npt.NDArray], npt.NDArray]:
+        """Returns the parameter sets of the tensor product of the parameter distributions."""
+        values = []
+        for name, distribution in self.parameters.items():
+            parameters = find_parameters(structure, name)
+            if not parameters:
+                raise ValueError(
+                    f"Parameter '{name}' is not used in the structure. "
+                    "Use named parameters, e.g. lmfit Parameter objects, in the structure."
+                )
+            offsets, weights = distribution.nodes()
+            values.append(list(zip(parameters[0].value + offsets, weights)))
+
+        sets = list(product(*values))
+        parameter_sets = {
+            name: np.array([node[i][0] for node in sets])
+            for i, name in enumerate(self.parameters)
+        }
+        weights = np.array([np.prod([value[1] for value in node]) for node in sets])
+        return parameter_sets, weights
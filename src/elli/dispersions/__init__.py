@@ -1,23 +1,46 @@
 # Encoding: utf-8
-from .cauchy import Cauchy
-from .cauchy_custom import CauchyCustomExponent
-from .cauchy_urbach import CauchyUrbach
-from .constant_refractive_index import ConstantRefractiveIndex
-from .drude_energy import DrudeEnergy
-from .drude_resistivity import DrudeResistivity
-from .epsilon_inf import EpsilonInf
-from .gaussian import Gaussian
-from .lorentz_energy import LorentzEnergy
-from .lorentz_lambda import LorentzLambda
-from .poles import Poles
-from .polynomial import Polynomial
-from .sellmeier import Sellmeier
-from .sellmeier_custom import SellmeierCustomExponent
-from .table_epsilon import TableEpsilon
-from .table_index import Table
-from .table_spectraray import TableSpectraRay
-from .tanguy import Tanguy
-from .tauc_lorentz import TaucLorentz
-from .cody_lorentz import CodyLorentz
-from .pseudo_dielectric import PseudoDielectricFunction
-from .formula import Formula, FormulaIndex
+from importlib import import_module as _import_module
+from typing import Any
+
+# The dispersion classes are imported from their modules on first access,
+# so the formula parser and the interpolation routines are only loaded if they are used.
+_DISPERSIONS = {
+    "Cauchy": ".cauchy",
+    "CauchyCustomExponent": ".cauchy_custom",
+    "CauchyUrbach": ".cauchy_urbach",
+    "ConstantRefractiveIndex": ".constant_refractive_index",
+    "DrudeEnergy": ".drude_energy",
+    "DrudeResistivity": ".drude_resistivity",
+    "EpsilonInf": ".epsilon_inf",
+    "Gaussian": ".gaussian",
+    "LorentzEnergy": ".lorentz_energy",
+    "LorentzLambda": ".lorentz_lambda",
+    "Poles": ".poles",
+    "Polynomial": ".polynomial",
+    "Sellmeier": ".sellmeier",
+    "SellmeierCustomExponent": ".sellmeier_custom",
+    "TableEpsilon": ".table_epsilon",
+    "Table": ".table_index",
+    "TableSpectraRay": ".table_spectraray",
+    "Tanguy": ".tanguy",
+    "TaucLorentz": ".tauc_lorentz",
+    "CodyLorentz": ".cody_lorentz",
+    "PseudoDielectricFunction": ".pseudo_dielectric",
+    "Formula": ".formula",
+    "FormulaIndex": ".formula",
+}
+
+__all__ = list(_DISPERSIONS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _DISPERSIONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(_import_module(_DISPERSIONS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_DISPERSIONS))
@@ -2,8 +2,11 @@
 """Abstract base class and utility classes for pyElli dispersion"""
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from copy import deepcopy
-from typing import List, Optional, Union
+from hashlib import blake2b
+from itertools import count
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 import numpy as np
 import numpy.typing as npt
@@ -12,11 +15,126 @@ from numpy.lib.scimath import sqrt
 
 from .. import dispersions
 
+__all__ = [
+    "BaseDispersion",
+    "Dispersion",
+    "DispersionCache",
+    "DispersionFactory",
+    "DispersionSum",
+    "IndexDispersion",
+    "IndexDispersionSum",
+    "InvalidParameters",
+]
+
 
 class InvalidParameters(Exception):
     """Exception for invalid dispersion parameters."""
 
 
+_cache_tokens = count()
+
+
+def _param_value(value: Any) -> Any:
+    """Returns the value of a fit parameter, e.g. a lmfit Parameter, or the value itself."""
+    if isinstance(getattr(value, "name", None), str) and hasattr(value, "value"):
+        return value.value
+    return value
+
+
+class DispersionCache:
+    """Least recently used cache for evaluated dielectric functions.
+
+    During fits, most dispersions (substrate, ambient, fixed layers) are evaluated
+    for the same wavelengths with unchanged parameters in every iteration.
+    A dispersion with a cache returns the stored dielectric function instead.
+    The entries are keyed by a digest of the dispersion parameters
+    (the current values of fit parameters) and of the wavelength array.
+    The returned arrays are read-only, as they are shared between calls.
+
+    The cache is opt-in and can be set for single dispersions,
+    e.g. ``substrate.set_cache(cache)``, or for all dispersions,
+    by setting ``BaseDispersion.cache``. One cache can be shared by several dispersions.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """Creates an empty cache.
+
+        Args:
+            maxsize (int, optional): Maximum number of stored dielectric functions. Defaults to 128.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._store = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __deepcopy__(self, memo: dict) -> "DispersionCache":
+        # Copies of a dispersion share its cache
+        return self
+
+    def clear(self) -> None:
+        """Removes all stored dielectric functions and resets the counters."""
+        self.hits = 0
+        self.misses = 0
+        self._store.clear()
+
+    @staticmethod
+    def _digest(dispersion: "BaseDispersion", lbda: npt.ArrayLike) -> bytes:
+        hash_func = blake2b(digest_size=16)
+        for part in dispersion._cache_state():
+            hash_func.update(repr(type(part)).encode())
+            if isinstance(part, bytes):
+                hash_func.update(part)
+            elif isinstance(part, (np.ndarray, list, tuple, int, float, complex)):
+                array = np.asarray(part)
+                hash_func.update(repr((array.dtype.str, array.shape)).encode())
+                hash_func.update(np.ascontiguousarray(array).tobytes())
+            else:
+                hash_func.update(repr(part).encode())
+
+        lbda = np.ascontiguousarray(lbda, dtype=np.float64)
+        hash_func.update(repr(lbda.shape).encode())
+        hash_func.update(lbda.tobytes())
+        return hash_func.digest()
+
+    def get_dielectric(
+        self, dispersion: "BaseDispersion", lbda: npt.ArrayLike
+    ) -> npt.NDArray:
+        """Returns the dielectric function of a dispersion from the cache,
+        and evaluates and stores it, if it is missing.
+
+        Args:
+            dispersion (BaseDispersion): Dispersion to evaluate.
+            lbda (npt.ArrayLike): The wavelength window with unit nm.
+
+        Returns:
+            npt.NDArray: The dielectric function for each wavelength point.
+        """
+        key = self._digest(dispersion, lbda)
+
+        epsilon = self._store.get(key)
+        if epsilon is not None:
+            self.hits += 1
+            # The entry may have been evicted by another thread in the meantime
+            try:
+                self._store.move_to_end(key)
+            except KeyError:
+                pass
+            return epsilon
+
+        self.misses += 1
+        epsilon = np.array(dispersion.dielectric_function(lbda), dtype=np.complex128)
+        epsilon.flags.writeable = False
+
+        self._store[key] = epsilon
+        while len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
+
+        return epsilon
+
+
 class BaseDispersion(ABC):
     """BaseDispersion (abstract class).
 
@@ -25,6 +143,7 @@ class BaseDispersion(ABC):
     """
 
     default_lbda_range = np.linspace(200, 1000, 801)
+    cache: Optional[DispersionCache] = None
 
     @property
     @abstractmethod
@@ -110,10 +229,54 @@ class BaseDispersion(ABC):
 
         return self
 
+    def set_cache(self, cache: Optional[DispersionCache]) -> None:
+        """Sets a cache for the evaluated dielectric functions of this dispersion.
+
+        Args:
+            cache (Optional[DispersionCache]): Cache object, None disables caching.
+        """
+        self.cache = cache
+
+    def _cache_state(self) -> Iterator[Any]:
+        """Yields everything the dielectric function depends on, to build the cache key."""
+        if "_cache_token" not in self.__dict__:
+            self._cache_token = next(_cache_tokens)
+        yield type(self).__name__
+        yield self._cache_token
+
+        for params in [self.single_params] + self.rep_params:
+            for key, value in params.items():
+                yield key
+                yield _param_value(value)
+
+    def _stacked_rep_params(self, ndim: int = 1) -> Dict[str, npt.NDArray]:
+        """Returns the repeated parameters stacked into arrays of shape (oscillators x 1 x ...).
+
+        They broadcast against the wavelength array, so all oscillators are evaluated
+        in one expression, which is then summed along the first axis.
+
+        Args:
+            ndim (int, optional): Number of dimensions of the wavelength array. Defaults to 1.
+
+        Returns:
+            Dict[str, npt.NDArray]: Array of the values for every repeated parameter.
+        """
+        shape = (len(self.rep_params),) + (1,) * ndim
+        stacked = {}
+        for key in self.rep_params_template:
+            values = [_param_value(params[key]) for params in self.rep_params]
+            stacked[key] = np.array(
+                values, dtype=np.result_type(float, *values)
+            ).reshape(shape)
+        return stacked
+
     def get_dielectric(self, lbda: Optional[npt.ArrayLike] = None) -> npt.NDArray:
         """Returns the dielectric constant for wavelength 'lbda' default unit (nm)
-        in the convention ε1 + iε2."""
+        in the convention ε1 + iε2.
+        If a :class:`DispersionCache` is set, the result is read from the cache."""
         lbda = self.default_lbda_range if lbda is None else lbda
+        if self.cache is not None:
+            return self.cache.get_dielectric(self, lbda)
         return np.asarray(self.dielectric_function(lbda), dtype=np.complex128)
 
     def get_refractive_index(self, lbda: Optional[npt.ArrayLike] = None) -> npt.NDArray:
@@ -364,6 +527,11 @@ class DispersionSum(Dispersion):
         self.dispersions.append(other)
         return self
 
+    def _cache_state(self) -> Iterator[Any]:
+        yield from super()._cache_state()
+        for disp in self.dispersions:
+            yield from disp._cache_state()
+
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
         dielectric_function = sum(
             disp.dielectric_function(lbda) for disp in self.dispersions
@@ -409,6 +577,11 @@ class IndexDispersionSum(IndexDispersion):
         self.index_dispersions.append(other)
         return self
 
+    def _cache_state(self) -> Iterator[Any]:
+        yield from super()._cache_state()
+        for disp in self.index_dispersions:
+            yield from disp._cache_state()
+
     def refractive_index(self, lbda: npt.ArrayLike) -> npt.NDArray:
         refractive_index = sum(
             disp.refractive_index(lbda) for disp in self.index_dispersions
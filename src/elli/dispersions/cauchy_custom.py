@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Cauchy dispersion with custom exponents."""
 
+import numpy as np
 import numpy.typing as npt
 
 from .base_dispersion import IndexDispersion
@@ -26,6 +27,5 @@ class CauchyCustomExponent(IndexDispersion):
     rep_params_template = {"f": 0, "e": 1}
 
     def refractive_index(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        return self.single_params.get("n0") + sum(
-            c.get("f") * lbda ** c.get("e") for c in self.rep_params
-        )
+        osc = self._stacked_rep_params(np.ndim(lbda))
+        return self.single_params.get("n0") + (osc["f"] * lbda ** osc["e"]).sum(axis=0)
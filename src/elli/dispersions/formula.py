@@ -7,7 +7,7 @@ import numpy.typing as npt
 
 from elli.units import ureg
 from elli.dispersions.base_dispersion import BaseDispersion, Dispersion, IndexDispersion
-from elli.formula_parser.parser import parse_formula, FormulaTransformer
+from elli.formula_parser.parser import compile_formula, parse_formula
 
 
 class FormulaParser(BaseDispersion):
@@ -109,12 +109,9 @@ class FormulaParser(BaseDispersion):
             )
 
     def __dispersion_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        return FormulaTransformer(
-            x_axis_name=self.f_axis_name,
-            x_axis_values=lbda,
-            single_params=self.single_params,
-            repeated_params=self.rep_params_dl,
-        ).transform(parse_formula(self.formula))[1]
+        return compile_formula(self.formula, self.f_axis_name)(
+            lbda, self.single_params, self.rep_params_dl
+        )[1]
 
 
 class Formula(Dispersion, FormulaParser):
@@ -54,20 +54,18 @@ class Gaussian(Dispersion):
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
         energy = conversion_wavelength_energy(lbda)
         ftos = 2 * sqrt(np.log(2))
-        return sum(
+        osc = self._stacked_rep_params(np.ndim(energy))
+        return (
             2
-            * c.get("A")
+            * osc["A"]
             / sqrt(np.pi)
             * (
-                dawsn(ftos * (energy + c.get("E")) / c.get("sigma"))
-                - dawsn(ftos * (energy - c.get("E")) / c.get("sigma"))
+                dawsn(ftos * (energy + osc["E"]) / osc["sigma"])
+                - dawsn(ftos * (energy - osc["E"]) / osc["sigma"])
             )
             + 1j
             * (
-                c.get("A")
-                * np.exp(-((ftos * (energy - c.get("E")) / c.get("sigma")) ** 2))
-                - c.get("A")
-                * np.exp(-((ftos * (energy + c.get("E")) / c.get("sigma")) ** 2))
+                osc["A"] * np.exp(-((ftos * (energy - osc["E"]) / osc["sigma"]) ** 2))
+                - osc["A"] * np.exp(-((ftos * (energy + osc["E"]) / osc["sigma"]) ** 2))
             )
-            for c in self.rep_params
-        )
+        ).sum(axis=0)
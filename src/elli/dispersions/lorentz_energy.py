@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Lorentz dispersion law with parameters in units of energy."""
 
+import numpy as np
 import numpy.typing as npt
 
 from ..utils import conversion_wavelength_energy
@@ -31,7 +32,7 @@ class LorentzEnergy(Dispersion):
 
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
         energy = conversion_wavelength_energy(lbda)
-        return 1 + sum(
-            c.get("A") / (c.get("E") ** 2 - energy**2 - 1j * c.get("gamma") * energy)
-            for c in self.rep_params
-        )
+        osc = self._stacked_rep_params(np.ndim(energy))
+        return 1 + (
+            osc["A"] / (osc["E"] ** 2 - energy**2 - 1j * osc["gamma"] * energy)
+        ).sum(axis=0)
@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Polynomial dispersion."""
 
+import numpy as np
 import numpy.typing as npt
 
 from .base_dispersion import Dispersion
@@ -26,6 +27,5 @@ class Polynomial(Dispersion):
     rep_params_template = {"f": 0, "e": 0}
 
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        return self.single_params.get("e0") + sum(
-            c.get("f") * lbda ** c.get("e") for c in self.rep_params
-        )
+        osc = self._stacked_rep_params(np.ndim(lbda))
+        return self.single_params.get("e0") + (osc["f"] * lbda ** osc["e"]).sum(axis=0)
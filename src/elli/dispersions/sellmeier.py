@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Sellmeier dispersion."""
 
+import numpy as np
 import numpy.typing as npt
 
 from .base_dispersion import Dispersion
@@ -29,6 +30,5 @@ class Sellmeier(Dispersion):
 
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
         lbda = lbda / 1e3
-        return 1 + sum(
-            c.get("A") * lbda**2 / (lbda**2 - c.get("B")) for c in self.rep_params
-        )
+        osc = self._stacked_rep_params(np.ndim(lbda))
+        return 1 + (osc["A"] * lbda**2 / (lbda**2 - osc["B"])).sum(axis=0)
@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Sellmeier dispersion."""
 
+import numpy as np
 import numpy.typing as npt
 
 from .base_dispersion import Dispersion
@@ -31,7 +32,7 @@ class SellmeierCustomExponent(Dispersion):
 
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
         lbda = lbda / 1e3
-        return sum(
-            c.get("A") * lbda ** c.get("e_A") / (lbda**2 - c.get("B") ** c.get("e_B"))
-            for c in self.rep_params
+        osc = self._stacked_rep_params(np.ndim(lbda))
+        return (osc["A"] * lbda ** osc["e_A"] / (lbda**2 - osc["B"] ** osc["e_B"])).sum(
+            axis=0
         )
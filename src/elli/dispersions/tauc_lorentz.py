@@ -54,19 +54,17 @@ class TaucLorentz(Dispersion):
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
         energy = conversion_wavelength_energy(lbda)
         energy_g = self.single_params.get("Eg")
-        return sum(
-            (
-                1j
-                * (
-                    c.get("A")
-                    * c.get("E")
-                    * c.get("C")
-                    * (energy - energy_g) ** 2
-                    / ((energy**2 - c.get("E") ** 2) ** 2 + c.get("C") ** 2 * energy**2)
-                    / energy
-                )
-                * np.heaviside(energy - energy_g, 0)
-                + self.eps1(energy, energy_g, c.get("A"), c.get("E"), c.get("C"))
+        osc = self._stacked_rep_params(np.ndim(energy))
+        return (
+            1j
+            * (
+                osc["A"]
+                * osc["E"]
+                * osc["C"]
+                * (energy - energy_g) ** 2
+                / ((energy**2 - osc["E"] ** 2) ** 2 + osc["C"] ** 2 * energy**2)
+                / energy
             )
-            for c in self.rep_params
-        )
+            * np.heaviside(energy - energy_g, 0)
+            + self.eps1(energy, energy_g, osc["A"], osc["E"], osc["C"])
+        ).sum(axis=0)
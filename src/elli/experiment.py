@@ -5,9 +5,13 @@ It requires a Structure to evaluate and includes the information about
 the incident light beam:
 
 * the wavelengths :math:`\lambda`
-* the incidence angle :math:`\theta_\text{i}`
+* the incidence angle :math:`\theta_\text{i}` (single value or an array of angles)
 * and the polarization, which can be given by a Jones or Stokes vector
 
+Optionally, a table of parameter sets can be given, to evaluate the structure
+for many values of its fit parameters in one batch,
+e.g. for library generation or sensitivity studies.
+
 The evaluate method can be called, to start the calculation of the optical properties.
 To choose a Solver to be used in the calculation, the solver class is provided
 as an argument and an object will be created automatically.
@@ -16,8 +20,12 @@ The experiment class is only needed in special cases an can be skipped by callin
 :meth:`elli.structure.Structure.evaluate`.
 """
 
+from copy import copy
+from typing import Dict, Union
+
 import numpy as np
 import numpy.typing as npt
+import pandas as pd
 
 from .result import Result
 from .solver import Solver
@@ -32,27 +40,33 @@ class Experiment:
     stokes_vector = None
     theta_i = None
     lbda = None
+    parameter_sets = None
 
     def __init__(
         self,
         structure: "Structure",
         lbda: npt.ArrayLike,
-        theta_i: float,
+        theta_i: Union[float, npt.ArrayLike],
         vector: npt.ArrayLike = None,
+        parameter_sets: Union[pd.DataFrame, Dict[str, npt.ArrayLike]] = None,
     ) -> None:
         """Creates a virtual experiment to simulate the behavior of a structure.
 
         Args:
             structure (Structure): Structure object to evaluate.
             lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
-            theta_i (float): Incident angle (in degrees).
+            theta_i (Union[float, npt.ArrayLike]):
+                Single value or array of incident angles (in degrees).
             vector (npt.ArrayLike, optional):
                 Jones or Stokes vector of incident light. Defaults to diagonal polarization ([1, 0, 1, 0]).
+            parameter_sets (Union[pd.DataFrame, Dict[str, npt.ArrayLike]], optional):
+                Table of parameter sets to evaluate the structure for. Defaults to None.
         """
         self.set_structure(structure)
         self.set_theta(theta_i)
         self.set_lbda(lbda)
         self.set_vector(vector)
+        self.set_parameter_sets(parameter_sets)
 
     def set_structure(self, structure: "Structure") -> None:
         """Defines the Structure to evaluate.
@@ -130,12 +144,17 @@ class Experiment:
 
             self.jones_vector = np.array([a, b])
 
-    def set_theta(self, theta_i: float) -> None:
+    def set_theta(self, theta_i: Union[float, npt.ArrayLike]) -> None:
         """Set incident angle to evaluate.
 
         Args:
-            theta_i (float): Incident angle (in degrees).
+            theta_i (Union[float, npt.ArrayLike]):
+                Single value or array of incident angles (in degrees).
+                For an array of angles, all angles are evaluated in one batch
+                and the result gets an additional leading angle axis.
         """
+        if np.ndim(theta_i) > 0:
+            theta_i = np.asarray(theta_i, dtype=np.float64)
         self.theta_i = theta_i
 
     def set_lbda(self, lbda: npt.ArrayLike) -> None:
@@ -149,15 +168,92 @@ class Experiment:
             lbda_array = np.asarray([lbda])
         self.lbda = lbda_array
 
-    def evaluate(self, solver: Solver = Solver4x4, **solver_kwargs) -> Result:
+    def set_parameter_sets(
+        self, parameter_sets: Union[pd.DataFrame, Dict[str, npt.ArrayLike]]
+    ) -> None:
+        """Set a table of parameter sets to evaluate the structure for.
+
+        The structure is used as a template, which contains named fit parameters,
+        e.g. lmfit Parameter objects used as layer thickness or dispersion parameter.
+        Every row of the table replaces their values by the values in the columns
+        with the same name. All parameter sets are evaluated in one batch
+        and the result gets an additional leading axis for the parameter sets.
+        The parameter sets must not change the sequence of layers of the structure.
+
+        Args:
+            parameter_sets (Union[pd.DataFrame, Dict[str, npt.ArrayLike]]):
+                DataFrame or dict with the parameter names as columns or keys
+                and one value per parameter set. None disables the batch evaluation.
+        """
+        if parameter_sets is None:
+            self.parameter_sets = None
+            return
+
+        parameter_sets = {
+            str(name): np.array(values, dtype=np.float64).ravel()
+            for name, values in dict(parameter_sets).items()
+        }
+        lengths = {values.shape[0] for values in parameter_sets.values()}
+        if len(lengths) != 1 or 0 in lengths:
+            raise ValueError("All parameters need the same, non-zero number of values.")
+        self.parameter_sets = parameter_sets
+
+    def snapshot(self) -> "Experiment":
+        """Returns a lightweight copy of the experiment, which is used by the solvers.
+
+        The structure is replaced by its :meth:`snapshot<elli.structure.Structure.snapshot>`
+        and the arrays of the experimental conditions are copied and made read-only,
+        so later changes of the experiment do not affect a calculated result.
+        Materials and dispersions are not copied.
+
+        Returns:
+            Experiment: Copy of the experiment.
+        """
+        snapshot = copy(self)
+        snapshot.structure = self.structure.snapshot()
+
+        for name in ["lbda", "theta_i", "jones_vector", "stokes_vector"]:
+            value = getattr(self, name)
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+                value.flags.writeable = False
+                setattr(snapshot, name, value)
+
+        if self.parameter_sets is not None:
+            snapshot.parameter_sets = dict(self.parameter_sets)
+
+        return snapshot
+
+    def evaluate(
+        self,
+        solver: Solver = Solver4x4,
+        execution: "ParallelExecution" = None,
+        result_cache: "ResultCache" = None,
+        **solver_kwargs,
+    ) -> Result:
         """Evaluates the experiment with the given solver.
 
         Args:
             solver (Solver, optional): Choose which solver class is used. Defaults to Solver4x4.
+            execution (ParallelExecution, optional):
+                Splits the wavelength axis into chunks, which are solved concurrently
+                (see :class:`ParallelExecution<elli.parallel.ParallelExecution>`).
+                Defaults to None, which solves the experiment in the calling thread.
+            result_cache (ResultCache, optional):
+                Returns stored results of identical evaluations without solving them again
+                (see :class:`ResultCache<elli.result_cache.ResultCache>`). Defaults to None.
             solver_kwargs (optional): Keyword arguments for the Solver can be appended as arguments.
 
         Returns:
             Result: Result of the experiment.
         """
+        if result_cache is not None:
+            return result_cache.evaluate(
+                self, solver, execution=execution, **solver_kwargs
+            )
+
+        if execution is not None:
+            return execution.evaluate(self, solver, **solver_kwargs)
+
         solv = solver(self, **solver_kwargs)
         return solv.calculate()
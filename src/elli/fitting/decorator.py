@@ -2,7 +2,10 @@
 
 # Encoding: utf-8
 from abc import ABC, abstractmethod
+from typing import Callable, Dict, List
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
 try:
@@ -15,6 +18,8 @@ except ImportError as e:
         "i.e. pip install pyElli[fitting]"
     ) from e
 
+from ..result import Result
+from ..solver import find_parameters
 from .params_hist import ParamsHist
 
 
@@ -94,6 +99,93 @@ class FitDecorator(ABC):
         """
         self.get_model_data(params, append_exp_data).to_csv(fname, *args, **kwargs)
 
+    def _analytic_parameters(self, params: Parameters, result: Result) -> List[str]:
+        """Returns the varying parameters, which are differentiated by the solver."""
+        if not isinstance(result, Result) or result.solver is None:
+            return []
+
+        structure = result.solver.structure
+        if any(
+            find_parameters(structure, param) for param in params if params[param].expr
+        ):
+            return []
+
+        return [
+            param
+            for param in params
+            if params[param].vary
+            and not params[param].expr
+            and find_parameters(structure, param)
+        ]
+
+    def _jacobian_kwargs(
+        self, method: str, jacobian: bool, lbda: npt.NDArray
+    ) -> Dict[str, Callable]:
+        """Returns the keyword arguments of lmfit to use the jacobian of the solver.
+
+        The jacobian is only used for the 'leastsq' method and
+        if at least one parameter is differentiated by the solver.
+        Otherwise, lmfit estimates the derivatives itself.
+        """
+        if not jacobian or method != "leastsq":
+            return {}
+        if not self._analytic_parameters(self.params, self.model(lbda, self.params)):
+            return {}
+        return {"Dfun": self.fit_jacobian}
+
+    def model_jacobian(
+        self, params: Parameters, lbda: npt.NDArray, name: str, step: float = 1e-6
+    ) -> npt.NDArray:
+        """Calculates the derivatives of a property of the model
+        with respect to all varying fitting parameters.
+
+        Parameters, which are directly used in the structure of the model result,
+        are differentiated by the solver (see :meth:`elli.result.Result.jacobian`)
+        with a single evaluation of the model.
+        Every occurrence of such a parameter in the structure has to be the Parameter
+        object itself, e.g. ``elli.Layer(material, params["d"])``.
+        Values calculated from a parameter, e.g. ``params["d"] * 0.5``, are plain numbers
+        and their contribution to the derivative is missed.
+
+        All other parameters, e.g. parameters only used in calculations
+        or if constrained parameters are used in the structure,
+        are differentiated by forward differences of the model.
+
+        Args:
+            params (Parameters): The lmfit fitting Parameters to construct the simulation
+            lbda (npt.NDArray): Wavelengths in nm
+            name (str): Name of the result property, e.g. 'rho' or 'mueller_matrix'.
+            step (float, optional): Relative step size for the differences.
+                Defaults to 1e-6.
+
+        Returns:
+            npt.NDArray: Derivatives of the property with a leading parameter axis.
+        """
+        var_names = [
+            param for param in params if params[param].vary and not params[param].expr
+        ]
+        result = self.model(lbda, params)
+        analytic = self._analytic_parameters(params, result)
+
+        derivatives = dict(zip(analytic, result.jacobian(name, analytic, step)))
+        value = getattr(result, name)
+
+        for param in var_names:
+            if param in derivatives:
+                continue
+
+            shifted = params.copy()
+            shifted[param].value = params[param].value + step * max(
+                abs(params[param].value), 1
+            )
+            shifted.update_constraints()
+
+            derivatives[param] = (getattr(self.model(lbda, shifted), name) - value) / (
+                shifted[param].value - params[param].value
+            )
+
+        return np.array([derivatives[param] for param in var_names])
+
     @abstractmethod
     def fit(self, method: str = "") -> None:
         """Execute lmfit with the current fitting parameters
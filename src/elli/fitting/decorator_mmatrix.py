@@ -175,13 +175,37 @@ class FitMuellerMatrix(FitDecorator):
             - self.model(lbda, params).mueller_matrix
         )
 
-    def fit(self, method: str = "leastsq") -> MinimizerResult:
+    def fit_jacobian(
+        self, params: Parameters, lbda: npt.NDArray, mueller_matrix: pd.DataFrame
+    ) -> npt.NDArray:
+        """The jacobian of the fit function with respect to the varying parameters
+
+        Args:
+            params (Parameters): The lmfit fitting Parameters to construct the simulation
+            lbda (npt.NDArray): Wavelengths in nm
+            mueller_matrix (pd.DataFrame): The experimental data to compare to the fitted model
+
+        Returns:
+            npt.NDArray: Derivatives of the residual (residuals x parameters)
+        """
+        d_mueller_matrix = self.model_jacobian(params, lbda, "mueller_matrix")
+
+        return -d_mueller_matrix.reshape(len(d_mueller_matrix), -1).T
+
+    def fit(self, method: str = "leastsq", jacobian: bool = False) -> MinimizerResult:
         """Execute lmfit with the current fitting parameters
 
         Args:
             method (str, optional): The fitting method to use.
                 Any method supported by scipys curve_fit is allowed.
                 Defaults to 'leastsq'.
+            jacobian (bool, optional): Provides the derivatives calculated by the solver
+                to the 'leastsq' method, instead of estimating them by finite differences.
+                Every occurrence of a fitted parameter in the structure has to be
+                the Parameter object itself, e.g. ``elli.Layer(material, params["d"])``,
+                as the derivatives of values calculated from it are missed.
+                If no parameter is used directly, lmfit estimates the derivatives.
+                Defaults to False.
 
         Returns:
             Result: The fitting result
@@ -191,6 +215,7 @@ class FitMuellerMatrix(FitDecorator):
             self.params,
             args=(self.exp_mm.index.values, self.exp_mm),
             method=method,
+            **self._jacobian_kwargs(method, jacobian, self.exp_mm.index.values),
         )
 
         self.fitted_params = res.params
@@ -257,13 +257,45 @@ class FitRho(FitDecorator):
 
         return np.concatenate((resid_rhor, resid_rhoi))
 
-    def fit(self, method="leastsq"):
+    def fit_jacobian(
+        self,
+        params: Parameters,
+        lbda: npt.NDArray,
+        rhor: npt.NDArray,
+        rhoi: npt.NDArray,
+    ) -> npt.NDArray:
+        """The jacobian of the fit function with respect to the varying parameters
+
+        Args:
+            params (Parameters):
+                The lmfit fitting Parameters to construct the simulation
+            lbda (npt.NDArray): Wavelengths in nm
+            rhor (npt.NDArray): The real part of the experimental rho
+            rhoi (npt.NDArray): The imaginary part of the experimental rho
+
+        Returns:
+            npt.NDArray: Derivatives of the residual (residuals x parameters)
+        """
+        d_rho = self.model_jacobian(params, lbda, "rho")
+
+        return -np.concatenate((d_rho.real, d_rho.imag), axis=1).T
+
+    def fit(self, method="leastsq", jacobian: bool = False):
         """Execute lmfit with the current fitting parameters
 
         Args:
             method (str, optional): The fitting method to use.
                                     Any method supported by scipys curve_fit is allowed.
                                     Defaults to 'leastsq'.
+            jacobian (bool, optional): Provides the derivatives calculated by the solver
+                                       to the 'leastsq' method, instead of estimating
+                                       them by finite differences.
+                                       Every occurrence of a fitted parameter in the
+                                       structure has to be the Parameter object itself,
+                                       e.g. ``elli.Layer(material, params["d"])``,
+                                       as the derivatives of values calculated from it
+                                       are missed. If no parameter is used directly,
+                                       lmfit estimates the derivatives. Defaults to False.
 
         Returns:
             Result: The fitting result
@@ -274,6 +306,7 @@ class FitRho(FitDecorator):
             self.params,
             args=(rho.index.to_numpy(), rho.values.real, rho.values.imag),
             method=method,
+            **self._jacobian_kwargs(method, jacobian, rho.index.to_numpy()),
         )
 
         self.fitted_params = res.params
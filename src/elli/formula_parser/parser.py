@@ -3,7 +3,7 @@
 from functools import lru_cache
 import os
 from operator import add, mul, neg, sub, truediv
-from typing import Dict
+from typing import Any, Callable, Dict, Tuple
 
 import numpy as np
 import scipy.constants as sc
@@ -11,6 +11,59 @@ from lark import Lark, Transformer, v_args
 from scipy.special import dawsn  # pylint: disable=no-name-in-module
 
 
+_FUNCTIONS = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "sqrt": np.emath.sqrt,
+    "dawsn": dawsn,
+    "ln": np.log,
+    "log": np.log10,
+    "heaviside": np.heaviside,
+}
+
+_BUILTINS = {
+    "1j": 1j,
+    "pi": sc.pi,
+    "eps_0": sc.epsilon_0,
+    "hbar": sc.hbar,
+    "h": sc.h,
+    "c": sc.c,
+}
+
+
+def _check_repeated_params(repeated_params: Dict[str, np.ndarray]) -> int:
+    """Checks the repeated parameters and returns their number of repetitions."""
+    if not repeated_params:
+        return 0
+
+    if not isinstance(repeated_params, dict):
+        raise ValueError(
+            f"Repeated parameters must be a dict but found {type(repeated_params)}"
+        )
+
+    params = iter(repeated_params.items())
+    length = len(next(params)[1])
+    for name, param in params:
+        if not isinstance(param, np.ndarray):
+            raise TypeError(
+                f"Expected {name} to be of type numpy ndarray but found type {type(param)}"
+            )
+        if length != len(param):
+            raise ValueError("Repeated parameters must have all the same length.")
+
+    return length
+
+
+def _check_single_params(single_params: Dict[str, float]) -> None:
+    """Checks that all single parameters are numbers."""
+    for name, param in single_params.items():
+        if not isinstance(param, (float, int)):
+            raise TypeError(
+                f"Expected {name} to be of type float but found type {type(param)}."
+            )
+
+
 @v_args(inline=True)
 class FormulaTransformer(Transformer):
     """Transformer class for parsing formulas"""
@@ -28,33 +81,10 @@ class FormulaTransformer(Transformer):
     power = pow
 
     def _check_and_set(self, repeated_params):
-        if not repeated_params:
-            self.no_repeated_params = 0
-            return
-
-        if not isinstance(repeated_params, dict):
-            raise ValueError(
-                f"Repeated parameters must be a dict but found {type(repeated_params)}"
-            )
-
-        params = iter(repeated_params.items())
-        length = len(next(params)[1])
-        for name, param in params:
-            if not isinstance(param, np.ndarray):
-                raise TypeError(
-                    f"Expected {name} to be of type numpy ndarray but found type {type(param)}"
-                )
-            if length != len(param):
-                raise ValueError("Repeated parameters must have all the same length.")
-
-        self.no_repeated_params = length
+        self.no_repeated_params = _check_repeated_params(repeated_params)
 
     def _check_and_set_single(self, single_params):
-        for name, param in single_params.items():
-            if not isinstance(param, (float, int)):
-                raise TypeError(
-                    f"Expected {name} to be of type float but found type {type(param)}."
-                )
+        _check_single_params(single_params)
         self.single_params = single_params
 
     def __init__(
@@ -95,35 +125,15 @@ class FormulaTransformer(Transformer):
 
     def func(self, name, val):
         """Evaluates a function"""
-        names = {
-            "sin": np.sin,
-            "cos": np.cos,
-            "tan": np.tan,
-            "sqrt": np.emath.sqrt,
-            "dawsn": dawsn,
-            "ln": np.log,
-            "log": np.log10,
-            "heaviside": np.heaviside,
-        }
-
-        if name in names:
-            return names[name](val)
+        if name in _FUNCTIONS:
+            return _FUNCTIONS[name](val)
 
         raise ValueError(f"Unknown function: {name}")
 
     def builtin(self, name):
         """Returns the values for builtin tokens"""
-        names = {
-            "1j": 1j,
-            "pi": sc.pi,
-            "eps_0": sc.epsilon_0,
-            "hbar": sc.hbar,
-            "h": sc.h,
-            "c": sc.c,
-        }
-
-        if name in names:
-            return names[name]
+        if name in _BUILTINS:
+            return _BUILTINS[name]
 
         raise ValueError(f"Unknown constant: {name}")
 
@@ -157,6 +167,181 @@ class FormulaTransformer(Transformer):
         raise ValueError(f"No such parameter {name}")
 
 
+def _node(operation: Callable, *args: Any) -> Any:
+    """Combines compiled nodes with an operation.
+
+    Constant arguments are folded into a constant,
+    otherwise a closure evaluating the arguments is returned.
+    """
+    if not any(callable(arg) for arg in args):
+        try:
+            return operation(*args)
+        except (ArithmeticError, AttributeError, TypeError, ValueError):
+            # Raise the error on evaluation, like the transformer
+            pass
+
+    functions = [arg if callable(arg) else (lambda env, arg=arg: arg) for arg in args]
+    if len(functions) == 1:
+        (first,) = functions
+        return lambda env: operation(first(env))
+
+    first, second = functions
+    return lambda env: operation(first(env), second(env))
+
+
+def _lookup(params: Dict[str, Any], name: str) -> Any:
+    if name in params:
+        return params[name]
+    raise ValueError(f"No such parameter {name}")
+
+
+@v_args(inline=True)
+class FormulaCompiler(Transformer):
+    """Transformer class compiling a formula tree into nested NumPy closures.
+
+    Every node becomes either a constant or a function of the
+    environment (x axis values, single parameters, repeated parameters, repetitions),
+    so the tree is only walked once.
+    """
+
+    def __init__(self, x_axis_name: str):
+        super().__init__()
+        if not isinstance(x_axis_name, str):
+            raise TypeError("x_axis_name must be a string.")
+
+        self.x_axis_name = x_axis_name
+
+    def number(self, value):
+        """Returns a number constant"""
+        return float(value)
+
+    def add(self, first, second):
+        """Compiles an addition"""
+        return _node(add, first, second)
+
+    def sub(self, first, second):
+        """Compiles a subtraction"""
+        return _node(sub, first, second)
+
+    def mul(self, first, second):
+        """Compiles a multiplication"""
+        return _node(mul, first, second)
+
+    def div(self, first, second):
+        """Compiles a division"""
+        return _node(truediv, first, second)
+
+    def neg(self, value):
+        """Compiles a negation"""
+        return _node(neg, value)
+
+    def power(self, base, exponent):
+        """Compiles a power"""
+        return _node(pow, base, exponent)
+
+    def eps(self, inp):
+        """Return an epsilon type formula"""
+        return "eps", inp
+
+    # pylint: disable=invalid-name
+    def n(self, inp):
+        """Return an index type formula"""
+        return "n", inp
+
+    def kkr_term(self, term):
+        """Compiles the kramers kronig transformation on the function"""
+
+        def kkr(env):
+            raise NotImplementedError("kkr transformation not yet implemented")
+
+        return kkr
+
+    def func(self, name, val):
+        """Compiles a function call"""
+        if name in _FUNCTIONS:
+            return _node(_FUNCTIONS[name], val)
+
+        raise ValueError(f"Unknown function: {name}")
+
+    def builtin(self, name):
+        """Returns the values for builtin tokens"""
+        if name in _BUILTINS:
+            return _BUILTINS[name]
+
+        raise ValueError(f"Unknown constant: {name}")
+
+    def sum_expr(self, expr):
+        """Compiles the sum of an expression"""
+        return _node(lambda value: value.sum(axis=1), expr)
+
+    def single_param_name(self, name):
+        """Compiles a parameter inside a non-repeated section"""
+        name = str(name)
+        if name == self.x_axis_name:
+            return lambda env: env[0]
+
+        return lambda env: _lookup(env[1], name)
+
+    def param_name(self, name):
+        """Compiles a parameter inside a repeated section"""
+        name = str(name)
+        if name == self.x_axis_name:
+            return lambda env: np.einsum("i,j->ij", env[0], np.ones(env[3]))
+
+        def lookup(env):
+            if name in env[1]:
+                return env[1][name]
+            return _lookup(env[2], name)
+
+        return lookup
+
+
+class CompiledFormula:
+    """A dispersion formula, which is compiled once into a vectorized callable."""
+
+    def __init__(self, formula: str, x_axis_name: str):
+        """Parses and compiles a formula.
+
+        Args:
+            formula (str): The formula string to compile.
+            x_axis_name (str): Name of the x axis in the formula.
+        """
+        self.formula = formula
+        self.x_axis_name = x_axis_name
+        self.representation, self._function = FormulaCompiler(x_axis_name).transform(
+            parse_formula(formula)
+        )
+
+    def __call__(
+        self,
+        x_axis_values: np.ndarray,
+        single_params: Dict[str, float],
+        repeated_params: Dict[str, np.ndarray],
+    ) -> Tuple[str, Any]:
+        """Evaluates the formula.
+
+        Args:
+            x_axis_values (np.ndarray): Values of the x axis.
+            single_params (Dict[str, float]): Values of the single parameters.
+            repeated_params (Dict[str, np.ndarray]): Arrays of the repeated parameters.
+
+        Returns:
+            Tuple[str, Any]: The representation ('eps' or 'n') and the evaluated formula.
+        """
+        if not isinstance(x_axis_values, np.ndarray):
+            raise TypeError("x_axis_values must be a numpy array.")
+
+        no_repeated_params = _check_repeated_params(repeated_params)
+        _check_single_params(single_params)
+
+        if not callable(self._function):
+            return self.representation, self._function
+
+        return self.representation, self._function(
+            (x_axis_values, single_params, repeated_params, no_repeated_params)
+        )
+
+
 __location__ = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
 
 with open(
@@ -182,3 +367,19 @@ def parse_formula(formula: str):
         Lark.Tree: The parsed formula Tree.
     """
     return grammar.parse(formula)
+
+
+@lru_cache(maxsize=128)
+def compile_formula(formula: str, x_axis_name: str) -> CompiledFormula:
+    """
+    Compiles a dispersion formula string into a vectorized callable.
+    Uses caching to avoid re-compiling of the formula.
+
+    Args:
+        formula (str): The formula string to compile.
+        x_axis_name (str): Name of the x axis in the formula.
+
+    Returns:
+        CompiledFormula: The compiled formula.
+    """
+    return CompiledFormula(formula, x_axis_name)
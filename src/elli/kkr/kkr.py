@@ -22,129 +22,288 @@ as it suffers from major uncertanties.
 Hence, this transformation is included in pyElli only for completeness and for the
 special cases it may be applicable.
 
+Two backends evaluate the sums of Maclaurin's formula:
+
+* ``"fft"``: For equidistant axes, the kernels only depend on the difference and the sum
+  of the point indices. The sums are then calculated as convolutions by FFT,
+  which are zero-padded to avoid circular wrap-around.
+  This needs :math:`O(n \log n)` time and :math:`O(n)` memory
+  and gives the same values as the direct summation up to rounding errors.
+* ``"maclaurin"``: Direct summation for arbitrary axes.
+  The kernel is evaluated in blocks of rows,
+  which keeps the memory bounded for long spectra.
+
+By default, the FFT backend is chosen for equidistant axes and the direct summation otherwise.
+In both cases, the spectrum is assumed to be zero outside of the given axis.
+
+All functions accept several spectra on the same axis as 2-D array
+with shape (n_spectra, n_points).
+To transform spectra in repeated calls, the kernel of the axis can be precomputed
+once with :class:`KramersKronigKernel`.
+
 .. rubric:: References
 
 .. [1] Ohta and Ishida, Appl. Spectroscopy 42, 952 (1988), https://doi.org/10.1366/0003702884430380
 """
 
 # pylint: disable=invalid-name
-from typing import Callable
+from typing import Iterator, Literal, Tuple
 
 import numpy as np
+import numpy.typing as npt
+from scipy.fft import irfft, next_fast_len, rfft
 
 
-def _integrate_im(im: np.ndarray, x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
-    """Calculate the discrete imaginary sum (integral) for the kkr.
+def _kernel_im(x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
+    """Calculate the weights of the discrete imaginary sum (integral) for the kkr.
 
     Args:
-        im (numpy.ndarray): The imaginary values from which to calculate. (shape (1, n))
         x (numpy.ndarray): The x-axis on which to calculate. (shape (1, n))
         x_i (numpy.ndarray): The current points around which to integrate. (shape (m, 1))
 
     Returns:
-        numpy.ndarray: The integral sum. (shape (m,))
+        numpy.ndarray: The weights of the imaginary values. (shape (m, n))
     """
 
-    return np.sum(x * im / (x * x - x_i * x_i), axis=1)
+    return x / (x * x - x_i * x_i)
 
 
-def _integrate_im_reciprocal(
-    im: np.ndarray, x: np.ndarray, x_i: np.ndarray
-) -> np.ndarray:
-    """Calculate the discrete imaginary sum (integral) for the kkr.
+def _kernel_im_reciprocal(x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
+    """Calculate the weights of the discrete imaginary sum (integral) for the kkr.
     This formulation uses an 1/x axis to transform a wavelength axis.
 
     Args:
-        im (numpy.ndarray): The imaginary values from which to calculate. (shape (1, n))
         x (numpy.ndarray): The reciprocal x-axis on which to calculate. (shape (1, n))
-        x_i (numpy.ndarray): The current point around which to integrate. (shape (m, 1))
+        x_i (numpy.ndarray): The current points around which to integrate. (shape (m, 1))
 
     Returns:
-        numpy.ndarray: The integral sum. (shape (m,))
+        numpy.ndarray: The weights of the imaginary values. (shape (m, n))
     """
 
-    return np.sum(im / (x * (1.0 - x * x / (x_i * x_i))), axis=1)
+    return 1 / (x * (1.0 - x * x / (x_i * x_i)))
 
 
-def _integrate_re(re: np.ndarray, x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
-    """Calculate the discrete real sum (integral) for the kkr.
+def _kernel_re(x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
+    """Calculate the weights of the discrete real sum (integral) for the kkr.
 
     Args:
-        re (numpy.ndarray): The real values from which to calculate. (shape (1, n))
         x (numpy.ndarray): The x-axis on which to calculate. (shape (1, n))
-        x_i (numpy.ndarray): The current point around which to integrate. (shape (m, 1))
+        x_i (numpy.ndarray): The current points around which to integrate. (shape (m, 1))
 
     Returns:
-        numpy.ndarray: The real sum. (shape (m,))
+        numpy.ndarray: The weights of the real values. (shape (m, n))
     """
-    return np.sum(x_i * re / (x * x - x_i * x_i), axis=1)
 
+    return x_i / (x * x - x_i * x_i)
 
-def _integrate_re_reciprocal(
-    re: np.ndarray, x: np.ndarray, x_i: np.ndarray
-) -> np.ndarray:
-    """Calculate the discrete real sum (integral) for the kkr.
+
+def _kernel_re_reciprocal(x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
+    """Calculate the weights of the discrete real sum (integral) for the kkr.
     This formulation uses an 1/x axis to transform a wavelength axis.
 
     Args:
-        re (numpy.ndarray): The real values from which to calculate. (shape (1, n))
         x (numpy.ndarray): The reciprocal x-axis on which to calculate. (shape (1, n))
-        x_i (float): The current point around which to integrate. (shape (m, 1))
+        x_i (numpy.ndarray): The current points around which to integrate. (shape (m, 1))
 
     Returns:
-        numpy.ndarray: The real sum. (shape (m,))
+        numpy.ndarray: The weights of the real values. (shape (m, n))
     """
 
-    return np.sum(re / (x_i - x * x / x_i), axis=1)
+    return 1 / (x_i - x * x / x_i)
 
 
-def _calc_kkr(
-    t: np.ndarray,
-    x: np.ndarray,
-    trafo: Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray],
-) -> np.ndarray:
-    """Calculates the Kramers-Kronig relation
-    according to Maclaurin's formula.
+# Kernels of the relations and the coefficients of their constant, difference
+# and sum terms, which are used by the FFT backend:
+# kernel = c_const / x + c_diff / (x - x_i) + c_sum / (x + x_i)
+_KERNELS = {
+    "im2re": (_kernel_im, (0, 0.5, 0.5)),
+    "re2im": (_kernel_re, (0, 0.5, -0.5)),
+    "im2re_reciprocal": (_kernel_im_reciprocal, (1, -0.5, -0.5)),
+    "re2im_reciprocal": (_kernel_re_reciprocal, (0, -0.5, 0.5)),
+}
 
-    Args:
-        t (numpy.ndarray): The y-axis on which to transform.
-        x (numpy.ndarray): The x-axis on which to transform.
-        trafo (Callable[[numpy.ndarray, numpy.ndarray, numpy.ndarray], numpy.ndarray]):
-            The transformation function.
+# Maximum number of array elements, which are evaluated at once.
+# Kernel matrices up to this size are stored by the direct summation.
+_BLOCK_SIZE = 2**22
 
-    Raises:
-        ValueError: y and x axis must have the same length.
 
-    Returns:
-        np.ndarray: The kkr transformed y-axis
-    """
+def _is_equidistant(x: np.ndarray) -> bool:
+    """Checks whether the axis has a constant, non-zero step."""
+    if len(x) < 3:
+        return False
+    steps = np.diff(x)
+    return steps[0] != 0 and np.allclose(steps, steps[0], rtol=1e-9, atol=0)
 
-    if len(t) != len(x):
-        raise ValueError(
-            "y- and x-axes arrays must have the same length, "
-            f"but have lengths {len(t)} and {len(x)}."
-        )
 
-    integral = np.empty(len(t))
-    interval = np.diff(x, prepend=x[1] - x[0])
-    odd_slice = slice(1, None, 2)
-    even_slice = slice(0, None, 2)
+class KramersKronigKernel:
+    """Kramers-Kronig relation with the precomputed kernel of a fixed axis.
 
-    integral[even_slice] = trafo(
-        t[np.newaxis, odd_slice],
-        x[np.newaxis, odd_slice],
-        x[even_slice, np.newaxis],
-    )
-    integral[odd_slice] = trafo(
-        t[np.newaxis, even_slice],
-        x[np.newaxis, even_slice],
-        x[odd_slice, np.newaxis],
-    )
+    The kernel only depends on the axis and the relation,
+    so it can be reused to transform many spectra, e.g. of a mapping:
 
-    return 4 / np.pi * interval * integral
+    .. code-block:: python
 
+        kernel = elli.kkr.KramersKronigKernel(lbda, "im2re_reciprocal")
+        eps_real = kernel.transform(eps_imag)  # shape (n_spectra, len(lbda))
+    """
 
-def re2im(re: np.ndarray, x: np.ndarray) -> np.ndarray:
+    def __init__(
+        self,
+        x: npt.ArrayLike,
+        relation: Literal["re2im", "im2re", "re2im_reciprocal", "im2re_reciprocal"],
+        backend: Literal["auto", "fft", "maclaurin"] = "auto",
+    ) -> None:
+        """Precomputes the kernel of the relation.
+
+        Args:
+            x (npt.ArrayLike): The axis on which to transform,
+                the reciprocal axis for the reciprocal relations.
+            relation (Literal["re2im", "im2re", "re2im_reciprocal", "im2re_reciprocal"]):
+                The Kramers-Kronig relation to calculate.
+            backend (Literal["auto", "fft", "maclaurin"], optional):
+                Backend to evaluate the sums, see the module description.
+                Defaults to "auto".
+
+        Raises:
+            ValueError: Unknown relation or backend.
+            ValueError: The FFT backend needs an equidistant x-axis.
+        """
+        if relation not in _KERNELS:
+            raise ValueError(f"Unknown relation '{relation}'.")
+
+        self.x = np.asarray(x, dtype=np.float64)
+        self.relation = relation
+
+        if backend == "auto":
+            backend = "fft" if _is_equidistant(self.x) else "maclaurin"
+        if backend not in ["fft", "maclaurin"]:
+            raise ValueError(f"Unknown backend '{backend}'.")
+        if backend == "fft" and not _is_equidistant(self.x):
+            raise ValueError("The FFT backend needs an equidistant x-axis.")
+        self.backend = backend
+
+        n = len(self.x)
+        self._scale = 4 / np.pi * np.diff(self.x, prepend=self.x[1] - self.x[0])
+
+        if backend == "fft":
+            self._init_fft()
+        elif n * n // 2 <= _BLOCK_SIZE:
+            self._weights = list(self._blocks())
+        else:
+            # Large kernels are recalculated in blocks for every transformation
+            self._weights = None
+
+    def transform(self, y: npt.ArrayLike) -> np.ndarray:
+        """Transforms one or several spectra.
+
+        Args:
+            y (npt.ArrayLike): The values to transform,
+                with shape (n_points,) or (n_spectra, n_points).
+
+        Raises:
+            ValueError: y and x axis must have the same length.
+
+        Returns:
+            np.ndarray: The kkr transformed values with the shape of y.
+        """
+        y = np.asarray(y, dtype=np.float64)
+
+        if y.shape[-1:] != self.x.shape:
+            raise ValueError(
+                "y- and x-axes arrays must have the same length, "
+                f"but have lengths {y.shape[-1] if y.ndim else 0} and {len(self.x)}."
+            )
+
+        if self.backend == "fft":
+            return self._transform_fft(y)
+
+        integral = np.empty(y.shape)
+        # Contiguous copies of the even and odd points, which are multiplied by BLAS
+        points = [np.ascontiguousarray(y[..., start::2]) for start in [0, 1]]
+        blocks = self._blocks() if self._weights is None else self._weights
+        for rows, columns, weights in blocks:
+            integral[..., rows] = points[columns.start] @ weights.T
+        return integral
+
+    def _blocks(self) -> Iterator[Tuple[slice, slice, np.ndarray]]:
+        """Calculates the scaled kernel matrix in blocks of rows.
+
+        Yields:
+            Tuple[slice, slice, np.ndarray]: Rows, columns and the weights of the block.
+        """
+        kernel = _KERNELS[self.relation][0]
+        n = len(self.x)
+
+        for start, step in [(0, 1), (1, 0)]:
+            # Even points are integrated over odd points and vice versa
+            columns = slice(step, None, 2)
+            n_columns = len(self.x[columns])
+            block = max(_BLOCK_SIZE // max(n_columns, 1), 1)
+
+            for first in range(start, n, 2 * block):
+                rows = slice(first, first + 2 * block, 2)
+                yield (
+                    rows,
+                    columns,
+                    self._scale[rows, np.newaxis]
+                    * kernel(self.x[np.newaxis, columns], self.x[rows, np.newaxis]),
+                )
+
+    def _init_fft(self) -> None:
+        """Calculates the spectra of the kernels for the FFT backend."""
+        c_const, c_diff, c_sum = _KERNELS[self.relation][1]
+        x = self.x
+        n = len(x)
+        h = (x[-1] - x[0]) / (n - 1)
+
+        # Only points with an odd index distance are summed
+        m = np.arange(-(n - 1), n)
+        k_diff = np.zeros(2 * n - 1)
+        k_diff[m % 2 == 1] = -1 / (h * m[m % 2 == 1])
+
+        s = np.arange(2 * n - 1)
+        k_sum = np.zeros(2 * n - 1)
+        k_sum[s % 2 == 1] = 1 / (2 * x[0] + h * s[s % 2 == 1])
+
+        # Padding for a linear convolution, which avoids circular wrap-around
+        self._size = next_fast_len(3 * n - 2, real=True)
+        self._diff = c_diff * rfft(k_diff, self._size)
+        self._sum = c_sum * rfft(k_sum, self._size)
+
+        self._const = None
+        if c_const:
+            with np.errstate(divide="ignore"):
+                self._const = c_const / x
+
+    def _transform_fft(self, y: np.ndarray) -> np.ndarray:
+        """Evaluates the sums of Maclaurin's formula by FFT convolutions."""
+        n = len(self.x)
+        spectra = y.reshape(-1, n)
+        integral = np.empty(spectra.shape)
+
+        # The spectra are transformed in batches to bound the memory
+        batch = max(_BLOCK_SIZE // self._size, 1)
+        for first in range(0, len(spectra), batch):
+            part = spectra[first : first + batch]
+            # Difference terms are convolutions with y, sum terms with reversed y
+            integral[first : first + batch] = irfft(
+                rfft(part, self._size) * self._diff
+                + rfft(part[:, ::-1], self._size) * self._sum,
+                self._size,
+            )[:, n - 1 : 2 * n - 1]
+
+        if self._const is not None:
+            integral[:, 0::2] += (spectra[:, 1::2] @ self._const[1::2])[:, np.newaxis]
+            integral[:, 1::2] += (spectra[:, 0::2] @ self._const[0::2])[:, np.newaxis]
+
+        return (self._scale * integral).reshape(y.shape)
+
+
+def re2im(
+    re: np.ndarray,
+    x: np.ndarray,
+    backend: Literal["auto", "fft", "maclaurin"] = "auto",
+) -> np.ndarray:
     r"""Calculates the differential Kramers-Kronig relation from the
     real to imaginary part
     according to Maclaurin's formula.
@@ -156,17 +315,25 @@ def re2im(re: np.ndarray, x: np.ndarray) -> np.ndarray:
         \frac{2}{\pi} \int_0^\infty \frac{x_i \Re(x)}{x^2 - x_i^2} dx
 
     Args:
-        re (numpy.ndarray): The real values to transform.
+        re (numpy.ndarray): The real values to transform,
+            with shape (n_points,) or (n_spectra, n_points).
         x (numpy.ndarray): The axis on which to transform.
+        backend (Literal["auto", "fft", "maclaurin"], optional):
+            Backend to evaluate the sums, see the module description.
+            Defaults to "auto".
 
     Returns:
         numpy.ndarray: The transformed imaginary part.
     """
 
-    return _calc_kkr(re, x, _integrate_re)
+    return KramersKronigKernel(x, "re2im", backend).transform(re)
 
 
-def im2re(im: np.ndarray, x: np.ndarray) -> np.ndarray:
+def im2re(
+    im: np.ndarray,
+    x: np.ndarray,
+    backend: Literal["auto", "fft", "maclaurin"] = "auto",
+) -> np.ndarray:
     r"""Calculates the differential Kramers-Kronig relation from the
     imaginary to real part
     according to Maclaurin's formula.
@@ -178,17 +345,25 @@ def im2re(im: np.ndarray, x: np.ndarray) -> np.ndarray:
         \frac{2}{\pi} \int_0^\infty \frac{x \Im(x)}{x^2 - x_i^2} dx
 
     Args:
-        im (numpy.ndarray): The imaginary values to transform.
+        im (numpy.ndarray): The imaginary values to transform,
+            with shape (n_points,) or (n_spectra, n_points).
         x (numpy.ndarray): The axis on which to transform.
+        backend (Literal["auto", "fft", "maclaurin"], optional):
+            Backend to evaluate the sums, see the module description.
+            Defaults to "auto".
 
     Returns:
         numpy.ndarray: The transformed real part.
     """
 
-    return _calc_kkr(im, x, _integrate_im)
+    return KramersKronigKernel(x, "im2re", backend).transform(im)
 
 
-def re2im_reciprocal(re: np.ndarray, x: np.ndarray) -> np.ndarray:
+def re2im_reciprocal(
+    re: np.ndarray,
+    x: np.ndarray,
+    backend: Literal["auto", "fft", "maclaurin"] = "auto",
+) -> np.ndarray:
     r"""Calculates the differential Kramers-Kronig relation from the
     real to imaginary part
     according to Maclaurin's formula.
@@ -201,17 +376,25 @@ def re2im_reciprocal(re: np.ndarray, x: np.ndarray) -> np.ndarray:
         \frac{2}{\pi} \int_0^\infty \frac{\Re(x)}{x_i - \frac{x^2}{x_i}} dx
 
     Args:
-        re (numpy.ndarray): The real values to transform.
+        re (numpy.ndarray): The real values to transform,
+            with shape (n_points,) or (n_spectra, n_points).
         x (numpy.ndarray): The reciprocal axis on which to transform.
+        backend (Literal["auto", "fft", "maclaurin"], optional):
+            Backend to evaluate the sums, see the module description.
+            Defaults to "auto".
 
     Returns:
         numpy.ndarray: The transformed imaginary part.
     """
 
-    return _calc_kkr(re, x, _integrate_re_reciprocal)
+    return KramersKronigKernel(x, "re2im_reciprocal", backend).transform(re)
 
 
-def im2re_reciprocal(im: np.ndarray, x: np.ndarray) -> np.ndarray:
+def im2re_reciprocal(
+    im: np.ndarray,
+    x: np.ndarray,
+    backend: Literal["auto", "fft", "maclaurin"] = "auto",
+) -> np.ndarray:
     r"""Calculates the differential Kramers-Kronig relation from the
     imaginary to real part
     according to Maclaurin's formula.
@@ -224,11 +407,15 @@ def im2re_reciprocal(im: np.ndarray, x: np.ndarray) -> np.ndarray:
         \frac{2}{\pi} \int_0^\infty \frac{x \Im(x)}{1 - \frac{x^2}{x_i^2}} dx
 
     Args:
-        im (numpy.ndarray): The imaginary values to transform.
+        im (numpy.ndarray): The imaginary values to transform,
+            with shape (n_points,) or (n_spectra, n_points).
         x (numpy.ndarray): The reciprocal axis on which to transform.
+        backend (Literal["auto", "fft", "maclaurin"], optional):
+            Backend to evaluate the sums, see the module description.
+            Defaults to "auto".
 
     Returns:
         numpy.ndarray: The transformed real part.
     """
 
-    return _calc_kkr(im, x, _integrate_im_reciprocal)
+    return KramersKronigKernel(x, "im2re_reciprocal", backend).transform(im)
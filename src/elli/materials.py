@@ -18,6 +18,11 @@ book 'Spectroscopic Ellipsometry' [1]_.
 Additionally two materials can be combined via various :ref:'Effective medium approximations',
 to create mixtures or account for interface roughness.
 
+Every material reports its symmetry class. Isotropic materials
+additionally provide their scalar dielectric function with :meth:`Material.get_epsilon`,
+which is used by the structure and the solvers to skip the full
+(wavelengths x 3 x 3) tensors for isotropic layers.
+
 .. rubric:: References
 
 .. [1] H. Fujiwara,
@@ -39,6 +44,15 @@ from .dispersions.base_dispersion import BaseDispersion
 class Material(ABC):
     """Base class for materials (abstract class)."""
 
+    @property
+    def symmetry(self) -> str:
+        """Symmetry class of the permittivity tensor of the material.
+
+        One of 'isotropic', 'uniaxial', 'biaxial' or 'anisotropic',
+        where 'anisotropic' is used, if the symmetry is unknown.
+        """
+        return "anisotropic"
+
     @abstractmethod
     def get_tensor(self, lbda: npt.ArrayLike) -> npt.NDArray:
         """Gets the permittivity tensor of the material for wavelength 'lbda'.
@@ -61,6 +75,28 @@ class Material(ABC):
         """
         return sqrt(self.get_tensor(lbda))
 
+    def get_epsilon(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the scalar dielectric function of an isotropic material for wavelength 'lbda'.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Raises:
+            ValueError: The material is not isotropic.
+
+        Returns:
+            npt.NDArray: Dielectric function (wavelengths).
+        """
+        self._check_isotropic()
+        return self.get_tensor(lbda)[:, 0, 0]
+
+    def _check_isotropic(self) -> None:
+        """Raises a ValueError, if the material is not isotropic."""
+        if self.symmetry != "isotropic":
+            raise ValueError(
+                f"A {self.symmetry} material has no scalar dielectric function."
+            )
+
 
 class SingleMaterial(Material):
     """Base class for non-mixed materials (abstract class)."""
@@ -85,6 +121,39 @@ class SingleMaterial(Material):
         self.rotated = True
         self.rotation_matrix = r
 
+    @property
+    def symmetry(self) -> str:
+        """Symmetry class of the permittivity tensor of the material.
+
+        It is derived from the number of different dispersions of the crystal axes:
+        'isotropic', 'uniaxial' or 'biaxial'. A rotation does not change the symmetry class.
+        """
+        dispersions = {
+            id(dispersion)
+            for dispersion in [self.dispersion_x, self.dispersion_y, self.dispersion_z]
+        }
+        return ["isotropic", "uniaxial", "biaxial"][len(dispersions) - 1]
+
+    def get_epsilon(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the scalar dielectric function of an isotropic material for wavelength 'lbda'.
+        The dispersion is evaluated once, without building the permittivity tensor.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Raises:
+            ValueError: The material is not isotropic.
+
+        Returns:
+            npt.NDArray: Dielectric function (wavelengths).
+        """
+        self._check_isotropic()
+        length = 1 if np.shape(lbda) == () else np.shape(lbda)[0]
+
+        epsilon = np.empty(length, dtype=np.complex128)
+        epsilon[:] = self.dispersion_x.get_dielectric(lbda)
+        return epsilon
+
     def get_tensor(self, lbda: npt.ArrayLike) -> npt.NDArray:
         """Gets the permittivity tensor of the material for wavelength 'lbda'.
 
@@ -104,10 +173,15 @@ class SingleMaterial(Material):
         # create empty tensor
         epsilon = np.zeros((length, 3, 3), dtype=np.complex128)
 
-        # get get dielectric functions from dispersion
-        epsilon[:, 0, 0] = self.dispersion_x.get_dielectric(lbda)
-        epsilon[:, 1, 1] = self.dispersion_y.get_dielectric(lbda)
-        epsilon[:, 2, 2] = self.dispersion_z.get_dielectric(lbda)
+        # get get dielectric functions from dispersion,
+        # axes with the same dispersion are only evaluated once
+        evaluated = {}
+        for i, dispersion in enumerate(
+            [self.dispersion_x, self.dispersion_y, self.dispersion_z]
+        ):
+            if id(dispersion) not in evaluated:
+                evaluated[id(dispersion)] = dispersion.get_dielectric(lbda)
+            epsilon[:, i, i] = evaluated[id(dispersion)]
 
         if self.rotated:
             epsilon = self.rotation_matrix @ epsilon @ self.rotation_matrix.T
@@ -232,6 +306,14 @@ class MixtureMaterial(Material):
     guest_material = None
     fraction = None
 
+    # True, if get_tensor_fraction broadcasts an array of fractions
+    # with the shape (fractions x 1 x 1 x 1) against the tensors
+    broadcast_fractions = False
+
+    # Element-wise mixing formula mix(e_h, e_g, fraction), which is applied
+    # to the tensors as well as to the scalar dielectric functions
+    _mix = None
+
     def __init__(
         self, host_material: Material, guest_material: Material, fraction: float
     ) -> None:
@@ -277,6 +359,20 @@ class MixtureMaterial(Material):
 
         self.fraction = fraction
 
+    @property
+    def symmetry(self) -> str:
+        """Symmetry class of the permittivity tensor of the material.
+
+        The mixture is 'isotropic', if both constituents are isotropic,
+        otherwise 'anisotropic'.
+        """
+        if (
+            self.host_material.symmetry == "isotropic"
+            and self.guest_material.symmetry == "isotropic"
+        ):
+            return "isotropic"
+        return "anisotropic"
+
     @abstractmethod
     def get_tensor_fraction(self, lbda: npt.ArrayLike, fraction: float) -> npt.NDArray:
         """Gets the permittivity tensor of the material for wavelength 'lbda',
@@ -290,6 +386,81 @@ class MixtureMaterial(Material):
             npt.NDArray: Permittivity tensor.
         """
 
+    def get_tensor_fractions(
+        self, lbda: npt.ArrayLike, fractions: npt.ArrayLike
+    ) -> npt.NDArray:
+        """Gets the permittivity tensors of the material for wavelength 'lbda'
+        and an array of fractions. Used in VaryingMixtureLayers.
+
+        The mixture formulas of pyElli evaluate the constituents only once
+        for all fractions, other subclasses call :meth:`get_tensor_fraction` for every fraction.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+            fractions (npt.ArrayLike): Fractions of the guest material used for evaluation. (Range 0 - 1).
+
+        Returns:
+            npt.NDArray: Permittivity tensors (fractions x wavelengths x 3 x 3).
+        """
+        if self.broadcast_fractions:
+            fractions = np.asarray(fractions, dtype=np.float64)[:, None, None, None]
+            return self.get_tensor_fraction(lbda, fractions)
+
+        return np.array(
+            [self.get_tensor_fraction(lbda, fraction) for fraction in fractions]
+        )
+
+    def get_epsilon_fraction(self, lbda: npt.ArrayLike, fraction: float) -> npt.NDArray:
+        """Gets the scalar dielectric function of an isotropic mixture for wavelength 'lbda',
+        while overwriting the set fraction.
+
+        The mixture formulas of pyElli are applied to the scalar dielectric functions
+        of the constituents, other subclasses use the tensor of :meth:`get_tensor_fraction`.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+            fraction (float): Fraction of the guest material used for evaluation. (Range 0 - 1).
+
+        Raises:
+            ValueError: The mixture is not isotropic.
+
+        Returns:
+            npt.NDArray: Dielectric function (wavelengths).
+        """
+        self._check_isotropic()
+        if self._mix is None:
+            return self.get_tensor_fraction(lbda, fraction)[..., 0, 0]
+
+        return self._mix(
+            self.host_material.get_epsilon(lbda),
+            self.guest_material.get_epsilon(lbda),
+            fraction,
+        )
+
+    def get_epsilon_fractions(
+        self, lbda: npt.ArrayLike, fractions: npt.ArrayLike
+    ) -> npt.NDArray:
+        """Gets the scalar dielectric functions of an isotropic mixture
+        for wavelength 'lbda' and an array of fractions. Used in VaryingMixtureLayers.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+            fractions (npt.ArrayLike): Fractions of the guest material used for evaluation. (Range 0 - 1).
+
+        Raises:
+            ValueError: The mixture is not isotropic.
+
+        Returns:
+            npt.NDArray: Dielectric functions (fractions x wavelengths).
+        """
+        if self.broadcast_fractions:
+            fractions = np.asarray(fractions, dtype=np.float64)[:, None]
+            return self.get_epsilon_fraction(lbda, fractions)
+
+        return np.array(
+            [self.get_epsilon_fraction(lbda, fraction) for fraction in fractions]
+        )
+
     def get_tensor(self, lbda: npt.ArrayLike) -> npt.NDArray:
         """Gets the permittivity tensor of the material for wavelength 'lbda'.
 
@@ -301,6 +472,20 @@ class MixtureMaterial(Material):
         """
         return self.get_tensor_fraction(lbda, self.fraction)
 
+    def get_epsilon(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the scalar dielectric function of an isotropic mixture for wavelength 'lbda'.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Raises:
+            ValueError: The mixture is not isotropic.
+
+        Returns:
+            npt.NDArray: Dielectric function (wavelengths).
+        """
+        return self.get_epsilon_fraction(lbda, self.fraction)
+
 
 class VCAMaterial(MixtureMaterial):
     r"""Mixture Material approximated with a simple virtual crystal like average.
@@ -316,6 +501,8 @@ class VCAMaterial(MixtureMaterial):
     * :math:`f` is the volume fraction of the guest in the host material.
     """
 
+    broadcast_fractions = True
+
     def get_tensor_fraction(self, lbda: npt.ArrayLike, fraction: float) -> npt.NDArray:
         """Gets the permittivity tensor of the marterial for wavelength 'lbda',
         while overwriting the set fraction.
@@ -327,11 +514,15 @@ class VCAMaterial(MixtureMaterial):
         Returns:
             npt.NDArray: Permittivity tensor.
         """
-        epsilon = (
-            self.host_material.get_tensor(lbda) * (1 - fraction)
-            + self.guest_material.get_tensor(lbda) * fraction
+        return self._mix(
+            self.host_material.get_tensor(lbda),
+            self.guest_material.get_tensor(lbda),
+            fraction,
         )
-        return epsilon
+
+    @staticmethod
+    def _mix(e_h: npt.NDArray, e_g: npt.NDArray, fraction: float) -> npt.NDArray:
+        return e_h * (1 - fraction) + e_g * fraction
 
 
 class LooyengaEMA(MixtureMaterial):
@@ -352,6 +543,8 @@ class LooyengaEMA(MixtureMaterial):
         Looyenga, H. (1965). Physica, 31(3), 401–406.
     """
 
+    broadcast_fractions = True
+
     def get_tensor_fraction(self, lbda: npt.ArrayLike, fraction: float) -> npt.NDArray:
         """Gets the permittivity tensor of the material for wavelength 'lbda',
         while overwriting the set fraction.
@@ -363,11 +556,15 @@ class LooyengaEMA(MixtureMaterial):
         Returns:
             npt.NDArray: Permittivity tensor.
         """
-        epsilon = (
-            self.host_material.get_tensor(lbda) ** (1 / 3) * (1 - fraction)
-            + self.guest_material.get_tensor(lbda) ** (1 / 3) * fraction
-        ) ** 3
-        return epsilon
+        return self._mix(
+            self.host_material.get_tensor(lbda),
+            self.guest_material.get_tensor(lbda),
+            fraction,
+        )
+
+    @staticmethod
+    def _mix(e_h: npt.NDArray, e_g: npt.NDArray, fraction: float) -> npt.NDArray:
+        return (e_h ** (1 / 3) * (1 - fraction) + e_g ** (1 / 3) * fraction) ** 3
 
 
 class MaxwellGarnettEMA(MixtureMaterial):
@@ -387,6 +584,8 @@ class MaxwellGarnettEMA(MixtureMaterial):
     * :math:`f` is the volume fraction of the guest in the host material.
     """
 
+    broadcast_fractions = True
+
     def get_tensor_fraction(self, lbda: npt.ArrayLike, fraction: float) -> npt.NDArray:
         """Gets the permittivity tensor of the material for wavelength 'lbda',
         while overwriting the set fraction.
@@ -398,9 +597,14 @@ class MaxwellGarnettEMA(MixtureMaterial):
         Returns:
             npt.NDArray: Permittivity tensor.
         """
-        e_h = self.host_material.get_tensor(lbda)
-        e_g = self.guest_material.get_tensor(lbda)
+        return self._mix(
+            self.host_material.get_tensor(lbda),
+            self.guest_material.get_tensor(lbda),
+            fraction,
+        )
 
+    @staticmethod
+    def _mix(e_h: npt.NDArray, e_g: npt.NDArray, fraction: float) -> npt.NDArray:
         # Catch calculation warnings
         old_settings = np.geterr()
         np.seterr(invalid="ignore")
@@ -438,6 +642,8 @@ class BruggemanEMA(MixtureMaterial):
         * Ph.J. Rouseel; J. Vanhellemont; H.E. Maes. (1993) Thin Solid Films, 234, 423-427
     """
 
+    broadcast_fractions = True
+
     def get_tensor_fraction(self, lbda: npt.ArrayLike, fraction: float) -> npt.NDArray:
         """Gets the permittivity tensor of the material for wavelength 'lbda',
         while overwriting the set fraction.
@@ -449,21 +655,28 @@ class BruggemanEMA(MixtureMaterial):
         Returns:
             npt.NDArray: Permittivity tensor.
         """
-        e_h = self.host_material.get_tensor(lbda)
-        e_g = self.guest_material.get_tensor(lbda)
-        f = fraction
+        return self._mix(
+            self.host_material.get_tensor(lbda),
+            self.guest_material.get_tensor(lbda),
+            fraction,
+        )
 
-        mask_equal = np.nonzero(np.equal(e_h, e_g))
-        mask_different = np.nonzero(np.not_equal(e_h, e_g))
+    @staticmethod
+    def _mix(e_h: npt.NDArray, e_g: npt.NDArray, fraction: float) -> npt.NDArray:
+        # Leading axes of an array of fractions
+        lead = np.shape(fraction)[: max(np.ndim(fraction) - e_h.ndim, 0)]
+        f = np.reshape(fraction, lead + (1,))
 
-        p = sqrt(e_h[mask_different]) / sqrt(e_g[mask_different])
+        mask_different = np.not_equal(e_h, e_g)
+        sqrt_h = sqrt(e_h[mask_different])
+        sqrt_g = sqrt(e_g[mask_different])
+
+        p = sqrt_h / sqrt_g
         b = 0.25 * ((3 * f - 1) * (1 / p - p) + p)
         z = b + sqrt(power(b, 2) + 0.5)
 
-        e_mix = np.full_like(e_h, np.nan)
-        e_mix[mask_equal] = e_h[mask_equal]
-        e_mix[mask_different] = (
-            z * sqrt(e_h[mask_different]) * sqrt(e_g[mask_different])
-        )
+        e_mix = np.empty(lead + e_h.shape, dtype=np.result_type(e_h, e_g, complex))
+        e_mix[...] = e_h
+        e_mix[..., mask_different] = z * sqrt_h * sqrt_g
 
         return e_mix
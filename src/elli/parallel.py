@@ -0,0 +1,203 @@
+# Encoding: utf-8
+"""Parallel evaluation of experiments with large wavelength grids.
+
+The solvers work on batches of small 4x4 matrices, which barely benefit from the
+threading of the linear algebra libraries. A :class:`ParallelExecution` splits the
+wavelength axis of an experiment into chunks, solves them concurrently
+in a pool of threads or processes and stitches the results together:
+
+.. code-block:: python
+
+    execution = elli.ParallelExecution("process", max_workers=32)
+    result = structure.evaluate(lbda, 70, execution=execution)
+
+The thread pool has no further requirements, as NumPy releases the global
+interpreter lock in its linear algebra routines.
+All chunks share the structure, which is not modified by the evaluation,
+also not for batches of parameter sets (see :meth:`Structure.evaluate_batch<elli.structure.Structure.evaluate_batch>`).
+The process pool scales better for small matrices,
+but the structure and the solver arguments have to be picklable,
+e.g. a VaryingMixtureLayer must not use a lambda as fraction modulation.
+To avoid starting a new pool for every evaluation, e.g. in fits,
+an existing executor can be passed instead of the pool type.
+
+Results of chunked evaluations are not linked to a solver, so they do not provide
+the permittivity profile and derivatives (see :meth:`Result.jacobian<elli.result.Result.jacobian>`).
+"""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from copy import copy
+from typing import Dict, List, Literal, Optional, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from .result import Result
+
+
+class ParallelExecution:
+    """Evaluates experiments in chunks of the wavelength axis, which are solved concurrently."""
+
+    def __init__(
+        self,
+        executor: Union[Literal["thread", "process"], Executor] = "thread",
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        """Creates the execution option, which can be passed to the evaluation of experiments.
+
+        Args:
+            executor (Union[Literal["thread", "process"], Executor], optional):
+                Type of the pool, which is started for every evaluation,
+                or an existing executor, which is reused. Defaults to "thread".
+            max_workers (Optional[int], optional):
+                Maximum number of workers of the pool. Defaults to None,
+                which uses the number of processors.
+            chunk_size (Optional[int], optional):
+                Number of wavelengths per chunk. Defaults to None,
+                which creates one chunk per worker.
+        """
+        if not isinstance(executor, Executor) and executor not in ["thread", "process"]:
+            raise ValueError(
+                "Executor should be one of 'thread', 'process' or an Executor object."
+            )
+
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("Chunk size needs to be at least 1.")
+
+        self.executor = executor
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+
+    def chunks(self, size: int) -> List[npt.NDArray]:
+        """Splits the indices of the wavelength axis into chunks.
+
+        Args:
+            size (int): Number of wavelengths.
+
+        Returns:
+            List[npt.NDArray]: Indices of the wavelengths of every chunk.
+        """
+        if self.chunk_size is None:
+            n_chunks = self.max_workers or os.cpu_count() or 1
+        else:
+            n_chunks = -(-size // self.chunk_size)
+
+        return np.array_split(np.arange(size), max(min(n_chunks, size), 1))
+
+    def evaluate(
+        self, experiment: "Experiment", solver: "Solver", **solver_kwargs
+    ) -> Result:
+        """Evaluates an experiment in chunks of its wavelength axis.
+
+        Args:
+            experiment (Experiment): Experiment to evaluate.
+            solver (Solver): Solver class used for every chunk.
+            solver_kwargs (optional): Keyword arguments for the Solver.
+
+        Returns:
+            Result: Result of the experiment.
+        """
+        chunks = []
+        for index in self.chunks(experiment.lbda.shape[0]):
+            chunk = copy(experiment)
+            chunk.set_lbda(experiment.lbda[index])
+            chunks.append(chunk)
+
+        if len(chunks) == 1:
+            return solver(experiment, **solver_kwargs).calculate()
+
+        if isinstance(self.executor, Executor):
+            parts = _solve_chunks(self.executor, chunks, solver, solver_kwargs)
+        else:
+            pool = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+            with pool[self.executor](max_workers=self.max_workers) as executor:
+                parts = _solve_chunks(executor, chunks, solver, solver_kwargs)
+
+        return _join_chunks(experiment.snapshot(), parts)
+
+    def calculate(self, solver: "Solver") -> Result:
+        """Solves an initialized solver in chunks of its wavelength axis.
+
+        In contrast to :meth:`evaluate`, the permittivity profile is not evaluated again,
+        the chunks use the parts of the profile of the solver.
+        The result is linked to the solver.
+
+        Args:
+            solver (Solver): Solver object with the evaluated permittivity profile.
+
+        Returns:
+            Result: Result of the experiment.
+        """
+        chunks = [
+            solver.select_wavelengths(index)
+            for index in self.chunks(solver.experiment.lbda.shape[0])
+        ]
+
+        if len(chunks) == 1:
+            return solver.calculate()
+
+        if isinstance(self.executor, Executor):
+            parts = _calculate_chunks(self.executor, chunks)
+        else:
+            pool = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+            with pool[self.executor](max_workers=self.max_workers) as executor:
+                parts = _calculate_chunks(executor, chunks)
+
+        return _join_chunks(solver.experiment, parts, solver)
+
+
+def _join_chunks(
+    experiment: "Experiment",
+    parts: List[Tuple[npt.NDArray, npt.NDArray, npt.NDArray]],
+    solver: "Solver" = None,
+) -> Result:
+    """Concatenates the arrays of the chunks along the wavelength axis."""
+    jones_matrix_r, jones_matrix_t, power_correction = zip(*parts)
+    return Result(
+        experiment,
+        np.concatenate(jones_matrix_r, axis=-3),
+        np.concatenate(jones_matrix_t, axis=-3),
+        np.concatenate(power_correction, axis=-1),
+        solver,
+    )
+
+
+def _solve_chunks(
+    executor: Executor,
+    chunks: List["Experiment"],
+    solver: "Solver",
+    solver_kwargs: Dict,
+) -> List[Tuple[npt.NDArray, npt.NDArray, npt.NDArray]]:
+    """Solves the chunks in the executor and returns their arrays in order."""
+    futures = [
+        executor.submit(_solve_chunk, chunk, solver, solver_kwargs) for chunk in chunks
+    ]
+    return [future.result() for future in futures]
+
+
+def _solve_chunk(
+    experiment: "Experiment", solver: "Solver", solver_kwargs: Dict
+) -> Tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+    """Solves one chunk and returns only the arrays of the result,
+    so processes do not send back the solver and its permittivity profile."""
+    result = solver(experiment, **solver_kwargs).calculate()
+    return result.jones_matrix_r, result.jones_matrix_t, result._power_correction
+
+
+def _calculate_chunks(
+    executor: Executor, chunks: List["Solver"]
+) -> List[Tuple[npt.NDArray, npt.NDArray, npt.NDArray]]:
+    """Calculates the initialized solvers of the chunks in the executor
+    and returns their arrays in order."""
+    futures = [executor.submit(_calculate_chunk, chunk) for chunk in chunks]
+    return [future.result() for future in futures]
+
+
+def _calculate_chunk(
+    solver: "Solver",
+) -> Tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+    """Calculates one initialized solver and returns only the arrays of the result."""
+    result = solver.calculate()
+    return result.jones_matrix_r, result.jones_matrix_t, result._power_correction
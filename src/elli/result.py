@@ -7,6 +7,9 @@ A list of all properties is given below.
 
 All properties will return an array in the length of the provided wavelength array
 of the requested property.
+If the experiment was evaluated for an array of incidence angles,
+the properties get an additional leading angle axis, i.e. the shape is
+(number of angles, number of wavelengths, ...).
 
 These can be accessed by different methods:
 
@@ -21,9 +24,16 @@ To make handling multiple experiments easier, they can be grouped into a list an
 to a ResultList object. It provides the same methods for data output as the single Result.
 The Output is returned as array over the list of results. If needed, these arrays can be
 averaged and used like a Result object for fitting.
+A StackedResultList stores the Jones matrices of all results in one array,
+so the properties of all results and their average are calculated in one step.
+
+The derived properties are calculated on first access and stored in the result,
+so reading e.g. psi and delta in a fit calculates the rho matrix only once.
+The stored arrays are read-only and are recalculated after a change of the delta range.
 """
 
-from typing import List
+from functools import wraps
+from typing import Callable, List
 
 import numpy as np
 import numpy.typing as npt
@@ -49,10 +59,38 @@ def _convert_index(index: str) -> int:
     raise ValueError("Wrong index given for variable.")
 
 
+# Transformation of the Kronecker product of Jones matrices into Mueller matrices
+_MUELLER_A = np.array([[1, 0, 0, 1], [1, 0, 0, -1], [0, 1, 1, 0], [0, 1j, -1j, 0]])
+_MUELLER_A_INV = np.linalg.inv(_MUELLER_A)
+
+# Transformations of the Jones matrices into the circular polarization basis
+_CIRCULAR_C = 1 / sqrt(2) * np.array([[1, 1], [1j, -1j]])
+_CIRCULAR_C_INV = np.linalg.inv(_CIRCULAR_C)
+_CIRCULAR_D_INV = np.linalg.inv(1 / sqrt(2) * np.array([[-1, -1], [-1j, 1j]]))
+
+
+def _cached(func: Callable) -> property:
+    """Creates a property, which is calculated once and stored in the result."""
+    name = func.__name__
+
+    @wraps(func)
+    def getter(self):
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = func(self)
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self._cache[name] = value
+            return value
+
+    return property(getter)
+
+
 class Result:
     """Record of a simulation result."""
 
-    @property
+    @_cached
     def rho(self) -> npt.NDArray:
         r"""Returns the ellipsometric parameter :math:`\rho` in reflection direction.
 
@@ -64,22 +102,22 @@ class Result:
             M_{\text{$\rho$, exp}} = M_\rho \cdot \vec{E}
         """
         rho = np.dot(self.rho_matrix, self.experiment.jones_vector)
-        rho = rho[:, 0] / rho[:, 1]
+        rho = rho[..., 0] / rho[..., 1]
 
         if self._delta_range == (0, 180):
             rho.imag = -abs(rho.imag)
         return rho
 
-    @property
+    @_cached
     def rho_t(self) -> npt.NDArray:
         r"""Returns the ellipsometric parameter :math:`\rho_\text{t}` in transmission direction."""
         rho_t = np.dot(self.rho_matrix_t, self.experiment.jones_vector)
-        rho_t = rho_t[:, 0] / rho_t[:, 1]
+        rho_t = rho_t[..., 0] / rho_t[..., 1]
         if self._delta_range == (0, 180):
             rho_t.imag = -abs(rho_t.imag)
         return rho_t
 
-    @property
+    @_cached
     def psi(self) -> npt.NDArray:
         r"""Returns the ellipsometric angle :math:`\psi` in reflection direction.
 
@@ -90,7 +128,7 @@ class Result:
         """
         return np.rad2deg(np.arctan(np.abs(self.rho)))
 
-    @property
+    @_cached
     def psi_t(self) -> npt.NDArray:
         r"""Returns the ellipsometric angle :math:`\psi_\text{t}` in transmission direction.
 
@@ -101,7 +139,7 @@ class Result:
         """
         return np.rad2deg(np.arctan(np.abs(self.rho_t)))
 
-    @property
+    @_cached
     def delta(self) -> npt.NDArray:
         r"""Returns the ellipsometric angle :math:`\Delta` in reflection direction.
 
@@ -114,7 +152,7 @@ class Result:
             return np.mod(-np.angle(self.rho, deg=True), 360)
         return -np.angle(self.rho, deg=True)
 
-    @property
+    @_cached
     def delta_t(self) -> npt.NDArray:
         r"""Returns the ellipsometric angle :math:`\Delta_\text{t}` in transmission direction.
 
@@ -127,7 +165,7 @@ class Result:
             return np.mod(-np.angle(self.rho_t, deg=True), 360)
         return -np.angle(self.rho_t, deg=True)
 
-    @property
+    @_cached
     def rho_matrix(self) -> npt.NDArray:
         r"""Returns the matrix of the ellipsometric parameter
         :math:`\rho` in reflection direction.
@@ -141,9 +179,9 @@ class Result:
             \end{bmatrix}
         """
         r_ss = self.jones_matrix_r[..., 1, 1]
-        return self.jones_matrix_r / r_ss[:, None, None]
+        return self.jones_matrix_r / r_ss[..., None, None]
 
-    @property
+    @_cached
     def rho_matrix_t(self) -> npt.NDArray:
         r"""Returns the matrix of the ellipsometric parameter
         :math:`\rho_t` in reflection direction.
@@ -157,9 +195,9 @@ class Result:
             \end{bmatrix}
         """
         t_ss = self.jones_matrix_t[..., 1, 1]
-        return self.jones_matrix_t / t_ss[:, None, None]
+        return self.jones_matrix_t / t_ss[..., None, None]
 
-    @property
+    @_cached
     def psi_matrix(self) -> npt.NDArray:
         r"""Returns the matrix of the ellipsometric parameter
         :math:`\psi` in reflection direction.
@@ -171,7 +209,7 @@ class Result:
         """
         return np.rad2deg(np.arctan(np.abs(self.rho_matrix)))
 
-    @property
+    @_cached
     def psi_matrix_t(self) -> npt.NDArray:
         r"""Returns the matrix of the ellipsometric parameter
         :math:`\psi_\text{t}` in transmission direction.
@@ -183,7 +221,7 @@ class Result:
         """
         return np.rad2deg(np.arctan(np.abs(self.rho_matrix_t)))
 
-    @property
+    @_cached
     def delta_matrix(self) -> npt.NDArray:
         r"""Returns the matrix of the ellipsometric parameter
         :math:`\Delta` in reflection direction.
@@ -195,7 +233,7 @@ class Result:
         """
         return -np.angle(self.rho_matrix, deg=True)
 
-    @property
+    @_cached
     def delta_matrix_t(self) -> npt.NDArray:
         r"""Returns the matrix of the ellipsometric parameter
         :math:`\Delta_\text{t}` in transmission direction.
@@ -207,20 +245,20 @@ class Result:
         """
         return -np.angle(self.rho_matrix_t, deg=True)
 
-    @property
+    @_cached
     def mueller_matrix(self) -> npt.NDArray:
         """Returns the Mueller matrix for reflection, calculated from the rho matrix."""
-        a = np.array([[1, 0, 0, 1], [1, 0, 0, -1], [0, 1, 1, 0], [0, 1j, -1j, 0]])
+        rho_matrix = self.rho_matrix
 
         # Kronecker product of S and S*
         s_kron_s_star = np.einsum(
-            "aij,akl->aikjl", np.conjugate(self.rho_matrix), self.rho_matrix
-        ).reshape([self.rho_matrix.shape[0], 4, 4])
+            "...ij,...kl->...ikjl", np.conjugate(rho_matrix), rho_matrix
+        ).reshape(rho_matrix.shape[:-2] + (4, 4))
 
-        mueller_matrix = np.real(a @ s_kron_s_star @ np.linalg.inv(a))
-        mm11 = mueller_matrix[:, 0, 0]
+        mueller_matrix = np.real(_MUELLER_A @ s_kron_s_star @ _MUELLER_A_INV)
+        mm11 = mueller_matrix[..., 0, 0]
 
-        return mueller_matrix / mm11[:, None, None]
+        return mueller_matrix / mm11[..., None, None]
 
     @property
     def jones_matrix_r(self) -> npt.NDArray:
@@ -244,7 +282,7 @@ class Result:
         """
         return self._jones_matrix_t
 
-    @property
+    @_cached
     def jones_matrix_rc(self) -> npt.NDArray:
         r"""Returns the Jones matrix with the amplitude reflection coefficients
         for circular polarization.
@@ -254,13 +292,11 @@ class Result:
             r_\text{LL} & r_\text{LR} \\ r_\text{RL} & r_\text{RR}
             \end{bmatrix}
         """
-        c = 1 / sqrt(2) * np.array([[1, 1], [1j, -1j]])
-        d = 1 / sqrt(2) * np.array([[-1, -1], [-1j, 1j]])
         return np.einsum(
-            "ij,...jk,kl->...il", np.linalg.inv(d), self._jones_matrix_r, c
+            "ij,...jk,kl->...il", _CIRCULAR_D_INV, self._jones_matrix_r, _CIRCULAR_C
         )
 
-    @property
+    @_cached
     def jones_matrix_tc(self) -> npt.NDArray:
         r"""Returns the Jones matrix with the amplitude transmission coefficients
         for circular polarization.
@@ -270,21 +306,21 @@ class Result:
             t_\text{LL} & t_\text{LR} \\ t_\text{RL} & t_\text{RR}
             \end{bmatrix}
         """
-        c = 1 / sqrt(2) * np.array([[1, 1], [1j, -1j]])
         return np.einsum(
-            "ij,...jk,kl->...il", np.linalg.inv(c), self._jones_matrix_t, c
+            "ij,...jk,kl->...il", _CIRCULAR_C_INV, self._jones_matrix_t, _CIRCULAR_C
         )
 
-    @property
+    @_cached
     def R(self) -> npt.NDArray:
         r"""Returns the absolute reflectance for unpolarized light.
 
         .. math::
             R = (R_{pp} + R_{ss}) / 2
         """
-        return (self.R_matrix[:, 0, 0] + self.R_matrix[:, 1, 1]) / 2
+        R_matrix = self.R_matrix
+        return (R_matrix[..., 0, 0] + R_matrix[..., 1, 1]) / 2
 
-    @property
+    @_cached
     def R_matrix(self) -> npt.NDArray:
         r"""Returns the reflectance matrix separated for s and p polarization.
 
@@ -293,25 +329,28 @@ class Result:
         """
         return np.abs(self._jones_matrix_r) ** 2
 
-    @property
+    @_cached
     def T(self) -> npt.NDArray:
         r"""Returns the absolute transmittance for unpolarized light.
 
         .. math::
             T = (T_{pp} / T_{ss}) / 2
         """
-        return (self.T_matrix[:, 0, 0] + self.T_matrix[:, 1, 1]) / 2
+        T_matrix = self.T_matrix
+        return (T_matrix[..., 0, 0] + T_matrix[..., 1, 1]) / 2
 
-    @property
+    @_cached
     def T_matrix(self) -> npt.NDArray:
         r"""Returns the transmittance matrix separated for s and p polarization.
 
         .. math::
             M_T = \begin{bmatrix} T_{pp} & T_{ps} \\ T_{sp} & T_{ss} \end{bmatrix}
         """
-        return np.abs(self._jones_matrix_t) ** 2 * self._power_correction[:, None, None]
+        return (
+            np.abs(self._jones_matrix_t) ** 2 * self._power_correction[..., None, None]
+        )
 
-    @property
+    @_cached
     def Rc_matrix(self) -> npt.NDArray:
         r"""Returns the reflectance matrix for circular polarizations.
 
@@ -320,14 +359,27 @@ class Result:
         """
         return np.abs(self.jones_matrix_rc) ** 2
 
-    @property
+    @_cached
     def Tc_matrix(self) -> npt.NDArray:
         r"""Returns the transmittance matrix with the for circular polarizations.
 
         .. math::
             M_{Tc} = \begin{bmatrix} T_{LL} & T_{LR} \\ T_{RL} & T_{RR} \end{bmatrix}
         """
-        return np.abs(self.jones_matrix_tc) ** 2 * self._power_correction[:, None, None]
+        return (
+            np.abs(self.jones_matrix_tc) ** 2 * self._power_correction[..., None, None]
+        )
+
+    @property
+    def permittivity_profile(self) -> List:
+        """Returns the permittivity profile of the structure, which was used by the solver.
+
+        For batched calculations the tensors are given for the flattened batch axis.
+        Is None for results, which were not calculated by a solver.
+        """
+        if self.solver is None:
+            return None
+        return self.solver.permittivity_profile
 
     def __init__(
         self,
@@ -335,23 +387,31 @@ class Result:
         jones_matrix_r: npt.NDArray,
         jones_matrix_t: npt.NDArray,
         power_correction: npt.NDArray = None,
+        solver: "Solver" = None,
     ) -> None:
         """Creates result object, to store simulation data. Gets called by solvers.
 
         Args:
             experiment (Experiment):
                 Evaluated experiment, with structure and experimental parameters.
+                The solvers pass a :meth:`snapshot<elli.experiment.Experiment.snapshot>`
+                of the experiment.
             jones_matrix_r (npt.NDArray): Jones matrix for the reflection direction.
             jones_matrix_t (npt.NDArray): Jones matrix for the transmission direction.
             power_correction (npt.NDArray):
                 Correction factors, to get the power transmission values.
+            solver (Solver, optional):
+                Solver, which calculated the result. It is used to calculate derivatives.
+                Defaults to None.
         """
         self.experiment = experiment
+        self.solver = solver
         self._jones_matrix_r = jones_matrix_r
         self._jones_matrix_t = jones_matrix_t
         self._delta_range = (-180, 180)
+        self._cache = {}
         if power_correction is None:
-            self._power_correction = np.ones_like(self.experiment.lbda)
+            self._power_correction = np.ones(jones_matrix_r.shape[:-2])
         else:
             self._power_correction = power_correction
 
@@ -412,19 +472,71 @@ class Result:
         if names[0] in ["psi", "delta", "rho", "R", "T"]:
             if len(names) == 1:
                 return self.__getattribute__(names[0])
-            return self.__getattribute__(names[0] + "_matrix")[:, i, j]
+            return self.__getattribute__(names[0] + "_matrix")[..., i, j]
 
         if names[0] in ["r", "rc", "t", "tc"]:
             if len(names) == 1:
                 return self.__getattribute__("jones_matrix_" + names[0])
-            return self.__getattribute__("jones_matrix_" + names[0])[:, i, j]
+            return self.__getattribute__("jones_matrix_" + names[0])[..., i, j]
 
         if names[0] in ["Rc", "Tc"]:
             if len(names) == 1:
                 return self.__getattribute__(names[0] + "_matrix")
-            return self.__getattribute__(names[0] + "_matrix")[:, i, j]
+            return self.__getattribute__(names[0] + "_matrix")[..., i, j]
+
+        return self.__getattribute__(names[0])[..., i, j]
+
+    def jacobian(
+        self, name: str, parameters: List[str], step: float = 1e-6
+    ) -> npt.NDArray:
+        """Calculates the derivatives of a property with respect to fit parameters.
+
+        The derivatives of the Jones matrices are calculated by the solver
+        (see :meth:`elli.solver.Solver.calculate_jacobian`), without evaluating the
+        structure again for every parameter. They are converted into derivatives
+        of the requested property by central differences of the Jones matrices.
+
+        Args:
+            name (str): Name of the property, e.g. 'rho', 'psi' or 'mueller_matrix'.
+            parameters (List[str]): Names of the fit parameters.
+            step (float, optional):
+                Relative step size for the central differences. Defaults to 1e-6.
+
+        Returns:
+            npt.NDArray: Derivatives of the property with an additional leading parameter axis.
+        """
+        if self.solver is None:
+            raise ValueError("Derivatives can only be calculated for solver results.")
+
+        d_jones_r, d_jones_t, d_power_correction = self.solver.calculate_jacobian(
+            parameters, step
+        )
+        scale = np.linalg.norm(self._jones_matrix_r) + np.linalg.norm(
+            self._jones_matrix_t
+        )
+
+        derivatives = []
+        for d_r, d_t, d_pc in zip(d_jones_r, d_jones_t, d_power_correction):
+            norm = np.linalg.norm(d_r) + np.linalg.norm(d_t) + np.linalg.norm(d_pc)
+            if norm == 0:
+                derivatives.append(np.zeros_like(getattr(self, name)))
+                continue
+
+            delta = step * scale / norm
+            plus, minus = (
+                Result(
+                    self.experiment,
+                    self._jones_matrix_r + sign * delta * d_r,
+                    self._jones_matrix_t + sign * delta * d_t,
+                    self._power_correction + sign * delta * d_pc,
+                ).as_delta_range(*self._delta_range)
+                for sign in [1, -1]
+            )
+            derivatives.append(
+                (getattr(plus, name) - getattr(minus, name)) / (2 * delta)
+            )
 
-        return self.__getattribute__(names[0])[:, i, j]
+        return np.array(derivatives)
 
     def as_delta_range(self, lower: int, upper: int):
         """Returns this result in another delta range
@@ -447,6 +559,8 @@ class Result:
         if (lower, upper) not in [(-180, 180), (0, 180), (0, 360)]:
             raise ValueError(f"Invalid delta range ({lower}, {upper})")
 
+        if (lower, upper) != self._delta_range:
+            self._cache.clear()
         self._delta_range = (lower, upper)
 
         return self
@@ -539,3 +653,136 @@ class AveragedResultList(ResultList):
             )
 
         return np.mean(super().__getattr__(name), axis=0)
+
+
+class StackedResultList(ResultList):
+    """ResultList, which stores the Jones matrices of all results in one array.
+
+    The properties are calculated for all results at once,
+    instead of collecting them from every single result.
+    All results need the same shape and the same polarization of the incident light.
+    The stored arrays grow by doubling their capacity,
+    so appending results one at a time is cheap as well.
+    """
+
+    def __init__(self, results: List[Result] = None) -> None:
+        """Creates an StackedResultList object.
+
+        Args:
+            results (List[Result], optional): List of results to store. Defaults to None.
+        """
+        self.results = []
+        self._size = 0
+        self._jones_matrix_r = None
+        self._jones_matrix_t = None
+        self._power_correction = None
+        self._stacked = None
+        # Number of results, for which the arrays are allocated with the first result
+        self._capacity = 1
+
+        if results is not None:
+            self._reserve(len(results))
+            for result in results:
+                self.append(result)
+
+    def _reserve(self, capacity: int) -> None:
+        """Grows the stored arrays to hold at least 'capacity' results."""
+        if self._jones_matrix_r is None:
+            self._capacity = max(self._capacity, capacity)
+            return
+        if capacity <= len(self._jones_matrix_r):
+            return
+
+        for name in ["_jones_matrix_r", "_jones_matrix_t", "_power_correction"]:
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+    def append(self, result: Result) -> None:
+        """Append a single Result to the StackedResultList.
+
+        Args:
+            result (Result): Additional Result to store.
+
+        Raises:
+            ValueError: Raised when the result has another shape, incident polarization
+                or delta range than the stored results.
+        """
+        if self._jones_matrix_r is None:
+            self._jones_matrix_r = np.empty(
+                (self._capacity,) + result.jones_matrix_r.shape, dtype=np.complex128
+            )
+            self._jones_matrix_t = np.empty_like(self._jones_matrix_r)
+            self._power_correction = np.empty(
+                (self._capacity,) + result.jones_matrix_r.shape[:-2]
+            )
+        elif result.jones_matrix_r.shape != self._jones_matrix_r.shape[1:]:
+            raise ValueError("All results need the same shape.")
+        elif not np.array_equal(
+            result.experiment.jones_vector, self.results[0].experiment.jones_vector
+        ):
+            raise ValueError("All results need the same incident polarization.")
+        elif tuple(result._delta_range) != tuple(self.results[0]._delta_range):
+            raise ValueError("All results need the same delta range.")
+
+        if self._size == len(self._jones_matrix_r):
+            self._reserve(2 * self._size)
+
+        self._jones_matrix_r[self._size] = result.jones_matrix_r
+        self._jones_matrix_t[self._size] = result.jones_matrix_t
+        self._power_correction[self._size] = result._power_correction
+        self._size += 1
+        self.results.append(result)
+        self._stacked = None
+
+    def _stack(self) -> Result:
+        """Returns a Result with a leading axis for the stored results."""
+        if self._stacked is None:
+            first = self.results[0]
+            self._stacked = Result(
+                first.experiment,
+                self._jones_matrix_r[: self._size],
+                self._jones_matrix_t[: self._size],
+                self._power_correction[: self._size],
+            ).as_delta_range(*first._delta_range)
+        return self._stacked
+
+    def __getattr__(self, name: str) -> npt.NDArray:
+        """Returns the data for the requested variable 'name' of all results.
+
+        Args:
+            name (str): Variable name to return, as for the ResultList.
+
+        Returns:
+            npt.NDArray: Array of data.
+        """
+        if name.startswith("_"):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+
+        if name == "mean":
+            # The views of the filled part stay valid, as later appends to this list
+            # only write behind it or into new arrays, and the averaged list
+            # grows into new arrays as well
+            averaged = AveragedStackedResultList()
+            averaged.results = self.results[: self._size]
+            averaged._size = self._size
+            if self._size > 0:
+                averaged._jones_matrix_r = self._jones_matrix_r[: self._size]
+                averaged._jones_matrix_t = self._jones_matrix_t[: self._size]
+                averaged._power_correction = self._power_correction[: self._size]
+            return averaged
+
+        if self._size == 0:
+            return np.squeeze(np.array([]))
+
+        return np.squeeze(getattr(self._stack(), name))
+
+
+class AveragedStackedResultList(AveragedResultList, StackedResultList):
+    """StackedResultList with averaging over all results.
+    Can be used as drop-in replacement for Result objects, if for example
+    thickness inhomogeneities need to be simulated.
+    """
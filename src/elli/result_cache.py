@@ -0,0 +1,255 @@
+# Encoding: utf-8
+"""Persistent on-disk cache for the results of experiments.
+
+Repeated evaluations of the same structure, e.g. across processes of a parameter sweep
+or in the restarts of an analysis notebook, can reuse the Jones matrices of earlier runs.
+A :class:`ResultCache` stores them in a local directory, keyed by a fingerprint
+of everything the solver uses as input:
+
+* the evaluated permittivity profile (layer thicknesses and permittivities),
+  which covers the materials, dispersion parameters and tabulated data,
+* the wavelengths, incidence angles and the symmetry of the back material,
+* the solver class and its keyword arguments.
+
+.. code-block:: python
+
+    cache = elli.ResultCache("~/.cache/pyElli")
+    result = structure.evaluate(lbda, 70, result_cache=cache)
+
+The total size of the stored results is bounded,
+the least recently used results are removed first.
+The size is tracked while storing, the directory is only scanned
+when the limit is exceeded, which then frees space down to 90 % of the limit.
+The directory can be shared by several processes, as every result is written
+to a temporary file and then atomically moved into place.
+"""
+
+import os
+import tempfile
+import zipfile
+from hashlib import blake2b
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .dispersions.base_dispersion import _param_value
+from .result import Result
+from .solver import RepeatedProfile, Solver
+from .solver4x4 import TransferMatrixCache
+
+
+class ResultCache:
+    """Content-addressed cache of Jones matrices in a local directory.
+
+    The permittivity profile is still evaluated on every call,
+    only the solution of the experiment is skipped on a cache hit.
+    The returned result is linked to the solver, so derivatives are available
+    as for uncached evaluations.
+    """
+
+    suffix = ".npz"
+    low_water = 0.9
+
+    def __init__(self, directory: str, max_size: int = 2**30) -> None:
+        """Creates the cache and its directory, if it does not exist.
+
+        Args:
+            directory (str): Directory used to store the results.
+            max_size (int, optional):
+                Maximum total size of the stored results (in bytes). Defaults to 1 GiB.
+        """
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def clear(self) -> None:
+        """Removes all stored results and resets the counters."""
+        self.hits = 0
+        self.misses = 0
+        for path, _, _ in self._entries():
+            _remove(path)
+        self._size = 0
+
+    def evaluate(
+        self,
+        experiment: "Experiment",
+        solver: Solver,
+        execution: "ParallelExecution" = None,
+        **solver_kwargs,
+    ) -> Result:
+        """Returns the stored result of the experiment or evaluates and stores it.
+
+        Args:
+            experiment (Experiment): Experiment to evaluate.
+            solver (Solver): Solver class used for the evaluation.
+            execution (ParallelExecution, optional):
+                Execution option used to solve the experiment, if the result is not stored.
+                Defaults to None.
+            solver_kwargs (optional): Keyword arguments for the Solver.
+
+        Returns:
+            Result: Result of the experiment.
+        """
+        solv = solver(experiment, **solver_kwargs)
+        path = os.path.join(self.directory, self.fingerprint(solv, solver_kwargs))
+
+        arrays = self._load(path + self.suffix)
+        if arrays is not None:
+            self.hits += 1
+            return Result(solv.experiment, *arrays, solv)
+
+        self.misses += 1
+        if execution is None:
+            result = solv.calculate()
+        else:
+            # The chunks reuse the permittivity profile evaluated for the fingerprint
+            result = execution.calculate(solv)
+
+        self._store(path, result)
+        return result
+
+    @staticmethod
+    def fingerprint(solver: Solver, solver_kwargs: Dict[str, Any] = None) -> str:
+        """Returns the key of the result of an initialized solver.
+
+        Args:
+            solver (Solver): Solver object with the evaluated permittivity profile.
+            solver_kwargs (Dict[str, Any], optional):
+                Keyword arguments used to create the solver. Defaults to None.
+
+        Returns:
+            str: Hexadecimal digest of the solver inputs.
+        """
+        hash_func = blake2b(digest_size=20)
+        _update(hash_func, type(solver))
+        _update(
+            hash_func,
+            {
+                key: value
+                for key, value in (solver_kwargs or {}).items()
+                if not isinstance(value, TransferMatrixCache)
+            },
+        )
+        _update(hash_func, solver.batch_shape)
+        _update(hash_func, solver.lbda)
+        _update(hash_func, solver.theta_i)
+        _update(hash_func, solver.structure.back_material.symmetry)
+        _update_profile(hash_func, solver.permittivity_profile)
+        return hash_func.hexdigest()
+
+    def _entries(self) -> list:
+        """Returns the path, size and modification time of the stored results."""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(self.suffix):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _load(
+        self, path: str
+    ) -> Optional[Tuple[npt.NDArray, npt.NDArray, npt.NDArray]]:
+        try:
+            with np.load(path) as data:
+                arrays = (
+                    data["jones_matrix_r"],
+                    data["jones_matrix_t"],
+                    data["power_correction"],
+                )
+            # Mark the result as recently used for the eviction
+            os.utime(path)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+        return arrays
+
+    def _store(self, path: str, result: Result) -> None:
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                np.savez(
+                    file,
+                    jones_matrix_r=result.jones_matrix_r,
+                    jones_matrix_t=result.jones_matrix_t,
+                    power_correction=result._power_correction,
+                )
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, path + self.suffix)
+        except BaseException:
+            _remove(temp_path)
+            raise
+
+        # Results stored by other processes are only counted by the next scan
+        if self._size is None or self._size + size > self.max_size:
+            self._evict()
+        else:
+            self._size += size
+
+    def _evict(self) -> None:
+        """Scans the directory for its total size and, if it exceeds the size limit,
+        removes the least recently used results down to the low-water mark."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total_size = sum(size for _, size, _ in entries)
+        if total_size > self.max_size:
+            for path, size, _ in entries:
+                if total_size <= self.low_water * self.max_size:
+                    break
+                _remove(path)
+                total_size -= size
+        self._size = total_size
+
+
+def _remove(path: str) -> None:
+    # Another process may have removed the file in the meantime
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _update(hash_func: Any, value: Any) -> None:
+    """Adds a value to the hash, tagged with its type to keep different inputs apart."""
+    if isinstance(value, np.ndarray) or isinstance(value, np.generic):
+        value = np.ascontiguousarray(value)
+        hash_func.update(f"array{value.dtype.str}{value.shape}".encode())
+        hash_func.update(value)
+    elif value is None or isinstance(value, (bool, int, float, complex, str)):
+        hash_func.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (list, tuple)):
+        hash_func.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _update(hash_func, item)
+    elif isinstance(value, dict):
+        hash_func.update(f"dict{len(value)}".encode())
+        for key in sorted(value):
+            _update(hash_func, key)
+            _update(hash_func, value[key])
+    elif isinstance(value, type) or callable(value) and hasattr(value, "__qualname__"):
+        hash_func.update(f"{value.__module__}.{value.__qualname__};".encode())
+    else:
+        _update(hash_func, type(value))
+        _update(hash_func, vars(value))
+
+
+def _update_profile(hash_func: Any, profile: list) -> None:
+    """Adds the thicknesses and permittivities of a profile to the hash."""
+    hash_func.update(f"profile{len(profile)}".encode())
+    for entry in profile:
+        if isinstance(entry, RepeatedProfile):
+            _update(hash_func, entry.repetitions)
+            _update_profile(hash_func, entry.profile)
+        else:
+            thickness, epsilon = entry
+            _update(hash_func, np.asarray(_param_value(thickness), dtype=np.float64))
+            _update(hash_func, np.asarray(epsilon))
@@ -1,18 +1,318 @@
 # Encoding: utf-8
 from abc import ABC, abstractmethod
-from copy import deepcopy
+from copy import copy
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import numpy.typing as npt
 
 from .result import Result
 
 
+class RepeatedProfile:
+    """Permittivity profile of a periodic block of layers, which is repeated several times.
+
+    The block is kept as a unit in the permittivity profile,
+    so a solver can calculate the transfer matrix of one period
+    and raise it to the power of the number of repetitions.
+    """
+
+    def __init__(self, profile: List, repetitions: int) -> None:
+        """Creates the profile of a repeated block of layers.
+
+        Args:
+            profile (List): Permittivity profile of one period.
+            repetitions (int): Number of repetitions.
+        """
+        self.profile = profile
+        self.repetitions = repetitions
+
+    def unroll(self) -> List[Tuple[float, npt.NDArray]]:
+        """Returns the flat permittivity profile with all periods.
+
+        Returns:
+            List[Tuple[float, npt.NDArray]]:
+                Returns list of tuples [(thickness, dielectric tensor), ...]
+        """
+        return self.repetitions * unroll_profile(self.profile)
+
+
+class PackedProfile:
+    """Dense representation of a sequence of homogeneous layers of a permittivity profile.
+
+    The dielectric tensors of all layers are stored in one contiguous
+    (layers x wavelengths x 3 x 3) array, the thicknesses in one vector,
+    which gets an additional wavelength axis for batched parameter sets.
+    So a solver can build the Delta matrices and propagators of all layers
+    in one vectorized call, instead of one call per layer.
+
+    Profiles of scalar dielectric functions, as used by solvers for isotropic media,
+    are stored as one (layers x wavelengths) array.
+    """
+
+    def __init__(self, thickness: npt.ArrayLike, epsilon: npt.NDArray) -> None:
+        """Creates the packed profile of a sequence of layers.
+
+        Args:
+            thickness (npt.ArrayLike):
+                Thicknesses of the layers (layers) or (layers x wavelengths).
+            epsilon (npt.NDArray):
+                Dielectric tensors (layers x wavelengths x 3 x 3)
+                or scalar dielectric functions (layers x wavelengths).
+        """
+        self.thickness = np.asarray(thickness, dtype=np.float64)
+        self.epsilon = np.asarray(epsilon, dtype=np.complex128)
+
+        if self.epsilon.ndim == 2:
+            self.isotropic = np.ones(self.epsilon.shape[0], dtype=bool)
+            return
+
+        # Layers with a scalar dielectric function at all wavelengths
+        diagonal = np.diagonal(self.epsilon, axis1=-2, axis2=-1)
+        off_diagonal = self.epsilon[..., ~np.eye(3, dtype=bool)]
+        self.isotropic = np.all(
+            np.all(diagonal == diagonal[..., :1], axis=-1)
+            & np.all(off_diagonal == 0, axis=-1),
+            axis=-1,
+        )
+
+    @classmethod
+    def from_profile(cls, profile: List[Tuple[float, npt.NDArray]]) -> "PackedProfile":
+        """Packs a flat permittivity profile without repeated blocks.
+
+        Args:
+            profile (List[Tuple[float, npt.NDArray]]):
+                List of tuples [(thickness, dielectric tensor), ...]
+
+        Returns:
+            PackedProfile: Packed profile of the layers.
+        """
+        thicknesses = [entry[0] for entry in profile]
+        if any(np.ndim(thickness) > 0 for thickness in thicknesses):
+            size = profile[0][1].shape[0]
+            thicknesses = [
+                np.broadcast_to(
+                    thickness if np.ndim(thickness) > 0 else float(thickness), size
+                )
+                for thickness in thicknesses
+            ]
+        else:
+            thicknesses = [float(thickness) for thickness in thicknesses]
+
+        return cls(np.array(thicknesses), np.array([entry[1] for entry in profile]))
+
+    def __len__(self) -> int:
+        return self.epsilon.shape[0]
+
+    def unpack(self) -> List[Tuple[npt.ArrayLike, npt.NDArray]]:
+        """Returns the permittivity profile as list of tuples.
+
+        Returns:
+            List[Tuple[npt.ArrayLike, npt.NDArray]]:
+                Returns list of tuples [(thickness, dielectric tensor), ...]
+        """
+        return list(zip(self.thickness, self.epsilon))
+
+
+def pack_profile(profile: List, max_size: int = None) -> List:
+    """Packs the consecutive homogeneous layers of a permittivity profile.
+
+    Repeated blocks are kept and their profile is packed as well.
+
+    Args:
+        profile (List): Permittivity profile, which may contain RepeatedProfile entries.
+        max_size (int, optional):
+            Maximum number of tensors (layers x wavelengths) in one packed profile,
+            longer sequences are split up. Defaults to None, which means no limit.
+
+    Returns:
+        List: Profile with PackedProfile and RepeatedProfile entries.
+    """
+    packed = []
+    run = []
+
+    def pack_run():
+        if not run:
+            return
+        n_layers = len(run)
+        if max_size is not None:
+            n_layers = max(1, max_size // run[0][1].shape[0])
+        for start in range(0, len(run), n_layers):
+            packed.append(PackedProfile.from_profile(run[start : start + n_layers]))
+        run.clear()
+
+    for entry in profile:
+        if isinstance(entry, PackedProfile):
+            pack_run()
+            packed.append(entry)
+        elif isinstance(entry, RepeatedProfile):
+            pack_run()
+            packed.append(
+                RepeatedProfile(
+                    pack_profile(entry.profile, max_size), entry.repetitions
+                )
+            )
+        else:
+            run.append(entry)
+    pack_run()
+
+    return packed
+
+
+def unroll_profile(profile: List) -> List[Tuple[float, npt.NDArray]]:
+    """Unrolls all repeated blocks of a permittivity profile.
+
+    Args:
+        profile (List): Permittivity profile, which may contain RepeatedProfile entries.
+
+    Returns:
+        List[Tuple[float, npt.NDArray]]:
+            Returns list of tuples [(thickness, dielectric tensor), ...]
+    """
+    unrolled = []
+    for entry in profile:
+        if isinstance(entry, RepeatedProfile):
+            unrolled += entry.unroll()
+        else:
+            unrolled.append(entry)
+    return unrolled
+
+
+def find_parameters(obj: Any, name: str) -> List:
+    """Finds all fit parameters with the given name, which are used in an object.
+
+    Fit parameters, e.g. lmfit Parameter objects, are identified by their ``name`` attribute.
+    They are found if they are directly used as attribute of a pyElli object,
+    e.g. as thickness of a layer or as parameter of a dispersion,
+    or inside of lists and dicts of such objects.
+
+    Args:
+        obj (Any): Object to search, e.g. a Structure.
+        name (str): Name of the fit parameter.
+
+    Returns:
+        List: Parameter objects with the given name.
+    """
+    return [slot[-1] for slot in _parameter_slots(obj) if slot[-1].name == name]
+
+
+def _parameter_slots(obj: Any) -> List[Tuple]:
+    """Returns the places (container, key, setter, parameter) of all fit parameters in an object."""
+    slots = []
+    visited = set()
+    package = __name__.split(".", maxsplit=1)[0]
+
+    def search(item):
+        if id(item) in visited:
+            return
+        visited.add(id(item))
+
+        if isinstance(item, dict):
+            items, setitem = item.items(), dict.__setitem__
+        elif isinstance(item, list):
+            items, setitem = enumerate(item), list.__setitem__
+        elif type(item).__module__.split(".", maxsplit=1)[0] == package and hasattr(
+            item, "__dict__"
+        ):
+            items, setitem = vars(item).items(), setattr
+        else:
+            return
+
+        for key, value in list(items):
+            if isinstance(getattr(value, "name", None), str) and hasattr(
+                value, "value"
+            ):
+                slots.append((item, key, setitem, value))
+            else:
+                search(value)
+
+    search(obj)
+    return slots
+
+
+def _substitute_parameters(obj: Any, values: Dict[str, float]) -> Any:
+    """Returns a copy of an object, where the fit parameters are replaced by values
+    given by their names.
+
+    Only the containers and pyElli objects, which lead to a replaced parameter, are copied.
+    Everything else is shared with the original object, which is left unchanged.
+    Therefore, the same structure can be evaluated concurrently, e.g. in several threads.
+
+    Args:
+        obj (Any): Object to copy, e.g. a Structure.
+        values (Dict[str, float]): Values of the fit parameters by their names.
+
+    Returns:
+        Any: Copy of the object with the substituted values or the object itself,
+        if it does not contain any of the parameters.
+    """
+    package = __name__.split(".", maxsplit=1)[0]
+    replacements = {}
+
+    def substitute(item):
+        if id(item) in replacements:
+            return replacements[id(item)]
+
+        if isinstance(item, dict):
+            items, setitem = item.items(), dict.__setitem__
+        elif isinstance(item, list):
+            items, setitem = enumerate(item), list.__setitem__
+        elif type(item).__module__.split(".", maxsplit=1)[0] == package and hasattr(
+            item, "__dict__"
+        ):
+            items, setitem = vars(item).items(), setattr
+        else:
+            return item
+
+        # References back to an object, which is still searched, keep the original
+        replacements[id(item)] = item
+        changes = {}
+        for key, value in list(items):
+            if isinstance(getattr(value, "name", None), str) and hasattr(
+                value, "value"
+            ):
+                if value.name in values:
+                    changes[key] = values[value.name]
+            else:
+                new_value = substitute(value)
+                if new_value is not value:
+                    changes[key] = new_value
+
+        if not changes:
+            return item
+
+        replica = copy(item)
+        for key, value in changes.items():
+            setitem(replica, key, value)
+
+        replacements[id(item)] = replica
+        return replica
+
+    return substitute(obj)
+
+
 class Solver(ABC):
     """
     Solver base class to evaluate Experiment objects.
     Here the experiment and structure get unpacked
     and the simulation results get returned.
 
+    If the experiment contains an array of incidence angles,
+    the (angle x wavelength) batch is flattened into one long axis,
+    so the subclasses can treat it like a single wavelength axis.
+    The permittivity profile is only evaluated once for the wavelengths
+    and then repeated for every angle.
+    In the same way, experiments with a table of parameter sets are evaluated
+    in one (parameter set x angle x wavelength) batch, where the layer thicknesses
+    are arrays with one value per element of the batch.
+
     The actual simulation is handled by subclasses.
     Therefore, this class should never be called directly.
+
+    The derivatives of the results with respect to fit parameters are calculated
+    in forward mode: The derivative of the permittivity profile is obtained
+    by evaluating the dispersions with shifted parameter values
+    and handed to the subclass, which propagates it through the transfer matrices.
     """
 
     experiment = None
@@ -21,15 +321,453 @@ class Solver(ABC):
     theta_i = None
     jones_vector = None
     permittivity_profile = None
+    batch_shape = ()
+
+    # True, if the solver only handles isotropic media and is given
+    # the profile of scalar dielectric functions instead of the dielectric tensors
+    scalar_epsilon = False
 
     @abstractmethod
     def calculate(self) -> Result:
         pass
 
     def __init__(self, experiment: "Experiment") -> None:
-        self.experiment = deepcopy(experiment)
+        self.experiment = experiment.snapshot()
         self.structure = self.experiment.structure
         self.lbda = self.experiment.lbda
         self.theta_i = self.experiment.theta_i
         self.jones_vector = self.experiment.jones_vector
-        self.permittivity_profile = self.structure.get_permittivity_profile(self.lbda)
+
+        self.batch_shape = np.shape(self.theta_i)
+        if self.experiment.parameter_sets is not None:
+            self._stack_parameter_sets()
+            return
+
+        self.permittivity_profile = self._evaluate_profile(self.structure)
+        if self.batch_shape != ():
+            self._flatten_angles()
+
+    def _flatten_angles(self) -> None:
+        """Flattens the (angle x wavelength) batch of the angles and wavelengths into one axis.
+
+        The permittivity profile is already tiled by :meth:`_evaluate_profile`.
+        """
+        n_theta = np.size(self.theta_i)
+        n_lbda = self.lbda.shape[0]
+
+        self.theta_i = np.repeat(np.ravel(self.theta_i), n_lbda)
+        self.lbda = np.tile(self.lbda, n_theta)
+
+    def _tile_profile(self, profile: List) -> List:
+        """Repeats the tensors of a permittivity profile for every incidence angle."""
+        n_theta = int(np.prod(self.batch_shape))
+
+        def tile_profile(profile):
+            return [
+                RepeatedProfile(tile_profile(entry.profile), entry.repetitions)
+                if isinstance(entry, RepeatedProfile)
+                else (
+                    entry[0],
+                    np.tile(entry[1], (n_theta,) + (1,) * (entry[1].ndim - 1)),
+                )
+                for entry in profile
+            ]
+
+        return tile_profile(profile)
+
+    def _stack_parameter_sets(self) -> None:
+        """Evaluates the permittivity profile for every parameter set
+        and flattens the (parameter set x angle x wavelength) batch into one axis.
+
+        The thicknesses of the layers become arrays with one value per element of the batch.
+        """
+        parameter_sets = self.experiment.parameter_sets
+        slots = _parameter_slots(self.structure)
+        found = {slot[-1].name for slot in slots}
+        missing = [name for name in parameter_sets if name not in found]
+        if missing:
+            raise ValueError(
+                f"Parameters {missing} are not used in the structure. "
+                "Use named parameters, e.g. lmfit Parameter objects, in the structure."
+            )
+
+        n_sets = len(next(iter(parameter_sets.values())))
+        profiles = [
+            self._evaluate_profile(
+                _substitute_parameters(
+                    self.structure,
+                    {name: values[i] for name, values in parameter_sets.items()},
+                )
+            )
+            for i in range(n_sets)
+        ]
+
+        if self.batch_shape != ():
+            self._flatten_angles()
+            self.theta_i = np.tile(self.theta_i, n_sets)
+        self.lbda = np.tile(self.lbda, n_sets)
+        self.permittivity_profile = _stack_profiles(
+            profiles, self.lbda.shape[0] // n_sets
+        )
+        self.batch_shape = (n_sets,) + self.batch_shape
+
+    def select_wavelengths(self, index: npt.ArrayLike) -> "Solver":
+        """Returns a solver for a subset of the wavelengths of the experiment,
+        which reuses the evaluated permittivity profile.
+
+        Args:
+            index (npt.ArrayLike): Indices of the wavelengths of the experiment.
+
+        Returns:
+            Solver: Copy of the solver for the selected wavelengths.
+        """
+        n_lbda = self.experiment.lbda.shape[0]
+        batch = np.arange(self.lbda.shape[0]).reshape(-1, n_lbda)[:, index].ravel()
+
+        def select(profile):
+            return [
+                RepeatedProfile(select(entry.profile), entry.repetitions)
+                if isinstance(entry, RepeatedProfile)
+                else (
+                    entry[0][batch] if np.ndim(entry[0]) > 0 else entry[0],
+                    entry[1][batch],
+                )
+                for entry in profile
+            ]
+
+        solver = copy(self)
+        solver.experiment = copy(self.experiment)
+        solver.experiment.lbda = self.experiment.lbda[index]
+        solver.experiment.lbda.flags.writeable = False
+        solver.lbda = self.lbda[batch]
+        if np.ndim(self.theta_i) > 0:
+            solver.theta_i = self.theta_i[batch]
+        solver.permittivity_profile = select(self.permittivity_profile)
+        return solver
+
+    def _create_result(
+        self,
+        jones_matrix_r: npt.NDArray,
+        jones_matrix_t: npt.NDArray,
+        power_correction: npt.NDArray = None,
+    ) -> Result:
+        """Creates the Result object and restores the angle axis of batched calculations.
+
+        Args:
+            jones_matrix_r (npt.NDArray): Jones matrix for the reflection direction.
+            jones_matrix_t (npt.NDArray): Jones matrix for the transmission direction.
+            power_correction (npt.NDArray, optional):
+                Correction factors, to get the power transmission values. Defaults to None.
+
+        Returns:
+            Result: Result object with calculation results
+        """
+        shape = self.batch_shape + self.experiment.lbda.shape
+
+        jones_matrix_r = jones_matrix_r.reshape(shape + (2, 2))
+        jones_matrix_t = jones_matrix_t.reshape(shape + (2, 2))
+        if power_correction is not None:
+            power_correction = np.reshape(power_correction, shape)
+
+        return Result(
+            self.experiment, jones_matrix_r, jones_matrix_t, power_correction, self
+        )
+
+    def _calculate_profile(self, profile: List) -> Result:
+        """Evaluates the experiment for another permittivity profile of the structure."""
+        solver = copy(self)
+        solver.permittivity_profile = profile
+        return solver.calculate()
+
+    def calculate_tangents(
+        self, tangents: List, step: float = 1e-6
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Calculates the directional derivatives of the Jones matrices
+        for derivatives of the permittivity profile of the layers.
+
+        This implementation uses central differences of the complete calculation.
+        Subclasses override it with a forward mode propagation of the derivatives.
+
+        Args:
+            tangents (List):
+                Derivatives of the layer entries of the permittivity profile.
+                Every entry is a tuple of the derivatives of the thickness (n_directions)
+                and of the dielectric tensor (n_directions x wavelengths x 3 x 3)
+                or a RepeatedProfile of such entries.
+            step (float, optional): Step size of the central differences. Defaults to 1e-6.
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]:
+                Derivatives of the reflection and transmission Jones matrices
+                (n_directions x wavelengths x 2 x 2).
+        """
+
+        def shift(profile, tangent, direction, sign):
+            return [
+                RepeatedProfile(
+                    shift(entry.profile, diff.profile, direction, sign),
+                    entry.repetitions,
+                )
+                if isinstance(entry, RepeatedProfile)
+                else (
+                    entry[0] + sign * step * diff[0][direction],
+                    entry[1] + sign * step * diff[1][direction],
+                )
+                for entry, diff in zip(profile, tangent)
+            ]
+
+        layers = self.permittivity_profile[1:-1]
+        n_directions = _tangent_directions(tangents)
+        d_jones_r, d_jones_t = [], []
+
+        for direction in range(n_directions):
+            plus, minus = (
+                self._calculate_profile(
+                    self.permittivity_profile[:1]
+                    + shift(layers, tangents, direction, sign)
+                    + self.permittivity_profile[-1:]
+                )
+                for sign in [1, -1]
+            )
+            d_jones_r.append(
+                (plus.jones_matrix_r - minus.jones_matrix_r).reshape(-1, 2, 2)
+                / (2 * step)
+            )
+            d_jones_t.append(
+                (plus.jones_matrix_t - minus.jones_matrix_t).reshape(-1, 2, 2)
+                / (2 * step)
+            )
+
+        return np.array(d_jones_r), np.array(d_jones_t)
+
+    def calculate_jacobian(
+        self, parameters: List[str], step: float = 1e-6
+    ) -> Tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+        """Calculates the derivatives of the Jones matrices with respect to fit parameters.
+
+        The parameters are identified by their name (see :func:`find_parameters`),
+        so lmfit Parameter objects have to be used directly in the structure,
+        e.g. ``elli.Layer(material, params["d"])``.
+        Parameters, which are not found in the structure, get a derivative of zero.
+
+        The derivatives of the permittivity profile are calculated by central differences
+        of the layers, which contain the parameter. The thicknesses are differentiated exactly.
+        They are propagated through the layers by :meth:`calculate_tangents`,
+        which does not need any additional evaluation of the structure.
+        Parameters of the front or back material change the incidence conditions
+        and are calculated by central differences of the complete calculation.
+
+        Args:
+            parameters (List[str]): Names of the fit parameters.
+            step (float, optional):
+                Relative step size for the central differences. Defaults to 1e-6.
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+                Derivatives of the reflection and transmission Jones matrices
+                and of the power correction factors,
+                with an additional leading axis for the parameters.
+        """
+        if self.experiment.parameter_sets is not None:
+            raise ValueError(
+                "Derivatives are not supported for experiments with parameter sets."
+            )
+
+        shape = self.batch_shape + self.experiment.lbda.shape
+        d_jones_r = np.zeros((len(parameters),) + shape + (2, 2), dtype=np.complex128)
+        d_jones_t = np.zeros_like(d_jones_r)
+        d_power_correction = np.zeros((len(parameters),) + shape)
+
+        halfspace_slots = _parameter_slots(
+            [self.structure.front_material, self.structure.back_material]
+        )
+        layer_slots = [_parameter_slots(layer) for layer in self.structure.layers]
+        layer_profiles = None
+        layer_parameters = []
+        tangents = []
+
+        for index, name in enumerate(parameters):
+            found = [
+                slot[-1]
+                for slots in [halfspace_slots] + layer_slots
+                for slot in slots
+                if slot[-1].name == name
+            ]
+            if not found:
+                continue
+
+            value = float(found[0].value)
+            delta = step * max(abs(value), 1)
+
+            if any(slot[-1].name == name for slot in halfspace_slots):
+                plus, minus = (
+                    self._calculate_profile(
+                        self._evaluate_profile(
+                            _substitute_parameters(
+                                self.structure, {name: value + sign * delta}
+                            )
+                        )
+                    )
+                    for sign in [1, -1]
+                )
+                d_jones_r[index] = (plus.jones_matrix_r - minus.jones_matrix_r) / (
+                    2 * delta
+                )
+                d_jones_t[index] = (plus.jones_matrix_t - minus.jones_matrix_t) / (
+                    2 * delta
+                )
+                d_power_correction[index] = (
+                    plus._power_correction - minus._power_correction
+                ) / (2 * delta)
+                continue
+
+            if layer_profiles is None:
+                layer_profiles = [
+                    self._evaluate_profile(layer) for layer in self.structure.layers
+                ]
+
+            tangent = []
+            for layer, slots, profile in zip(
+                self.structure.layers, layer_slots, layer_profiles
+            ):
+                if not any(slot[-1].name == name for slot in slots):
+                    tangent += _profile_tangent(profile)
+                    continue
+
+                plus, minus = (
+                    self._evaluate_profile(
+                        _substitute_parameters(layer, {name: value + sign * delta})
+                    )
+                    for sign in [1, -1]
+                )
+                tangent += _profile_tangent(plus, minus, 2 * delta)
+
+            if tangent:
+                layer_parameters.append(index)
+                tangents.append(tangent)
+
+        if layer_parameters:
+            d_r, d_t = self.calculate_tangents(
+                _stack_tangents(tangents, self.permittivity_profile[1:-1])
+            )
+            d_jones_r[layer_parameters] = d_r.reshape((-1,) + shape + (2, 2))
+            d_jones_t[layer_parameters] = d_t.reshape((-1,) + shape + (2, 2))
+
+        return d_jones_r, d_jones_t, d_power_correction
+
+    def _evaluate_profile(self, obj: Any) -> List:
+        """Evaluates the permittivity profile of a structure or layer for the solver."""
+        if self.scalar_epsilon:
+            profile = obj.get_compact_epsilon_profile(self.experiment.lbda)
+        else:
+            profile = obj.get_compact_permittivity_profile(self.experiment.lbda)
+
+        if self.batch_shape != ():
+            return self._tile_profile(profile)
+        return profile
+
+
+def _stack_profiles(profiles: List[List], size: int) -> List:
+    """Concatenates the permittivity profiles of several parameter sets into one profile.
+
+    Args:
+        profiles (List[List]): Permittivity profiles with the same layer sequence.
+        size (int): Number of tensors in every profile.
+
+    Returns:
+        List: Profile with an array of thicknesses, one value per tensor.
+    """
+    first = profiles[0]
+    if any(len(profile) != len(first) for profile in profiles):
+        raise ValueError("The parameter sets must not change the number of layers.")
+
+    stacked = []
+    for i, entry in enumerate(first):
+        if isinstance(entry, RepeatedProfile):
+            if any(
+                not isinstance(profile[i], RepeatedProfile)
+                or profile[i].repetitions != entry.repetitions
+                for profile in profiles
+            ):
+                raise ValueError(
+                    "The parameter sets must not change the number of repetitions."
+                )
+            stacked.append(
+                RepeatedProfile(
+                    _stack_profiles([profile[i].profile for profile in profiles], size),
+                    entry.repetitions,
+                )
+            )
+            continue
+
+        thickness = np.repeat([float(profile[i][0]) for profile in profiles], size)
+        stacked.append(
+            (thickness, np.concatenate([profile[i][1] for profile in profiles]))
+        )
+
+    return stacked
+
+
+def _profile_tangent(plus: List, minus: List = None, width: float = 1) -> List:
+    """Calculates the derivative of a permittivity profile by central differences.
+
+    Without a second profile, an empty derivative with the structure of the profile is returned.
+    """
+    if minus is None:
+        return [
+            RepeatedProfile(_profile_tangent(entry.profile), entry.repetitions)
+            if isinstance(entry, RepeatedProfile)
+            else (0.0, None)
+            for entry in plus
+        ]
+
+    return [
+        RepeatedProfile(
+            _profile_tangent(entry_p.profile, entry_m.profile, width),
+            entry_p.repetitions,
+        )
+        if isinstance(entry_p, RepeatedProfile)
+        else (
+            (float(entry_p[0]) - float(entry_m[0])) / width,
+            (entry_p[1] - entry_m[1]) / width,
+        )
+        for entry_p, entry_m in zip(plus, minus)
+    ]
+
+
+def _stack_tangents(tangents: List[List], profile: List) -> List:
+    """Stacks the derivatives of several directions into one profile."""
+    stacked = []
+
+    for i, entry in enumerate(profile):
+        if isinstance(entry, RepeatedProfile):
+            stacked.append(
+                RepeatedProfile(
+                    _stack_tangents(
+                        [tangent[i].profile for tangent in tangents], entry.profile
+                    ),
+                    entry.repetitions,
+                )
+            )
+            continue
+
+        d_epsilon = np.zeros((len(tangents),) + entry[1].shape, dtype=np.complex128)
+        for direction, tangent in enumerate(tangents):
+            if tangent[i][1] is not None:
+                d_epsilon[direction] = tangent[i][1]
+
+        stacked.append((np.array([tangent[i][0] for tangent in tangents]), d_epsilon))
+
+    return stacked
+
+
+def _tangent_directions(tangents: List) -> int:
+    """Returns the number of directions of stacked profile derivatives."""
+    for entry in tangents:
+        if isinstance(entry, RepeatedProfile):
+            n_directions = _tangent_directions(entry.profile)
+            if n_directions:
+                return n_directions
+        else:
+            return len(entry[0])
+    return 0
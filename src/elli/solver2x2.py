@@ -1,11 +1,13 @@
 # Encoding: utf-8
 import warnings
+from typing import List, Tuple
 
 import numpy as np
+import numpy.typing as npt
 from numpy.lib.scimath import arcsin, sqrt
 
 from .result import Result
-from .solver import Solver
+from .solver import PackedProfile, Solver, unroll_profile
 
 
 class Solver2x2(Solver):
@@ -14,8 +16,14 @@ class Solver2x2(Solver):
     Simple but fast 2x2 transfer matrix method.
     Cannot handle anisotropy or anything fancy,
     thus Jonas and Mueller matrices cannot be calculated (respective functions return None).
+
+    It works on the profile of scalar dielectric functions of the structure,
+    so the dielectric tensors of isotropic materials are never built.
+    For anisotropic materials, the xx component of the tensor is used.
     """
 
+    scalar_epsilon = True
+
     def list_snell(self, n_list):
         angles = arcsin(n_list[0] * np.sin(np.deg2rad(self.theta_i)) / n_list)
 
@@ -32,30 +40,123 @@ class Solver2x2(Solver):
 
         return angles
 
-    def calculate(self) -> Result:
-        """Calculates the transfer matrix for the given material stack"""
-        if len(self.permittivity_profile) > 2:
-            d, eps = list(zip(*self.permittivity_profile[1:-1]))
-            d_list = np.array(d)
-            n_list = sqrt(
-                np.vstack(
-                    [
-                        self.permittivity_profile[0][1][:, 0, 0],
-                        np.array(eps)[..., 0, 0],
-                        self.permittivity_profile[-1][1][:, 0, 0],
-                    ]
-                )
+    def refractive_indices(self) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Returns the thicknesses of the layers and the refractive indices of all materials."""
+        packed = PackedProfile.from_profile(unroll_profile(self.permittivity_profile))
+        d_list = packed.thickness[1:-1]
+        n_list = sqrt(packed.epsilon)
+
+        return d_list, n_list
+
+    def calculate_tangents(
+        self, tangents: List, step: float = 1e-6
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Calculates the directional derivatives of the Jones matrices
+        for derivatives of the permittivity profile of the layers.
+
+        The derivatives are propagated in forward mode through the
+        Fresnel coefficients, the phase factors and the transfer matrix chain.
+
+        Args:
+            tangents (List):
+                Derivatives of the layer entries of the permittivity profile.
+                Every entry is a tuple of the derivatives of the thickness (n_directions)
+                and of the dielectric function (n_directions x wavelengths)
+                or a RepeatedProfile of such entries.
+            step (float, optional): Not used by the forward mode propagation.
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]:
+                Derivatives of the reflection and transmission Jones matrices
+                (n_directions x wavelengths x 2 x 2).
+        """
+        d_list, n_list = self.refractive_indices()
+        th_list = self.list_snell(n_list)
+        cos_list = np.cos(th_list)
+
+        d_d, d_eps = list(zip(*unroll_profile(tangents)))
+        d_d = np.array(d_d)[..., None]
+        zeros = np.zeros_like(d_eps[0])
+
+        # Derivatives of n and cos(θ) by Snell's law, the half-spaces are fixed
+        d_n = np.array(
+            [zeros] + [d / (2 * n) for d, n in zip(d_eps, n_list[1:-1])] + [zeros]
+        )
+        d_cos = np.sin(th_list)[:, None] ** 2 * d_n / (n_list * cos_list)[:, None]
+
+        kz_list = 2 * np.pi * n_list * cos_list / self.lbda
+        d_kz = (
+            2 * np.pi * (d_n * cos_list[:, None] + n_list[:, None] * d_cos) / self.lbda
+        )
+        d_delta = d_kz[1:-1] * d_list[:, None, None] + kz_list[1:-1, None] * d_d
+
+        esum = "ij...,jk...->ik..."
+
+        def interface(i):
+            r_s, r_p, t_s, t_p = Solver2x2.fresnel(
+                n_list[i], n_list[i + 1], th_list[i], th_list[i + 1]
+            )
+            d_r_s, d_r_p, d_t_s, d_t_p = Solver2x2.fresnel_tangents(
+                n_list[i],
+                n_list[i + 1],
+                cos_list[i],
+                cos_list[i + 1],
+                d_n[i],
+                d_n[i + 1],
+                d_cos[i],
+                d_cos[i + 1],
             )
-        else:
-            d_list = np.array([])
-            n_list = sqrt(
-                np.vstack(
+            return (r_s, d_r_s, t_s, d_t_s), (r_p, d_r_p, t_p, d_t_p)
+
+        def step_matrix(coefficients, phase, d_phase):
+            # Matrix [[em, r em], [r ep, ep]] / t and its derivatives
+            r, d_r, t, d_t = coefficients
+            em, ep = np.exp(-1j * phase), np.exp(1j * phase)
+            d_em, d_ep = -1j * d_phase * em, 1j * d_phase * ep
+
+            m = np.array([[em, r * em], [r * ep, ep]], dtype=complex) / t
+            d_m = (
+                np.array(
                     [
-                        self.permittivity_profile[0][1][:, 0, 0],
-                        self.permittivity_profile[-1][1][:, 0, 0],
-                    ]
+                        [d_em + zeros, d_r * em + r * d_em],
+                        [d_r * ep + r * d_ep, d_ep + zeros],
+                    ],
+                    dtype=complex,
                 )
+                / t
+                - m[:, :, None] * d_t / t
             )
+            return m, d_m
+
+        jones_r, jones_t = [], []
+        for pol in range(2):
+            m, d_m = step_matrix(interface(0)[pol], np.zeros_like(n_list[0]), zeros)
+
+            for i in range(1, n_list.shape[0] - 1):
+                m_i, d_m_i = step_matrix(
+                    interface(i)[pol], kz_list[i] * d_list[i - 1], d_delta[i - 1]
+                )
+                d_m = np.einsum(esum, d_m, m_i) + np.einsum(esum, m[:, :, None], d_m_i)
+                m = np.einsum(esum, m, m_i)
+
+            jones_r.append((d_m[1, 0] * m[0, 0] - m[1, 0] * d_m[0, 0]) / m[0, 0] ** 2)
+            jones_t.append(-d_m[0, 0] / m[0, 0] ** 2)
+
+        d_rs, d_rp = jones_r
+        d_ts, d_tp = jones_t
+
+        d_jones_r = np.moveaxis(
+            np.array([[d_rp, zeros], [zeros, d_rs]]), (0, 1), (-2, -1)
+        )
+        d_jones_t = np.moveaxis(
+            np.array([[d_tp, zeros], [zeros, d_ts]]), (0, 1), (-2, -1)
+        )
+
+        return d_jones_r, d_jones_t
+
+    def calculate(self) -> Result:
+        """Calculates the transfer matrix for the given material stack"""
+        d_list, n_list = self.refractive_indices()
 
         for layer in n_list:
             if np.any(np.logical_and(layer.real > 0, layer.imag < 0)):
@@ -73,7 +174,7 @@ class Solver2x2(Solver):
         th_list = self.list_snell(n_list)
         kz_list = 2 * np.pi * n_list * np.cos(th_list) / self.lbda
 
-        delta = kz_list[1:-1] * (d_list if n_list.ndim == 1 else d_list[:, None])
+        delta = kz_list[1:-1] * (d_list if d_list.ndim > 1 else d_list[:, None])
 
         esum = "ij...,jk...->ik..."
         ones = np.repeat(1, n_list.shape[1]) if n_list.ndim > 1 else 1
@@ -111,7 +212,7 @@ class Solver2x2(Solver):
             n_list[0] * np.cos(th_list[0])
         ).real
 
-        return Result(self.experiment, jones_matrix_r, jones_matrix_t, power_correction)
+        return self._create_result(jones_matrix_r, jones_matrix_t, power_correction)
 
     @staticmethod
     def fresnel(n_i, n_t, th_i, th_t):
@@ -139,6 +240,38 @@ class Solver2x2(Solver):
 
         return r_s, r_p, t_s, t_p
 
+    @staticmethod
+    def fresnel_tangents(n_i, n_t, cos_i, cos_t, d_n_i, d_n_t, d_cos_i, d_cos_t):
+        r"""Calculate the derivatives of the fresnel coefficients at the interface of two materials
+
+        Args:
+            n_i: Refractive index of the material of the incident wave
+            n_t: Refractive index of the material of the transmitted wave
+            cos_i: Cosine of the incident angle of the incident wave
+            cos_t: Cosine of the refracted angle of the transmitted wave
+            d_n_i: Derivatives of n_i
+            d_n_t: Derivatives of n_t
+            d_cos_i: Derivatives of cos_i
+            d_cos_t: Derivatives of cos_t
+
+        Returns:
+            d_r_s: Derivatives of the s-polarized reflection coefficient
+            d_r_p: Derivatives of the p-polarized reflection coefficient
+            d_t_s: Derivatives of the s-polarized transmission coefficient
+            d_t_p: Derivatives of the p-polarized transmission coefficient
+        """
+        a, d_a = n_i * cos_i, d_n_i * cos_i + n_i * d_cos_i
+        b, d_b = n_t * cos_t, d_n_t * cos_t + n_t * d_cos_t
+        c, d_c = n_t * cos_i, d_n_t * cos_i + n_t * d_cos_i
+        e, d_e = n_i * cos_t, d_n_i * cos_t + n_i * d_cos_t
+
+        d_r_s = 2 * (d_a * b - a * d_b) / (a + b) ** 2
+        d_r_p = 2 * (d_c * e - c * d_e) / (c + e) ** 2
+        d_t_s = d_r_s
+        d_t_p = 2 * (d_a * (c + e) - a * (d_c + d_e)) / (c + e) ** 2
+
+        return d_r_s, d_r_p, d_t_s, d_t_p
+
     @staticmethod
     def is_forward_angle(n, theta):
         ncostheta = n * np.cos(theta)
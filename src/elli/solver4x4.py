@@ -1,6 +1,8 @@
 # Encoding: utf-8
 from abc import ABC, abstractmethod
-from typing import Literal
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Callable, List, Literal, Optional, Tuple, Union
 
 import numpy as np
 import numpy.typing as npt
@@ -16,9 +18,14 @@ else:
 from numpy.lib.scimath import sqrt
 from scipy.linalg import expm as scipy_expm
 
-from .materials import IsotropicMaterial
 from .result import Result
-from .solver import Solver
+from .solver import (
+    PackedProfile,
+    RepeatedProfile,
+    Solver,
+    _tangent_directions,
+    pack_profile,
+)
 
 
 class Propagator(ABC):
@@ -26,41 +33,152 @@ class Propagator(ABC):
 
     @abstractmethod
     def calculate_propagation(
-        self, delta: npt.NDArray, thickness: float, lbda: npt.ArrayLike
+        self,
+        delta: npt.NDArray,
+        thickness: Union[float, npt.ArrayLike],
+        lbda: npt.ArrayLike,
     ) -> npt.NDArray:
         """Calculates propagation for a given Delta matrix and layer thickness.
 
         Args:
             delta (npt.NDArray): Delta Matrix
-            thickness (float): Thickness of layer (nm)
+            thickness (Union[float, npt.ArrayLike]):
+                Thickness of layer (nm), single value or one value per wavelength
             lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
 
         Returns:
             npt.NDArray: Propagator for the given layer
         """
 
+    def calculate_propagation_derivative(
+        self,
+        delta: npt.NDArray,
+        d_delta: npt.NDArray,
+        thickness: Union[float, npt.ArrayLike],
+        d_thickness: npt.ArrayLike,
+        lbda: npt.ArrayLike,
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Calculates the propagator and its directional derivatives
+        for derivatives of the Delta matrix and the layer thickness.
+
+        The derivative of the matrix exponential is taken from the upper right block
+        of the exponential of the block matrix [[A, dA], [0, A]].
+
+        Args:
+            delta (npt.NDArray): Delta Matrix
+            d_delta (npt.NDArray): Derivatives of the Delta Matrix (n_directions x wavelengths x 4 x 4)
+            thickness (Union[float, npt.ArrayLike]):
+                Thickness of layer (nm), single value or one value per wavelength
+            d_thickness (npt.ArrayLike): Derivatives of the thickness (n_directions)
+            lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]: Propagator for the given layer and its derivatives
+        """
+        return self.calculate_propagation(delta, thickness, lbda), _expm_derivative(
+            scipy_expm, delta, d_delta, thickness, d_thickness, lbda
+        )
+
+
+def _exponent_derivative(
+    delta: npt.NDArray,
+    d_delta: npt.NDArray,
+    thickness: Union[float, npt.ArrayLike],
+    d_thickness: npt.ArrayLike,
+    lbda: npt.ArrayLike,
+) -> Tuple[npt.NDArray, npt.NDArray]:
+    """Returns the exponent of the propagator and its directional derivatives."""
+    k_0 = 2 * sc.pi / lbda
+    phase = (thickness * k_0)[:, None, None]
+    mats = 1j * phase * delta
+    d_mats = 1j * (
+        np.asarray(d_thickness)[:, None, None, None] * k_0[:, None, None] * delta
+        + phase * d_delta
+    )
+    return mats, d_mats
+
+
+def _expm_derivative(
+    expm: Callable,
+    delta: npt.NDArray,
+    d_delta: npt.NDArray,
+    thickness: Union[float, npt.ArrayLike],
+    d_thickness: npt.ArrayLike,
+    lbda: npt.ArrayLike,
+) -> npt.NDArray:
+    """Calculates the derivatives of the matrix exponential with the block matrix method."""
+    mats, d_mats = _exponent_derivative(delta, d_delta, thickness, d_thickness, lbda)
+
+    blocks = np.zeros(d_mats.shape[:-2] + (8, 8), dtype=np.complex128)
+    blocks[..., :4, :4] = mats
+    blocks[..., 4:, 4:] = mats
+    blocks[..., :4, 4:] = d_mats
+
+    return expm(blocks.reshape(-1, 8, 8)).reshape(blocks.shape)[..., :4, 4:]
+
+
+def _select(thickness: Union[float, npt.ArrayLike], mask: npt.NDArray) -> Any:
+    """Selects the thicknesses of the masked wavelengths, if there is one thickness per wavelength."""
+    if np.ndim(thickness) > 0:
+        return thickness[mask]
+    return thickness
+
 
 class PropagatorLinear(Propagator):
     """Propagator class using a simple linear approximation of the matrix exponential."""
 
     def calculate_propagation(
-        self, delta: npt.NDArray, thickness: float, lbda: npt.ArrayLike
+        self,
+        delta: npt.NDArray,
+        thickness: Union[float, npt.ArrayLike],
+        lbda: npt.ArrayLike,
     ) -> npt.NDArray:
         """Calculates propagation for a given Delta matrix and layer thickness with a linear approximation of the matrix exponential.
 
         Args:
             delta (npt.NDArray): Delta Matrix
-            thickness (float): Thickness of layer (nm)
+            thickness (Union[float, npt.ArrayLike]):
+                Thickness of layer (nm), single value or one value per wavelength
             lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
 
         Returns:
             npt.NDArray: Propagator for the given layer
         """
-        p_hs_lin = np.identity(4) + 1j * thickness * np.einsum(
-            "nij,n->nij", delta, 2 * sc.pi / lbda
+        p_hs_lin = np.identity(4) + 1j * np.einsum(
+            "nij,n->nij", delta, 2 * sc.pi * thickness / lbda
         )
         return p_hs_lin
 
+    def calculate_propagation_derivative(
+        self,
+        delta: npt.NDArray,
+        d_delta: npt.NDArray,
+        thickness: Union[float, npt.ArrayLike],
+        d_thickness: npt.ArrayLike,
+        lbda: npt.ArrayLike,
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Calculates the propagator and its directional derivatives
+        with a linear approximation of the matrix exponential.
+
+        Args:
+            delta (npt.NDArray): Delta Matrix
+            d_delta (npt.NDArray): Derivatives of the Delta Matrix (n_directions x wavelengths x 4 x 4)
+            thickness (Union[float, npt.ArrayLike]):
+                Thickness of layer (nm), single value or one value per wavelength
+            d_thickness (npt.ArrayLike): Derivatives of the thickness (n_directions)
+            lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]: Propagator for the given layer and its derivatives
+        """
+        _, d_mats = _exponent_derivative(delta, d_delta, thickness, d_thickness, lbda)
+        return self.calculate_propagation(delta, thickness, lbda), d_mats
+
+
+def _torch_expm(mats: npt.NDArray) -> npt.NDArray:
+    # Module level function, so the propagator can be pickled for process pools
+    return torch.linalg.matrix_exp(torch.from_numpy(mats)).numpy()
+
 
 class PropagatorExpm(Propagator):
     """Propagator class using the Padé approximation of the matrix exponential."""
@@ -74,12 +192,7 @@ class PropagatorExpm(Propagator):
         Args:
             backend (Literal["torch", "scipy", "automatic"], optional): Setting to change the linear algebra provider. Defaults to "automatic".
         """
-        backends = {
-            "torch": lambda mats: torch.linalg.matrix_exp(
-                torch.from_numpy(mats)
-            ).numpy(),
-            "scipy": lambda mats: scipy_expm(mats),
-        }
+        backends = {"torch": _torch_expm, "scipy": scipy_expm}
 
         if backend == "automatic" and TORCH_AVAILABLE:
             backend = "torch"
@@ -98,36 +211,70 @@ class PropagatorExpm(Propagator):
         self.expm = backends[backend]
 
     def calculate_propagation(
-        self, delta: npt.NDArray, thickness: float, lbda: npt.ArrayLike
+        self,
+        delta: npt.NDArray,
+        thickness: Union[float, npt.ArrayLike],
+        lbda: npt.ArrayLike,
     ) -> npt.NDArray:
         """Calculates propagation for a given Delta matrix and layer thickness with the Padé approximation of the matrix exponential.
 
         Args:
             delta (npt.NDArray): Delta Matrix
-            thickness (float): Thickness of layer (nm)
+            thickness (Union[float, npt.ArrayLike]):
+                Thickness of layer (nm), single value or one value per wavelength
             lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
 
         Returns:
             npt.NDArray: Propagator for the given layer
         """
-        mats = 1j * thickness * np.einsum("nij,n->nij", delta, 2 * sc.pi / lbda)
+        mats = 1j * np.einsum("nij,n->nij", delta, 2 * sc.pi * thickness / lbda)
 
         propagator = self.expm(mats)
 
         return propagator
 
+    def calculate_propagation_derivative(
+        self,
+        delta: npt.NDArray,
+        d_delta: npt.NDArray,
+        thickness: Union[float, npt.ArrayLike],
+        d_thickness: npt.ArrayLike,
+        lbda: npt.ArrayLike,
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Calculates the propagator and its directional derivatives
+        with the Padé approximation of the matrix exponential.
+
+        Args:
+            delta (npt.NDArray): Delta Matrix
+            d_delta (npt.NDArray): Derivatives of the Delta Matrix (n_directions x wavelengths x 4 x 4)
+            thickness (Union[float, npt.ArrayLike]):
+                Thickness of layer (nm), single value or one value per wavelength
+            d_thickness (npt.ArrayLike): Derivatives of the thickness (n_directions)
+            lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]: Propagator for the given layer and its derivatives
+        """
+        return self.calculate_propagation(delta, thickness, lbda), _expm_derivative(
+            self.expm, delta, d_delta, thickness, d_thickness, lbda
+        )
+
 
 class PropagatorEig(Propagator):
     """Propagator class using the eigenvalue decomposition method."""
 
     def calculate_propagation(
-        self, delta: npt.NDArray, thickness: float, lbda: npt.ArrayLike
+        self,
+        delta: npt.NDArray,
+        thickness: Union[float, npt.ArrayLike],
+        lbda: npt.ArrayLike,
     ) -> npt.NDArray:
         """Calculates propagation for a given Delta matrix and layer thickness with eigenvalue decomposition.
 
         Args:
             delta (npt.NDArray): Delta Matrix
-            thickness (float): Thickness of layer (nm)
+            thickness (Union[float, npt.ArrayLike]):
+                Thickness of layer (nm), single value or one value per wavelength
             lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
 
         Returns:
@@ -143,7 +290,7 @@ class PropagatorEig(Propagator):
 
         w_i = np.linalg.inv(w)
 
-        q = np.exp(q * 2j * thickness * sc.pi / lbda[:, None])
+        q = np.exp(q * 2j * sc.pi * (thickness / lbda)[:, None])
 
         p = np.zeros((lbda.shape[0], 4, 4), dtype=np.complex128)
         for i in range(4):
@@ -152,9 +299,358 @@ class PropagatorEig(Propagator):
         return w @ p @ w_i
 
 
+class PropagatorAnalytic(Propagator):
+    """Propagator class using the closed-form matrix exponential for diagonal permittivity tensors.
+
+    For isotropic materials and unrotated uniaxial or biaxial materials
+    the Delta matrix decouples into one 2x2 block for p-polarized (Ex, Hy)
+    and one for s-polarized (Ey, -Hx) light.
+    Both blocks have the form [[0, a], [b, 0]], whose matrix exponential
+    only needs the reduced wavenumber :math:`K_z = \\sqrt{ab}` of the respective polarization.
+    All other tensors are handed over to a fallback propagator.
+    """
+
+    # Elements of the Delta matrix coupling the p and s blocks
+    # or lying on the diagonal of the blocks.
+    _off_block = np.array(
+        [
+            [True, True, True, False],
+            [True, True, False, True],
+            [True, False, True, True],
+            [False, True, True, True],
+        ]
+    )
+
+    def __init__(self, fallback: Propagator = None):
+        """The fallback propagator is used for all wavelengths,
+        where the permittivity tensor is not diagonal.
+
+        Args:
+            fallback (Propagator, optional):
+                Propagator for anisotropic tensors. Defaults to PropagatorExpm().
+        """
+        self.fallback = PropagatorExpm() if fallback is None else fallback
+
+    def calculate_propagation(
+        self,
+        delta: npt.NDArray,
+        thickness: Union[float, npt.ArrayLike],
+        lbda: npt.ArrayLike,
+    ) -> npt.NDArray:
+        """Calculates propagation for a given Delta matrix and layer thickness
+        with the closed-form solution for diagonal permittivity tensors.
+
+        Args:
+            delta (npt.NDArray): Delta Matrix
+            thickness (Union[float, npt.ArrayLike]):
+                Thickness of layer (nm), single value or one value per wavelength
+            lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
+
+        Returns:
+            npt.NDArray: Propagator for the given layer
+        """
+        diagonal = ~np.any(delta[:, self._off_block] != 0, axis=-1)
+
+        if not np.all(diagonal):
+            propagator = np.empty_like(delta)
+            propagator[~diagonal] = self.fallback.calculate_propagation(
+                delta[~diagonal], _select(thickness, ~diagonal), lbda[~diagonal]
+            )
+            propagator[diagonal] = self.calculate_propagation(
+                delta[diagonal], _select(thickness, diagonal), lbda[diagonal]
+            )
+            return propagator
+
+        phi = 2 * sc.pi * thickness / lbda
+        propagator = np.zeros_like(delta)
+
+        # p block: (Ex, Hy), s block: (Ey, -Hx)
+        for i, j in [(0, 3), (1, 2)]:
+            k_z = sqrt(delta[:, i, j] * delta[:, j, i])
+            cos = np.cos(phi * k_z)
+            # sin(phi * Kz) / Kz, which stays finite for Kz = 0
+            sin = phi * np.sinc(phi * k_z / sc.pi)
+
+            propagator[:, i, i] = cos
+            propagator[:, j, j] = cos
+            propagator[:, i, j] = 1j * sin * delta[:, i, j]
+            propagator[:, j, i] = 1j * sin * delta[:, j, i]
+
+        return propagator
+
+    def calculate_propagation_derivative(
+        self,
+        delta: npt.NDArray,
+        d_delta: npt.NDArray,
+        thickness: Union[float, npt.ArrayLike],
+        d_thickness: npt.ArrayLike,
+        lbda: npt.ArrayLike,
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Calculates the propagator and its directional derivatives
+        with the closed-form solution for diagonal permittivity tensors.
+
+        Args:
+            delta (npt.NDArray): Delta Matrix
+            d_delta (npt.NDArray): Derivatives of the Delta Matrix (n_directions x wavelengths x 4 x 4)
+            thickness (Union[float, npt.ArrayLike]):
+                Thickness of layer (nm), single value or one value per wavelength
+            d_thickness (npt.ArrayLike): Derivatives of the thickness (n_directions)
+            lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]: Propagator for the given layer and its derivatives
+        """
+        diagonal = ~np.any(delta[:, self._off_block] != 0, axis=-1) & ~np.any(
+            d_delta[:, :, self._off_block] != 0, axis=(0, -1)
+        )
+
+        if not np.all(diagonal):
+            propagator = np.empty_like(delta)
+            d_propagator = np.empty_like(d_delta)
+            (
+                propagator[~diagonal],
+                d_propagator[:, ~diagonal],
+            ) = self.fallback.calculate_propagation_derivative(
+                delta[~diagonal],
+                d_delta[:, ~diagonal],
+                _select(thickness, ~diagonal),
+                d_thickness,
+                lbda[~diagonal],
+            )
+            (
+                propagator[diagonal],
+                d_propagator[:, diagonal],
+            ) = self.calculate_propagation_derivative(
+                delta[diagonal],
+                d_delta[:, diagonal],
+                _select(thickness, diagonal),
+                d_thickness,
+                lbda[diagonal],
+            )
+            return propagator, d_propagator
+
+        phi = 2 * sc.pi * thickness / lbda
+        d_phi = 2 * sc.pi * np.asarray(d_thickness)[:, None] / lbda
+        propagator = np.zeros_like(delta)
+        d_propagator = np.zeros_like(d_delta)
+
+        for i, j in [(0, 3), (1, 2)]:
+            a, b = delta[:, i, j], delta[:, j, i]
+            d_a, d_b = d_delta[..., i, j], d_delta[..., j, i]
+
+            x = phi * sqrt(a * b)
+            cos = np.cos(x)
+            sinc = np.sinc(x / sc.pi)
+
+            # 2 d(sinc)/du = (cos(x) - sin(x) / x) / x² with u = x²,
+            # using its series expansion for small x
+            small = np.abs(x) < 1e-2
+            x_safe = np.where(small, 1, x)
+            sinc_slope = np.where(
+                small, -1 / 3 + x**2 / 30 - x**4 / 840, (cos - sinc) / x_safe**2
+            )
+
+            # Derivative of u = x²
+            d_u = 2 * phi * d_phi * a * b + phi**2 * (d_a * b + a * d_b)
+            d_cos = -sinc * d_u / 2
+            d_sinc = sinc_slope * d_u / 2
+
+            propagator[:, i, i] = cos
+            propagator[:, j, j] = cos
+            propagator[:, i, j] = 1j * phi * sinc * a
+            propagator[:, j, i] = 1j * phi * sinc * b
+
+            d_propagator[..., i, i] = d_cos
+            d_propagator[..., j, j] = d_cos
+            d_propagator[..., i, j] = 1j * (
+                d_phi * sinc * a + phi * d_sinc * a + phi * sinc * d_a
+            )
+            d_propagator[..., j, i] = 1j * (
+                d_phi * sinc * b + phi * d_sinc * b + phi * sinc * d_b
+            )
+
+        return propagator, d_propagator
+
+
+class TransferMatrixCache:
+    """Cache for incremental re-evaluation of structures with the Solver4x4.
+
+    The cache stores the propagator of every layer and all partial products
+    of the transfer matrix chain, from the front (prefixes) and from the back (suffixes).
+    They are keyed by a digest of the layer inputs (thickness, permittivity tensor),
+    the wavelengths and the reduced wavenumber.
+    On the next evaluation only layers with changed inputs are recalculated
+    and combined with the longest cached prefix and suffix products.
+    This is useful in fits, where the parameters are changed one at a time,
+    e.g. to calculate the jacobian by finite differences.
+
+    The same cache object has to be passed to each evaluation,
+    e.g. ``structure.evaluate(lbda, 70, cache=cache)``.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        """Creates an empty cache.
+
+        Every stored matrix has the size of the wavelength array times 4x4 complex values.
+
+        Args:
+            maxsize (int, optional):
+                Maximum number of stored matrices per kind
+                (layer propagators, prefixes and suffixes). Defaults to 256.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._layers = OrderedDict()
+        self._prefixes = OrderedDict()
+        self._suffixes = OrderedDict()
+
+    def clear(self) -> None:
+        """Removes all stored matrices and resets the counters."""
+        self.hits = 0
+        self.misses = 0
+        self._layers.clear()
+        self._prefixes.clear()
+        self._suffixes.clear()
+
+    @staticmethod
+    def _digest(*parts: Any) -> bytes:
+        hash_func = blake2b(digest_size=16)
+        for part in parts:
+            hash_func.update(
+                part if isinstance(part, bytes) else np.ascontiguousarray(part)
+            )
+        return hash_func.digest()
+
+    def _entry_key(self, context: bytes, entry: Any) -> bytes:
+        if isinstance(entry, RepeatedProfile):
+            return self._digest(
+                context,
+                np.int64(entry.repetitions),
+                *(self._entry_key(context, sub_entry) for sub_entry in entry.profile),
+            )
+
+        thickness, epsilon = entry
+        if np.ndim(thickness) == 0:
+            thickness = float(thickness)
+        return self._digest(context, np.asarray(thickness, dtype=np.float64), epsilon)
+
+    def _get(self, store: OrderedDict, key: bytes) -> Optional[npt.NDArray]:
+        value = store.get(key)
+        if value is not None:
+            # The entry may have been evicted by another thread in the meantime
+            try:
+                store.move_to_end(key)
+            except KeyError:
+                pass
+        return value
+
+    def _put(self, store: OrderedDict, key: bytes, value: npt.NDArray) -> None:
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > self.maxsize:
+            store.popitem(last=False)
+
+    def propagate(
+        self,
+        solver: "Solver4x4",
+        profile: List,
+        k_x: npt.ArrayLike,
+        m_t: npt.NDArray,
+    ) -> npt.NDArray:
+        """Propagates the transfer matrix through the layers of a permittivity profile,
+        reusing all cached propagators and partial products.
+
+        Args:
+            solver (Solver4x4): Solver used to calculate missing layer propagators.
+            profile (List): Permittivity profile of the layers.
+            k_x (npt.ArrayLike): Reduced wavenumber, Kx = kx/k0
+            m_t (npt.NDArray): Transfer matrix at the back of the profile.
+
+        Returns:
+            npt.NDArray: Transfer matrix at the front of the profile.
+        """
+        context = self._digest(
+            type(solver.propagator).__name__.encode(), solver.lbda, k_x
+        )
+        keys = [self._entry_key(context, entry) for entry in profile]
+        n = len(keys)
+
+        prefix_keys = [context]
+        for key in keys:
+            prefix_keys.append(self._digest(prefix_keys[-1], key))
+
+        suffix_keys = [self._digest(context, m_t)]
+        for key in reversed(keys):
+            suffix_keys.insert(0, self._digest(key, suffix_keys[0]))
+
+        def layer(i):
+            m_p = self._get(self._layers, keys[i])
+            if m_p is None:
+                self.misses += 1
+                m_p = solver.layer_matrix(profile[i], k_x)
+                self._put(self._layers, keys[i], m_p)
+            else:
+                self.hits += 1
+            return m_p
+
+        # Longest cached suffix, starting at layer j
+        j = next((j for j in range(n + 1) if suffix_keys[j] in self._suffixes), n)
+        suffix = self._get(self._suffixes, suffix_keys[j])
+        if suffix is None:
+            suffix = m_t
+            self._put(self._suffixes, suffix_keys[j], suffix)
+
+        # Longest cached prefix, ending before layer j
+        i = next((i for i in range(j, 0, -1) if prefix_keys[i] in self._prefixes), 0)
+        prefix = self._get(self._prefixes, prefix_keys[i])
+
+        changed = [layer(m) for m in range(i, j)]
+
+        for m in range(j - 1, i - 1, -1):
+            suffix = changed[m - i] @ suffix
+            self._put(self._suffixes, suffix_keys[m], suffix)
+
+        front = prefix
+        for m in range(i, j):
+            front = changed[m - i] if front is None else front @ changed[m - i]
+            self._put(self._prefixes, prefix_keys[m + 1], front)
+
+        if prefix is None:
+            return suffix
+        return prefix @ suffix
+
+
+def _chain_product(matrices: npt.NDArray) -> npt.NDArray:
+    """Multiplies a sequence of matrix stacks (layers x wavelengths x 4 x 4) in order,
+    by multiplying neighbouring pairs in one batched operation per step."""
+    while matrices.shape[0] > 1:
+        paired = matrices[0:-1:2] @ matrices[1::2]
+        if matrices.shape[0] % 2:
+            paired = np.concatenate([paired, matrices[-1:]])
+        matrices = paired
+    return matrices[0]
+
+
+def _active_directions(tangent: Any) -> npt.NDArray:
+    """Returns the directions, in which a permittivity profile entry has a derivative."""
+    if isinstance(tangent, RepeatedProfile):
+        return np.unique(
+            np.concatenate(
+                [_active_directions(entry) for entry in tangent.profile] + [[]]
+            ).astype(int)
+        )
+    d_thickness, d_epsilon = tangent
+    return np.flatnonzero((d_thickness != 0) | np.any(d_epsilon != 0, axis=(1, 2, 3)))
+
+
 class Solver4x4(Solver):
     """Solver class to evaluate Experiment objects. Based on Berreman's 4x4 method."""
 
+    # Maximum number of propagators (layers x wavelengths),
+    # which are calculated in one vectorized call
+    max_pack_size = 2**16
+
     @staticmethod
     def build_delta_matrix(k_x: npt.ArrayLike, eps: npt.NDArray) -> npt.NDArray:
         """Calculates Delta matrix for given permittivity and reduced wave number.
@@ -201,6 +697,49 @@ class Solver4x4(Solver):
         delta = np.moveaxis(delta, 2, 0)
         return delta
 
+    @staticmethod
+    def build_delta_matrix_derivative(
+        k_x: npt.ArrayLike, eps: npt.NDArray, d_eps: npt.NDArray
+    ) -> npt.NDArray:
+        """Calculates the directional derivatives of the Delta matrix
+        for derivatives of the permittivity tensor.
+
+        Args:
+            k_x (npt.ArrayLike): reduce wave number, Kx = kx/k0
+            eps (npt.NDArray): permittivity tensor
+            d_eps (npt.NDArray): derivatives of the permittivity tensor (n_directions x wavelengths x 3 x 3)
+
+        Returns:
+            npt.NDArray: Derivatives of the Delta matrix (n_directions x wavelengths x 4 x 4)
+        """
+        eps_22 = eps[:, 2, 2]
+        d_eps_22 = d_eps[..., 2, 2]
+
+        def d_quotient(num, d_num):
+            # Derivative of num / eps_22
+            return d_num / eps_22 - num * d_eps_22 / eps_22**2
+
+        def d_product(i, j):
+            # Derivative of eps_i2 * eps_2j / eps_22
+            return d_quotient(
+                eps[:, i, 2] * eps[:, 2, j],
+                d_eps[..., i, 2] * eps[:, 2, j] + eps[:, i, 2] * d_eps[..., 2, j],
+            )
+
+        d_delta = np.zeros(d_eps.shape[:-2] + (4, 4), dtype=np.complex128)
+
+        d_delta[..., 0, 0] = -k_x * d_quotient(eps[:, 2, 0], d_eps[..., 2, 0])
+        d_delta[..., 0, 1] = -k_x * d_quotient(eps[:, 2, 1], d_eps[..., 2, 1])
+        d_delta[..., 0, 3] = k_x**2 * d_eps_22 / eps_22**2
+        d_delta[..., 2, 0] = d_product(1, 0) - d_eps[..., 1, 0]
+        d_delta[..., 2, 1] = d_product(1, 1) - d_eps[..., 1, 1]
+        d_delta[..., 2, 3] = k_x * d_quotient(eps[:, 1, 2], d_eps[..., 1, 2])
+        d_delta[..., 3, 0] = d_eps[..., 0, 0] - d_product(0, 0)
+        d_delta[..., 3, 1] = d_eps[..., 0, 1] - d_product(0, 1)
+        d_delta[..., 3, 3] = -k_x * d_quotient(eps[:, 0, 2], d_eps[..., 0, 2])
+
+        return d_delta
+
     @staticmethod
     def transition_matrix_halfspace(delta: npt.NDArray) -> npt.NDArray:
         """Returns transition exit matrix L for any half-space.
@@ -322,37 +861,255 @@ class Solver4x4(Solver):
         return sqrt(k_z2)
 
     def __init__(
-        self, experiment: "Experiment", propagator: Propagator = PropagatorExpm()
+        self,
+        experiment: "Experiment",
+        propagator: Propagator = PropagatorAnalytic(),
+        cache: Optional[TransferMatrixCache] = None,
     ) -> None:
+        """Creates the solver for an experiment.
+
+        Args:
+            experiment (Experiment): Experiment to evaluate.
+            propagator (Propagator, optional):
+                Propagator used for the layers. Defaults to PropagatorAnalytic().
+            cache (TransferMatrixCache, optional):
+                Cache for incremental re-evaluation. If it is given, only layers with changed
+                inputs are recalculated compared to previous evaluations. Defaults to None.
+        """
         super().__init__(experiment)
         self.propagator = propagator
+        self.cache = cache
 
-    def calculate(self) -> Result:
-        """Calculates transition matrices for every element in the structure and resulting Jones matrices.
+    def propagate(
+        self, profile: List, k_x: npt.ArrayLike, m_t: npt.NDArray
+    ) -> npt.NDArray:
+        """Propagates the transfer matrix through the layers of a permittivity profile,
+        starting from the back of the profile.
+
+        Args:
+            profile (List): Permittivity profile of the layers.
+            k_x (npt.ArrayLike): Reduced wavenumber, Kx = kx/k0
+            m_t (npt.NDArray): Transfer matrix at the back of the profile.
 
         Returns:
-            Result: Result object with calculation results
+            npt.NDArray: Transfer matrix at the front of the profile.
         """
-        # Kx = kx/k0 = n sin(Φ) : Reduced wavenumber.
-        nx = self.structure.front_material.get_refractive_index(self.lbda)[:, 0, 0]
-        k_x = nx * np.sin(np.deg2rad(self.theta_i))
+        for entry in reversed(pack_profile(profile, self.max_pack_size)):
+            m_t = self.layer_matrix(entry, k_x) @ m_t
 
-        layers = reversed(self.permittivity_profile[1:-1])
+        return m_t
 
-        if isinstance(self.structure.back_material, IsotropicMaterial):
-            m_t = self.transition_matrix_iso_halfspace(
-                k_x, self.permittivity_profile[-1][1]
+    def layer_matrix(self, entry: Any, k_x: npt.ArrayLike) -> npt.NDArray:
+        """Calculates the propagator of a single entry of a permittivity profile.
+
+        The transfer matrix of repeated blocks is calculated once per period
+        and raised to the power of the number of repetitions by repeated squaring.
+
+        The propagators of all layers of a PackedProfile are calculated
+        in one vectorized call and multiplied by pairwise reduction.
+
+        Args:
+            entry (Any):
+                Tuple of (thickness, dielectric tensor), a PackedProfile or a RepeatedProfile.
+            k_x (npt.ArrayLike): Reduced wavenumber, Kx = kx/k0
+
+        Returns:
+            npt.NDArray: Propagator of the profile entry.
+        """
+        if isinstance(entry, PackedProfile):
+            n_layers = len(entry)
+            thickness = (
+                entry.thickness.ravel()
+                if entry.thickness.ndim > 1
+                else np.repeat(entry.thickness, self.lbda.shape[0])
             )
-        else:
-            m_t = self.transition_matrix_halfspace(
-                self.build_delta_matrix(k_x, self.permittivity_profile[-1][1])
+            m_p = self.propagator.calculate_propagation(
+                self.build_delta_matrix(
+                    np.tile(k_x, n_layers) if np.ndim(k_x) > 0 else k_x,
+                    entry.epsilon.reshape(-1, 3, 3),
+                ),
+                -thickness,
+                np.tile(self.lbda, n_layers),
             )
+            return _chain_product(m_p.reshape((n_layers,) + self.lbda.shape + (4, 4)))
 
-        for thickness, epsilon in layers:
-            m_p = self.propagator.calculate_propagation(
-                self.build_delta_matrix(k_x, epsilon), -thickness, self.lbda
+        if isinstance(entry, RepeatedProfile):
+            m_period = self.propagate(
+                entry.profile,
+                k_x,
+                np.broadcast_to(np.identity(4), (self.lbda.shape[0], 4, 4)),
+            )
+            return np.linalg.matrix_power(m_period, entry.repetitions)
+
+        thickness, epsilon = entry
+        return self.propagator.calculate_propagation(
+            self.build_delta_matrix(k_x, epsilon), -thickness, self.lbda
+        )
+
+    def propagate_tangents(
+        self, profile: List, tangents: List, k_x: npt.ArrayLike, m_t: npt.NDArray
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Propagates the transfer matrix and its directional derivatives
+        through the layers of a permittivity profile, starting from the back of the profile.
+
+        The derivative of the product is the sum over all layers
+        of the derivative of the layer propagator, multiplied with
+        the products of all layers in front of and behind the layer.
+        So only layers depending on a parameter are multiplied with its derivative.
+
+        Args:
+            profile (List): Permittivity profile of the layers.
+            tangents (List): Derivatives of the permittivity profile.
+            k_x (npt.ArrayLike): Reduced wavenumber, Kx = kx/k0
+            m_t (npt.NDArray): Transfer matrix at the back of the profile.
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]:
+                Transfer matrix at the front of the profile and its derivatives.
+        """
+        layers = [
+            self.layer_matrix_tangents(entry, tangent, k_x)
+            for entry, tangent in zip(profile, tangents)
+        ]
+
+        suffixes = [m_t]
+        for m_p, _, _ in reversed(layers[1:]):
+            suffixes.insert(0, m_p @ suffixes[0])
+
+        d_m_t = np.zeros(
+            (_tangent_directions(tangents),) + m_t.shape, dtype=np.complex128
+        )
+        prefix = None
+        for (m_p, d_m_p, active), suffix in zip(layers, suffixes):
+            if d_m_p is not None:
+                d_m_p = d_m_p @ suffix
+                d_m_t[active] += d_m_p if prefix is None else prefix @ d_m_p
+            prefix = m_p if prefix is None else prefix @ m_p
+
+        if prefix is None:
+            return m_t, d_m_t
+        return prefix @ m_t, d_m_t
+
+    def layer_matrix_tangents(
+        self, entry: Any, tangent: Any, k_x: npt.ArrayLike
+    ) -> Tuple[npt.NDArray, Optional[npt.NDArray], npt.NDArray]:
+        """Calculates the propagator of a single entry of a permittivity profile
+        and its directional derivatives.
+
+        Args:
+            entry (Any): Tuple of (thickness, dielectric tensor) or a RepeatedProfile.
+            tangent (Any): Derivatives of the entry.
+            k_x (npt.ArrayLike): Reduced wavenumber, Kx = kx/k0
+
+        Returns:
+            Tuple[npt.NDArray, Optional[npt.NDArray], npt.NDArray]:
+                Propagator of the profile entry, its derivatives in the active directions
+                (None if the entry does not depend on any parameter)
+                and the indices of the active directions.
+        """
+        active = _active_directions(tangent)
+        if active.size == 0:
+            return self.layer_matrix(entry, k_x), None, active
+
+        if isinstance(entry, RepeatedProfile):
+            identity = np.broadcast_to(np.identity(4), (self.lbda.shape[0], 4, 4))
+            m_period, d_m_period = self.propagate_tangents(
+                entry.profile, tangent.profile, k_x, identity
+            )
+            d_m_period = d_m_period[active]
+
+            # Matrix power by repeated squaring, with the product rule for the derivatives
+            m_p, d_m_p = identity, np.zeros_like(d_m_period)
+            repetitions = entry.repetitions
+            while repetitions:
+                if repetitions & 1:
+                    d_m_p = d_m_p @ m_period + m_p @ d_m_period
+                    m_p = m_p @ m_period
+                repetitions >>= 1
+                if repetitions:
+                    d_m_period = d_m_period @ m_period + m_period @ d_m_period
+                    m_period = m_period @ m_period
+            return m_p, d_m_p, active
+
+        thickness, epsilon = entry
+        d_thickness, d_epsilon = tangent
+        m_p, d_m_p = self.propagator.calculate_propagation_derivative(
+            self.build_delta_matrix(k_x, epsilon),
+            self.build_delta_matrix_derivative(k_x, epsilon, d_epsilon[active]),
+            -thickness,
+            -d_thickness[active],
+            self.lbda,
+        )
+        return m_p, d_m_p, active
+
+    def _reduced_wavenumber(self) -> npt.NDArray:
+        # Kx = kx/k0 = n sin(Φ) : Reduced wavenumber.
+        nx = sqrt(self.permittivity_profile[0][1][:, 0, 0])
+        return nx * np.sin(np.deg2rad(self.theta_i))
+
+    def _back_transition_matrix(self, k_x: npt.ArrayLike) -> npt.NDArray:
+        if self.structure.back_material.symmetry == "isotropic":
+            return self.transition_matrix_iso_halfspace(
+                k_x, self.permittivity_profile[-1][1]
             )
-            m_t = m_p @ m_t
+        return self.transition_matrix_halfspace(
+            self.build_delta_matrix(k_x, self.permittivity_profile[-1][1])
+        )
+
+    def calculate_tangents(
+        self, tangents: List, step: float = 1e-6
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Calculates the directional derivatives of the Jones matrices
+        for derivatives of the permittivity profile of the layers.
+
+        The derivatives are propagated in forward mode through the Delta matrices,
+        the propagators and the transfer matrix chain.
+
+        Args:
+            tangents (List):
+                Derivatives of the layer entries of the permittivity profile.
+                Every entry is a tuple of the derivatives of the thickness (n_directions)
+                and of the dielectric tensor (n_directions x wavelengths x 3 x 3)
+                or a RepeatedProfile of such entries.
+            step (float, optional): Not used by the forward mode propagation.
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]:
+                Derivatives of the reflection and transmission Jones matrices
+                (n_directions x wavelengths x 2 x 2).
+        """
+        k_x = self._reduced_wavenumber()
+        m_t = self._back_transition_matrix(k_x)
+
+        m_t, d_m_t = self.propagate_tangents(
+            self.permittivity_profile[1:-1], tangents, k_x, m_t
+        )
+
+        m_lf = self.transition_matrix_iso_halfspace(
+            k_x, self.permittivity_profile[0][1], inv=True
+        )
+        m_t = m_lf @ m_t
+        d_m_t = m_lf @ d_m_t
+
+        t_ti = np.linalg.inv(m_t[:, 2::-2, 2::-2])
+        d_t_ti = -t_ti @ d_m_t[..., 2::-2, 2::-2] @ t_ti
+        d_t_ri = d_m_t[..., 3::-2, 2::-2] @ t_ti + m_t[:, 3::-2, 2::-2] @ d_t_ti
+
+        return d_t_ri, d_t_ti
+
+    def calculate(self) -> Result:
+        """Calculates transition matrices for every element in the structure and resulting Jones matrices.
+
+        Returns:
+            Result: Result object with calculation results
+        """
+        k_x = self._reduced_wavenumber()
+        m_t = self._back_transition_matrix(k_x)
+
+        if self.cache is None:
+            m_t = self.propagate(self.permittivity_profile[1:-1], k_x, m_t)
+        else:
+            m_t = self.cache.propagate(self, self.permittivity_profile[1:-1], k_x, m_t)
 
         m_lf = self.transition_matrix_iso_halfspace(
             k_x, self.permittivity_profile[0][1], inv=True
@@ -378,12 +1135,10 @@ class Solver4x4(Solver):
         # For isotropic media, we have: t = kb'/kf' |t_bf|^2
         # The correction coefficient is kb'/kf'
         # Note : For the moment it is only meaningful for isotropic half spaces.
-        if isinstance(self.structure.back_material, IsotropicMaterial):
-            k_z_f = self.get_k_z(self.structure.front_material, self.lbda, k_x)
-            k_z_b = self.get_k_z(self.structure.back_material, self.lbda, k_x)
+        if self.structure.back_material.symmetry == "isotropic":
+            k_z_f = sqrt(self.permittivity_profile[0][1][:, 0, 0] - k_x**2)
+            k_z_b = sqrt(self.permittivity_profile[-1][1][:, 0, 0] - k_x**2)
             power_correction = k_z_b.real / k_z_f.real
-            return Result(
-                self.experiment, jones_matrix_r, jones_matrix_t, power_correction
-            )
+            return self._create_result(jones_matrix_r, jones_matrix_t, power_correction)
 
-        return Result(self.experiment, jones_matrix_r, jones_matrix_t)
+        return self._create_result(jones_matrix_r, jones_matrix_t)
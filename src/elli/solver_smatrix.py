@@ -0,0 +1,301 @@
+# Encoding: utf-8
+from typing import Any, List, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import scipy.constants as sc
+from numpy.lib.scimath import sqrt
+
+from .result import Result
+from .solver import PackedProfile, RepeatedProfile, Solver, pack_profile
+from .solver4x4 import Solver4x4
+
+# Reorders the modes of the half-space transition matrices from (s+, s-, p+, p-)
+# to (s+, p+, s-, p-), with the forward modes first
+_FORWARD_FIRST = [0, 2, 1, 3]
+
+
+class SolverSMatrix(Solver):
+    """Solver class to evaluate Experiment objects. Based on the scattering matrix method.
+
+    It uses the same Delta matrices and half-spaces as the Solver4x4,
+    but instead of multiplying transfer matrices, every layer is described by a scattering matrix,
+    which maps the amplitudes of the incoming onto the outgoing eigenmodes.
+    The layers are combined by the Redheffer star product.
+    As the scattering matrices only contain decaying exponentials,
+    the calculation stays stable for thick absorbing layers and evanescent waves,
+    e.g. in frustrated total internal reflection,
+    where the transfer matrices of the Solver4x4 overflow or lose precision.
+
+    The layer matrices are expressed in the modes of an isotropic gap medium
+    with :math:`\\varepsilon = 1 + K_x^2`, so they are calculated independently
+    of each other in one vectorized call per packed profile.
+    The derivatives for the jacobian are calculated by central differences.
+    """
+
+    # Maximum number of scattering matrices (layers x wavelengths),
+    # which are calculated in one vectorized call
+    max_pack_size = 2**16
+
+    @staticmethod
+    def layer_modes(
+        k_x: npt.ArrayLike, epsilon: npt.NDArray, isotropic: npt.ArrayLike = False
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Calculates the eigenmodes of homogeneous layers.
+
+        The modes of isotropic layers are calculated in closed form,
+        all others by the eigenvalue decomposition of the Delta matrix.
+
+        Args:
+            k_x (npt.ArrayLike): Reduced wavenumber, Kx = kx/k0
+            epsilon (npt.NDArray): Dielectric tensors (wavelengths x 3 x 3).
+            isotropic (npt.ArrayLike, optional):
+                True for the wavelengths with an isotropic tensor. Defaults to False.
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]:
+                Reduced wavenumbers Kz of the modes (wavelengths x 4)
+                and the field vectors of the modes as columns (wavelengths x 4 x 4),
+                ordered with the two forward modes first.
+        """
+        k_x = np.broadcast_to(k_x, epsilon.shape[:1])
+        isotropic = np.broadcast_to(isotropic, epsilon.shape[:1])
+
+        q = np.empty(epsilon.shape[:1] + (4,), dtype=np.complex128)
+        p = np.empty(epsilon.shape[:1] + (4, 4), dtype=np.complex128)
+
+        if np.any(isotropic):
+            eps_iso = epsilon[isotropic]
+            k_z = sqrt(eps_iso[:, 0, 0] - k_x[isotropic] ** 2)
+            q[isotropic] = k_z[:, None] * np.array([1, -1, 1, -1])
+            p[isotropic] = Solver4x4.transition_matrix_iso_halfspace(
+                k_x[isotropic], eps_iso
+            )
+
+        if not np.all(isotropic):
+            q[~isotropic], p[~isotropic] = np.linalg.eig(
+                Solver4x4.build_delta_matrix(k_x[~isotropic], epsilon[~isotropic])
+            )
+
+        # Forward modes decay or propagate into +z, ordered by Im(Kz)
+        # or by Re(Kz) for (numerically) lossless modes
+        lossless = np.abs(q.imag) <= 1e-12 * np.maximum(np.abs(q), 1)
+        order = np.argsort(-np.where(lossless, q.real, q.imag), axis=-1, kind="stable")
+
+        q = np.take_along_axis(q, order, axis=-1)
+        p = np.take_along_axis(p, order[:, np.newaxis, :], axis=-1)
+        return q, p
+
+    @staticmethod
+    def interface_matrix(p_front: npt.NDArray, p_back: npt.NDArray) -> npt.NDArray:
+        """Calculates the scattering matrix of the interface between two media.
+
+        Args:
+            p_front (npt.NDArray): Modes of the front medium, forward modes first.
+            p_back (npt.NDArray): Modes of the back medium, forward modes first.
+
+        Returns:
+            npt.NDArray: Scattering matrix [[R_front, T_back], [T_front, R_back]].
+        """
+        i = np.linalg.solve(p_front, p_back)
+        t = np.linalg.inv(i[..., :2, :2])
+        i_21_t = i[..., 2:, :2] @ t
+
+        return _blocks(
+            i_21_t,
+            i[..., 2:, 2:] - i_21_t @ i[..., :2, 2:],
+            t,
+            -t @ i[..., :2, 2:],
+        )
+
+    @staticmethod
+    def gap_modes(k_x: npt.ArrayLike) -> npt.NDArray:
+        """Returns the modes of the isotropic gap medium with ε = 1 + Kx², which has Kz = 1.
+
+        Args:
+            k_x (npt.ArrayLike): Reduced wavenumber, Kx = kx/k0
+
+        Returns:
+            npt.NDArray: Modes of the gap medium, forward modes first.
+        """
+        epsilon = (1 + k_x**2)[:, None, None] * np.identity(3)
+        return Solver4x4.transition_matrix_iso_halfspace(k_x, epsilon)[
+            ..., _FORWARD_FIRST
+        ]
+
+    def layer_matrix(self, entry: Any, k_x: npt.ArrayLike) -> npt.NDArray:
+        """Calculates the scattering matrix of an entry of a permittivity profile
+        in the modes of the gap medium.
+
+        The matrices of all layers of a PackedProfile are calculated in one
+        vectorized call and combined by pairwise star products.
+        Repeated blocks are combined by repeated squaring.
+
+        Args:
+            entry (Any): PackedProfile or RepeatedProfile.
+            k_x (npt.ArrayLike): Reduced wavenumber, Kx = kx/k0
+
+        Returns:
+            npt.NDArray: Scattering matrix of the profile entry.
+        """
+        if isinstance(entry, RepeatedProfile):
+            return _star_power(
+                self.profile_matrix(entry.profile, k_x), entry.repetitions
+            )
+
+        if not isinstance(entry, PackedProfile):
+            entry = PackedProfile.from_profile([entry])
+
+        n_layers = len(entry)
+        n_lbda = self.lbda.shape[0]
+        thickness = (
+            entry.thickness.ravel()
+            if entry.thickness.ndim > 1
+            else np.repeat(entry.thickness, n_lbda)
+        )
+        k_x_layers = np.tile(k_x, n_layers)
+
+        q, p = self.layer_modes(
+            k_x_layers,
+            entry.epsilon.reshape(-1, 3, 3),
+            np.repeat(entry.isotropic, n_lbda),
+        )
+        p_gap = np.tile(self.gap_modes(k_x), (n_layers, 1, 1))
+
+        # Phase factors of the forward modes from front to back
+        # and of the backward modes from back to front, both bounded by one
+        phase = 1j * 2 * sc.pi * thickness / np.tile(self.lbda, n_layers)
+        zeros = np.zeros((n_layers * n_lbda, 2, 2), dtype=np.complex128)
+        x_f = zeros.copy()
+        x_b = zeros.copy()
+        x_f[:, [0, 1], [0, 1]] = np.exp(phase[:, None] * q[:, :2])
+        x_b[:, [0, 1], [0, 1]] = np.exp(-phase[:, None] * q[:, 2:])
+
+        s_matrix = _star(
+            _star(self.interface_matrix(p_gap, p), _blocks(zeros, x_b, x_f, zeros)),
+            self.interface_matrix(p, p_gap),
+        )
+        return _star_chain(s_matrix.reshape((n_layers, n_lbda, 4, 4)))
+
+    def profile_matrix(self, profile: List, k_x: npt.ArrayLike) -> npt.NDArray:
+        """Calculates the scattering matrix of the layers of a permittivity profile
+        in the modes of the gap medium.
+
+        Args:
+            profile (List): Permittivity profile of the layers.
+            k_x (npt.ArrayLike): Reduced wavenumber, Kx = kx/k0
+
+        Returns:
+            npt.NDArray: Scattering matrix of the profile.
+        """
+        s_matrix = _identity(self.lbda.shape[0])
+        for entry in pack_profile(profile, self.max_pack_size):
+            s_matrix = _star(s_matrix, self.layer_matrix(entry, k_x))
+        return s_matrix
+
+    def calculate(self) -> Result:
+        """Calculates the scattering matrices of all layers and the resulting Jones matrices.
+
+        Returns:
+            Result: Result object with calculation results
+        """
+        # Kx = kx/k0 = n sin(Φ) : Reduced wavenumber.
+        epsilon_front = self.permittivity_profile[0][1]
+        epsilon_back = self.permittivity_profile[-1][1]
+        k_x = sqrt(epsilon_front[:, 0, 0]) * np.sin(np.deg2rad(self.theta_i))
+
+        p_front = Solver4x4.transition_matrix_iso_halfspace(k_x, epsilon_front)
+        if self.structure.back_material.symmetry == "isotropic":
+            p_back = Solver4x4.transition_matrix_iso_halfspace(k_x, epsilon_back)
+        else:
+            p_back = Solver4x4.transition_matrix_halfspace(
+                Solver4x4.build_delta_matrix(k_x, epsilon_back)
+            )
+
+        p_gap = self.gap_modes(k_x)
+        s_matrix = _star(
+            _star(
+                self.interface_matrix(p_front[..., _FORWARD_FIRST], p_gap),
+                self.profile_matrix(self.permittivity_profile[1:-1], k_x),
+            ),
+            self.interface_matrix(p_gap, p_back[..., _FORWARD_FIRST]),
+        )
+
+        # The modes are ordered (s, p), the Jones matrices (p, s)
+        jones_matrix_r = s_matrix[:, 1::-1, 1::-1]
+        jones_matrix_t = s_matrix[:, 3:1:-1, 1::-1]
+
+        if self.structure.back_material.symmetry == "isotropic":
+            k_z_f = sqrt(epsilon_front[:, 0, 0] - k_x**2)
+            k_z_b = sqrt(epsilon_back[:, 0, 0] - k_x**2)
+            power_correction = k_z_b.real / k_z_f.real
+            return self._create_result(jones_matrix_r, jones_matrix_t, power_correction)
+
+        return self._create_result(jones_matrix_r, jones_matrix_t)
+
+
+def _blocks(
+    s_11: npt.NDArray, s_12: npt.NDArray, s_21: npt.NDArray, s_22: npt.NDArray
+) -> npt.NDArray:
+    """Assembles a scattering matrix (... x 4 x 4) from its 2x2 blocks."""
+    return np.concatenate(
+        [np.concatenate([s_11, s_12], axis=-1), np.concatenate([s_21, s_22], axis=-1)],
+        axis=-2,
+    )
+
+
+def _identity(size: int) -> npt.NDArray:
+    """Returns the scattering matrices of empty layers (wavelengths x 4 x 4)."""
+    s_matrix = np.zeros((size, 4, 4), dtype=np.complex128)
+    s_matrix[:, [0, 1, 2, 3], [2, 3, 0, 1]] = 1
+    return s_matrix
+
+
+def _star(a: npt.NDArray, b: npt.NDArray) -> npt.NDArray:
+    """Redheffer star product of the scattering matrices of two consecutive sections."""
+    a_11, a_12, a_21, a_22 = (
+        a[..., :2, :2],
+        a[..., :2, 2:],
+        a[..., 2:, :2],
+        a[..., 2:, 2:],
+    )
+    b_11, b_12, b_21, b_22 = (
+        b[..., :2, :2],
+        b[..., :2, 2:],
+        b[..., 2:, :2],
+        b[..., 2:, 2:],
+    )
+
+    identity = np.identity(2)
+    d = a_12 @ np.linalg.inv(identity - b_11 @ a_22)
+    f = b_21 @ np.linalg.inv(identity - a_22 @ b_11)
+
+    return _blocks(
+        a_11 + d @ b_11 @ a_21,
+        d @ b_12,
+        f @ a_21,
+        b_22 + f @ a_22 @ b_12,
+    )
+
+
+def _star_chain(matrices: npt.NDArray) -> npt.NDArray:
+    """Combines a sequence of scattering matrix stacks (layers x wavelengths x 4 x 4) in order,
+    by combining neighbouring pairs in one batched operation per step."""
+    while matrices.shape[0] > 1:
+        paired = _star(matrices[0:-1:2], matrices[1::2])
+        if matrices.shape[0] % 2:
+            paired = np.concatenate([paired, matrices[-1:]])
+        matrices = paired
+    return matrices[0]
+
+
+def _star_power(s_matrix: npt.NDArray, repetitions: int) -> npt.NDArray:
+    """Combines repetitions of the same scattering matrix by repeated squaring."""
+    result = None
+    while repetitions:
+        if repetitions % 2:
+            result = s_matrix if result is None else _star(result, s_matrix)
+        repetitions //= 2
+        if repetitions:
+            s_matrix = _star(s_matrix, s_matrix)
+    return result
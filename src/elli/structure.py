@@ -10,24 +10,32 @@ to create a 1D model of layered media.
 The basic :class:`Layer` consists of a material and an assigned thickness.
 An arbitrary sequence of layers can be stacked and repeated by :class:`RepeatedLayers`,
 to create Bragg-mirror or multiple quantum well structures.
+The Solver4x4 calculates the transfer matrix of one period only and raises it to the
+number of repetitions, so even deep superlattices are cheap to evaluate.
 
 There are also classes to approximate layers with varying properties along the z-axis
 (inhomogeneous layers) by creating multiple thinner homogeneous slices:
 
 * :class:`TwistedLayer` is able to represent rotating materials, like twisted nematic materials.
 * :class:`VaryingMixtureLayer` takes an :class:`MixtureMaterial<elli.materials.MixtureMaterial>` and uses a gradient as mixture fraction.
+
+Besides the permittivity profile with the full dielectric tensors, the structure and layers
+provide a profile of scalar dielectric functions, which is used by solvers for isotropic media.
+Isotropic materials are evaluated there without building their (wavelengths x 3 x 3) tensors.
 """
 
 from abc import ABC, abstractmethod
-from typing import Callable, List, Tuple
+from copy import copy
+from typing import Callable, Dict, List, Tuple, Union
 
 import numpy as np
 import numpy.typing as npt
+import pandas as pd
 
 from .experiment import Experiment
 from .materials import IsotropicMaterial, Material, MixtureMaterial
 from .result import Result
-from .solver import Solver
+from .solver import RepeatedProfile, Solver, unroll_profile
 from .solver4x4 import Solver4x4
 from .utils import E_Z, rotation_v_theta
 
@@ -49,6 +57,65 @@ class AbstractLayer(ABC):
                 Returns list of tuples [(thickness, dielectric tensor), ...]
         """
 
+    def get_epsilon_profile(self, lbda: npt.ArrayLike) -> List:
+        """Returns the profile of the scalar dielectric functions of the layer for the given wavelengths.
+
+        This implementation uses the xx component of the permittivity profile.
+        Subclasses override it, to skip the tensors for isotropic materials.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List: Returns list of tuples [(thickness, dielectric function), ...]
+        """
+        return _scalar_profile(self.get_permittivity_profile(lbda))
+
+    def get_compact_permittivity_profile(self, lbda: npt.ArrayLike) -> List:
+        """Returns the permittivity profile of the layer for the given wavelengths,
+        where repeated blocks of layers are kept as one
+        :class:`RepeatedProfile<elli.solver.RepeatedProfile>` entry.
+        This compact profile is used by the solvers.
+
+        This implementation returns the permittivity profile,
+        layers with repeated blocks override it.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List:
+                Returns list of tuples [(thickness, dielectric tensor), ...]
+                and RepeatedProfile entries.
+        """
+        return self.get_permittivity_profile(lbda)
+
+    def get_compact_epsilon_profile(self, lbda: npt.ArrayLike) -> List:
+        """Returns the profile of the scalar dielectric functions of the layer
+        for the given wavelengths, where repeated blocks of layers are kept as one
+        RepeatedProfile entry.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List:
+                Returns list of tuples [(thickness, dielectric function), ...]
+                and RepeatedProfile entries.
+        """
+        return self.get_epsilon_profile(lbda)
+
+    def snapshot(self) -> "AbstractLayer":
+        """Returns a shallow copy of the layer, which is not affected
+        by later changes of its thickness or material.
+
+        The material and its dispersions are shared and not copied.
+
+        Returns:
+            AbstractLayer: Copy of the layer.
+        """
+        return copy(self)
+
 
 class RepeatedLayers(AbstractLayer):
     """Repeated structure of layers."""
@@ -121,6 +188,16 @@ class RepeatedLayers(AbstractLayer):
 
         self.layers = layers
 
+    def snapshot(self) -> "RepeatedLayers":
+        """Returns a shallow copy of the repeated structure with snapshots of its layers.
+
+        Returns:
+            RepeatedLayers: Copy of the repeated structure.
+        """
+        snapshot = copy(self)
+        snapshot.layers = [layer.snapshot() for layer in self.layers]
+        return snapshot
+
     def get_permittivity_profile(
         self, lbda: npt.ArrayLike
     ) -> List[Tuple[float, npt.NDArray]]:
@@ -133,15 +210,72 @@ class RepeatedLayers(AbstractLayer):
             List[Tuple[float, npt.NDArray]]:
                 Returns list of tuples [(thickness, dielectric tensor), ...]
         """
+        return unroll_profile(self.get_compact_permittivity_profile(lbda))
+
+    def get_epsilon_profile(
+        self, lbda: npt.ArrayLike
+    ) -> List[Tuple[float, npt.NDArray]]:
+        """Returns the profile of the scalar dielectric functions of the layer for the given wavelengths.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List[Tuple[float, npt.NDArray]]:
+                Returns list of tuples [(thickness, dielectric function), ...]
+        """
+        return unroll_profile(self.get_compact_epsilon_profile(lbda))
+
+    def get_compact_permittivity_profile(self, lbda: npt.ArrayLike) -> List:
+        """Returns the permittivity profile of the layer for the given wavelengths.
+
+        The repeated period is kept as one :class:`RepeatedProfile<elli.solver.RepeatedProfile>`
+        entry, so the length of the profile does not grow with the number of repetitions.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List:
+                Returns list of tuples [(thickness, dielectric tensor), ...]
+                with the period as RepeatedProfile entry.
+        """
+        layers = []
+        for layer in self.layers:
+            layers += layer.get_compact_permittivity_profile(lbda)
+
+        return self._repeat_profile(layers)
+
+    def get_compact_epsilon_profile(self, lbda: npt.ArrayLike) -> List:
+        """Returns the profile of the scalar dielectric functions of the layer for the given wavelengths.
+        The repeated period is kept as one RepeatedProfile entry.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List:
+                Returns list of tuples [(thickness, dielectric function), ...]
+                with the period as RepeatedProfile entry.
+        """
         layers = []
         for layer in self.layers:
-            layers += layer.get_permittivity_profile(lbda)
+            layers += layer.get_compact_epsilon_profile(lbda)
+
+        return self._repeat_profile(layers)
 
+    def _repeat_profile(self, layers: List) -> List:
+        """Builds the profile of the repeated structure from the profile of one period."""
+        unrolled = unroll_profile(layers)
         if self.before > 0:
-            before = layers[-self.before :]
+            before = unrolled[-self.before :]
         else:
             before = []
-        return before + self.repetitions * layers + layers[: self.after]
+        return (
+            before
+            + [RepeatedProfile(layers, self.repetitions)]
+            + unrolled[: self.after]
+        )
 
 
 class Layer(AbstractLayer):
@@ -197,6 +331,20 @@ class Layer(AbstractLayer):
         """
         return [(self.thickness, self.material.get_tensor(lbda))]
 
+    def get_epsilon_profile(
+        self, lbda: npt.ArrayLike
+    ) -> List[Tuple[float, npt.NDArray]]:
+        """Returns the profile of the scalar dielectric functions of the layer for the given wavelengths.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List[Tuple[float, npt.NDArray]]:
+                Returns a list containing one tuple [(thickness, dielectric function)]
+        """
+        return [(self.thickness, _get_epsilon(self.material, lbda))]
+
 
 #########################################################
 # Inhomogeneous Layers
@@ -256,6 +404,52 @@ class InhomogeneousLayer(AbstractLayer):
     def get_tensor(self, z: float, lbda: npt.ArrayLike) -> npt.NDArray:
         """Returns permittivity tensor matrix for position 'z'."""
 
+    def get_tensors(self, z: npt.ArrayLike, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Returns the permittivity tensors for an array of positions 'z'.
+
+        This implementation calls :meth:`get_tensor` for every position.
+        Subclasses override it, to evaluate the material only once for all slices.
+
+        Args:
+            z (npt.ArrayLike): Positions in the layer (in nm)
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Permittivity tensors (positions x wavelengths x 3 x 3).
+        """
+        return np.array([self.get_tensor(z_i, lbda) for z_i in z])
+
+    def get_epsilons(self, z: npt.ArrayLike, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Returns the scalar dielectric functions for an array of positions 'z'.
+
+        This implementation uses the xx component of :meth:`get_tensors`.
+        Subclasses override it, to skip the tensors for isotropic materials.
+
+        Args:
+            z (npt.ArrayLike): Positions in the layer (in nm)
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Dielectric functions (positions x wavelengths).
+        """
+        return self.get_tensors(z, lbda)[..., 0, 0]
+
+    def get_epsilon_profile(self, lbda: npt.ArrayLike) -> List:
+        """Returns the profile of the scalar dielectric functions of the layer for the given wavelengths.
+        The dielectric function is evaluated in the middle of each slice.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List[Tuple[float, npt.NDArray]]:
+                Returns list of tuples [(d1, epsilon1), (d2, epsilon2), ...]
+        """
+        z = self.get_slices()
+        h = np.diff(z)
+        zmid = (z[:-1] + z[1:]) / 2.0
+        return list(zip(h, self.get_epsilons(zmid, lbda)))
+
     def get_permittivity_profile(self, lbda: npt.ArrayLike) -> List:
         """Returns the permittivity profile of the layer for the given wavelengths.
         The tensor is evaluated in the middle of each slice.
@@ -270,7 +464,7 @@ class InhomogeneousLayer(AbstractLayer):
         z = self.get_slices()
         h = np.diff(z)
         zmid = (z[:-1] + z[1:]) / 2.0
-        tensor = [self.get_tensor(z, lbda) for z in zmid]
+        tensor = self.get_tensors(zmid, lbda)
         return list(zip(h, tensor))
 
 
@@ -316,6 +510,37 @@ class TwistedLayer(InhomogeneousLayer):
         m_r = rotation_v_theta(E_Z, self.angle * z / self.thickness)
         return m_r @ epsilon @ m_r.T
 
+    def get_tensors(self, z: npt.ArrayLike, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the permittivity tensors for an array of positions 'z' and wavelength 'lbda'.
+        The material is evaluated once and rotated for all positions in one operation.
+
+        Args:
+            z (npt.ArrayLike): Positions in the layer (in nm)
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Permittivity tensors (positions x wavelengths x 3 x 3).
+        """
+        epsilon = self.material.get_tensor(lbda)
+        m_r = rotation_v_theta(E_Z, self.angle * np.asarray(z) / self.thickness)
+        return np.einsum("zij,ljk,zmk->zlim", m_r, epsilon, m_r, optimize=True)
+
+    def get_epsilons(self, z: npt.ArrayLike, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the scalar dielectric functions for an array of positions 'z' and wavelength 'lbda'.
+        Isotropic materials are not affected by the rotation and evaluated only once.
+
+        Args:
+            z (npt.ArrayLike): Positions in the layer (in nm)
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Dielectric functions (positions x wavelengths).
+        """
+        if self.material.symmetry != "isotropic":
+            return super().get_epsilons(z, lbda)
+
+        return np.tile(self.material.get_epsilon(lbda), (np.size(z), 1))
+
 
 class VaryingMixtureLayer(InhomogeneousLayer):
     """Mixture layer, with varying fraction dependent on z Position.
@@ -391,6 +616,37 @@ class VaryingMixtureLayer(InhomogeneousLayer):
         )
         return epsilon
 
+    def get_tensors(self, z: npt.ArrayLike, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the permittivity tensors for an array of positions 'z' and wavelength 'lbda'.
+        The constituents of the mixture are evaluated only once for all positions.
+
+        Args:
+            z (npt.ArrayLike): Positions in the layer (in nm)
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Permittivity tensors (positions x wavelengths x 3 x 3).
+        """
+        fractions = [self.fraction_modulation(z_i / self.thickness) for z_i in z]
+        return self.material.get_tensor_fractions(lbda, fractions)
+
+    def get_epsilons(self, z: npt.ArrayLike, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the scalar dielectric functions for an array of positions 'z' and wavelength 'lbda'.
+        Isotropic mixtures are evaluated without building the tensors.
+
+        Args:
+            z (npt.ArrayLike): Positions in the layer (in nm)
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Dielectric functions (positions x wavelengths).
+        """
+        if self.material.symmetry != "isotropic":
+            return super().get_epsilons(z, lbda)
+
+        fractions = [self.fraction_modulation(z_i / self.thickness) for z_i in z]
+        return self.material.get_epsilon_fractions(lbda, fractions)
+
 
 #########################################################
 # Structure Class
@@ -465,6 +721,20 @@ class Structure:
 
         self.layers = layers
 
+    def snapshot(self) -> "Structure":
+        """Returns a lightweight copy of the structure, which is not affected
+        by later changes of the layer sequence, thicknesses or materials.
+
+        Only the description of the structure is copied, the materials
+        and dispersions with their tabulated data are shared.
+
+        Returns:
+            Structure: Copy of the structure.
+        """
+        snapshot = copy(self)
+        snapshot.layers = [layer.snapshot() for layer in self.layers]
+        return snapshot
+
     def get_permittivity_profile(
         self, lbda: npt.ArrayLike
     ) -> List[Tuple[float, npt.NDArray]]:
@@ -477,18 +747,73 @@ class Structure:
             List[Tuple[float, npt.NDArray]]:
                 Returns list of tuples [(thickness, dielectric tensor), ...]
         """
+        return unroll_profile(self.get_compact_permittivity_profile(lbda))
+
+    def get_epsilon_profile(
+        self, lbda: npt.ArrayLike
+    ) -> List[Tuple[float, npt.NDArray]]:
+        """Returns the profile of the scalar dielectric functions of the complete structure
+        for the given wavelengths, as used by solvers for isotropic media.
+
+        Isotropic materials are evaluated without building their permittivity tensors,
+        for anisotropic materials the xx component of the tensor is used.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List[Tuple[float, npt.NDArray]]:
+                Returns list of tuples [(thickness, dielectric function), ...]
+        """
+        return unroll_profile(self.get_compact_epsilon_profile(lbda))
+
+    def get_compact_permittivity_profile(self, lbda: npt.ArrayLike) -> List:
+        """Returns the permittivity profile of the complete structure for the given wavelengths,
+        where repeated blocks of layers are kept as one
+        :class:`RepeatedProfile<elli.solver.RepeatedProfile>` entry.
+        This compact profile is used by the solvers.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List:
+                Returns list of tuples [(thickness, dielectric tensor), ...]
+                and RepeatedProfile entries.
+        """
         permittivity_profile = [(np.inf, self.front_material.get_tensor(lbda))]
 
         for layer in self.layers:
-            permittivity_profile.extend(layer.get_permittivity_profile(lbda))
+            permittivity_profile.extend(layer.get_compact_permittivity_profile(lbda))
 
         permittivity_profile.extend([(np.inf, self.back_material.get_tensor(lbda))])
         return permittivity_profile
 
+    def get_compact_epsilon_profile(self, lbda: npt.ArrayLike) -> List:
+        """Returns the profile of the scalar dielectric functions of the complete structure
+        for the given wavelengths, where repeated blocks of layers are kept as one
+        RepeatedProfile entry.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List:
+                Returns list of tuples [(thickness, dielectric function), ...]
+                and RepeatedProfile entries.
+        """
+        epsilon_profile = [(np.inf, _get_epsilon(self.front_material, lbda))]
+
+        for layer in self.layers:
+            epsilon_profile.extend(layer.get_compact_epsilon_profile(lbda))
+
+        epsilon_profile.append((np.inf, _get_epsilon(self.back_material, lbda)))
+        return epsilon_profile
+
     def evaluate(
         self,
         lbda: npt.ArrayLike,
-        theta_i: float,
+        theta_i: Union[float, npt.ArrayLike],
         solver: Solver = Solver4x4,
         **solver_kwargs,
     ) -> Result:
@@ -496,7 +821,10 @@ class Structure:
 
         Args:
             lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
-            theta_i (float): Incident angle of the experiment (in degrees).
+            theta_i (Union[float, npt.ArrayLike]):
+                Single value or array of incident angles of the experiment (in degrees).
+                An array of angles is evaluated in one batch,
+                the result then has an additional leading angle axis.
             solver (Solver, optional): Choose which solver class is used. Defaults to Solver4x4.
             solver_kwargs (optional): Keyword arguments for the Solver can be appended as arguments.
 
@@ -505,3 +833,51 @@ class Structure:
         """
         exp = Experiment(self, lbda, theta_i)
         return exp.evaluate(solver, **solver_kwargs)
+
+    def evaluate_batch(
+        self,
+        lbda: npt.ArrayLike,
+        theta_i: Union[float, npt.ArrayLike],
+        parameter_sets: Union[pd.DataFrame, Dict[str, npt.ArrayLike]],
+        solver: Solver = Solver4x4,
+        **solver_kwargs,
+    ) -> Result:
+        """Return the Evaluation of the structure for a table of parameter sets in one batch.
+
+        The structure is used as a template, which contains named fit parameters,
+        e.g. lmfit Parameter objects used as layer thickness or dispersion parameter.
+        For every parameter set, their values are replaced by the values of the set.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+            theta_i (Union[float, npt.ArrayLike]):
+                Single value or array of incident angles of the experiment (in degrees).
+            parameter_sets (Union[pd.DataFrame, Dict[str, npt.ArrayLike]]):
+                DataFrame or dict with the parameter names as columns or keys
+                and one value per parameter set.
+            solver (Solver, optional): Choose which solver class is used. Defaults to Solver4x4.
+            solver_kwargs (optional): Keyword arguments for the Solver can be appended as arguments.
+
+        Returns:
+            Result: Result of the experiment with a leading axis for the parameter sets.
+        """
+        exp = Experiment(self, lbda, theta_i, parameter_sets=parameter_sets)
+        return exp.evaluate(solver, **solver_kwargs)
+
+
+def _get_epsilon(material: Material, lbda: npt.ArrayLike) -> npt.NDArray:
+    """Returns the scalar dielectric function of a material,
+    or the xx component of the tensor for anisotropic materials."""
+    if material.symmetry == "isotropic":
+        return material.get_epsilon(lbda)
+    return material.get_tensor(lbda)[:, 0, 0]
+
+
+def _scalar_profile(profile: List) -> List:
+    """Replaces the tensors of a permittivity profile by their xx component."""
+    return [
+        RepeatedProfile(_scalar_profile(entry.profile), entry.repetitions)
+        if isinstance(entry, RepeatedProfile)
+        else (entry[0], entry[1][..., 0, 0])
+        for entry in profile
+    ]
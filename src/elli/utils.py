@@ -1,4 +1,6 @@
 # Encoding: utf-8
+from typing import Union
+
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
@@ -293,18 +295,23 @@ def rotation_v(v: npt.ArrayLike) -> npt.NDArray:
     return scipy_expm(m_w)
 
 
-def rotation_v_theta(v: npt.ArrayLike, theta: float) -> npt.NDArray:
+def rotation_v_theta(
+    v: npt.ArrayLike, theta: Union[float, npt.ArrayLike]
+) -> npt.NDArray:
     """Returns rotation matrix defined by a unit rotation vector and an angle.
 
     Notes : The inverse rotation is (v,-theta)
 
     Args:
         v (npt.ArrayLike): unit vector orienting the rotation (list or array)
-        theta (float): rotation angle around v in degrees
+        theta (Union[float, npt.ArrayLike]):
+            rotation angle around v in degrees,
+            or an array of angles to get a stack of rotation matrices
 
     Returns:
-        npt.NDArray: rotation matrix :math:`M_R`
+        npt.NDArray: rotation matrix :math:`M_R` (3 x 3) or (angles x 3 x 3)
     """
+    theta = np.asarray(np.deg2rad(theta))[..., None, None]
     # fmt: off
     m_w = np.array([[0,     -v[2], v[1]],
                   [v[2],  0,     -v[0]],
@@ -313,6 +320,6 @@ def rotation_v_theta(v: npt.ArrayLike, theta: float) -> npt.NDArray:
 
     return (
         np.identity(3)
-        + m_w * np.sin(np.deg2rad(theta))
-        + np.linalg.matrix_power(m_w, 2) * (1 - np.cos(np.deg2rad(theta)))
+        + m_w * np.sin(theta)
+        + np.linalg.matrix_power(m_w, 2) * (1 - np.cos(theta))
     )
@@ -97,3 +97,44 @@ def test_formula_solver4x4_expm(benchmark, structure):
         iterations=1,
         rounds=10,
     )
+
+
+@fixture
+def cauchy_structure():
+    """Build the same structure with hand-written Cauchy dispersions"""
+    SiO2 = elli.Cauchy(n0=1.452, n1=36.0).get_mat()
+    TiO2 = elli.Cauchy(n0=2.236, n1=451, n2=251).get_mat()
+
+    Layer = 4 * [elli.Layer(TiO2, 20), elli.Layer(SiO2, 276.36)]
+
+    return elli.Structure(elli.AIR, Layer, elli.AIR)
+
+
+def test_cauchy_solver2x2(benchmark, cauchy_structure):
+    """Benchmarks solver2x2 with the hand-written Cauchy dispersion"""
+    benchmark.pedantic(
+        cauchy_structure.evaluate,
+        args=(wavelength, PHI),
+        kwargs={"solver": elli.Solver2x2},
+        iterations=1,
+        rounds=10,
+    )
+
+
+def test_formula_dielectric(benchmark):
+    """Benchmarks the evaluation of the compiled formula dispersion"""
+    dispersion = elli.FormulaIndex(
+        "n = n0 + 1e2 * n1 / lbda ** 2 + 1e7 * n2 / lbda ** 4 + "
+        "1j * (k0 + 1e2 * k1 / lbda ** 2 + 1e7 * k2 / lbda ** 4)",
+        "lbda",
+        {"n0": 2.236, "n1": 451, "n2": 251, "k0": 0, "k1": 0, "k2": 0},
+        {},
+        "nm",
+    )
+    benchmark(dispersion.get_dielectric, wavelength)
+
+
+def test_cauchy_dielectric(benchmark):
+    """Benchmarks the evaluation of the hand-written Cauchy dispersion"""
+    dispersion = elli.Cauchy(n0=2.236, n1=451, n2=251)
+    benchmark(dispersion.get_dielectric, wavelength)
@@ -0,0 +1,14 @@
+"""Benchmark for the import time of the package"""
+
+import subprocess
+import sys
+
+
+def test_import_time(benchmark):
+    """Benchmarks the import of the package in a new interpreter"""
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", "import elli"],),
+        kwargs={"check": True},
+        rounds=5,
+    )
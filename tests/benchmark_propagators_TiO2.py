@@ -101,6 +101,17 @@ def test_solver4x4_expm_pytorch(benchmark, structure):
     )
 
 
+def test_solver4x4_analytic(benchmark, structure):
+    """Benchmarks analytic propagator with solver4x4"""
+    benchmark.pedantic(
+        structure.evaluate,
+        args=(lbda, PHI),
+        kwargs={"solver": elli.Solver4x4, "propagator": elli.PropagatorAnalytic()},
+        iterations=1,
+        rounds=10,
+    )
+
+
 def test_solver4x4_linear(benchmark, structure):
     """Benchmarks linear propagator with solver4x4"""
     benchmark.pedantic(
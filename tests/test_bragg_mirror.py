@@ -174,3 +174,41 @@ class TestBragg:
 
         np.testing.assert_array_almost_equal(R_ss, R_th_ss, decimal=1)
         np.testing.assert_array_almost_equal(R_pp, R_th_pp, decimal=1)
+
+
+def test_repeated_layers_profile():
+    """Repeated layers give the same result as the unrolled layer stack."""
+    a = elli.Layer(elli.ConstantRefractiveIndex(1.47).get_mat(), 120)
+    b = elli.Layer(elli.ConstantRefractiveIndex(2.23 + 0.01j).get_mat(), 80)
+    c = elli.Layer(elli.ConstantRefractiveIndex(1.8).get_mat(), 30)
+    repeated = elli.RepeatedLayers([a, b, c], 50, 2, 1)
+    lbda = np.linspace(400, 1200, 100)
+
+    assert len(repeated.get_compact_permittivity_profile(lbda)) == 4
+
+    s_repeated = elli.Structure(elli.AIR, [repeated], elli.AIR)
+    s_unrolled = elli.Structure(elli.AIR, [b, c] + 50 * [a, b, c] + [a], elli.AIR)
+
+    # The public profiles are flat lists of (thickness, tensor) tuples
+    for profile, unrolled in [
+        (
+            s_repeated.get_permittivity_profile(lbda),
+            s_unrolled.get_permittivity_profile(lbda),
+        ),
+        (s_repeated.get_epsilon_profile(lbda), s_unrolled.get_epsilon_profile(lbda)),
+    ]:
+        assert len(profile) == len(unrolled) == 155
+        for (d, epsilon), (d_unrolled, epsilon_unrolled) in zip(profile, unrolled):
+            assert d == d_unrolled
+            np.testing.assert_array_equal(epsilon, epsilon_unrolled)
+
+    for angle in [0, 60]:
+        np.testing.assert_allclose(
+            s_repeated.evaluate(lbda, angle).rho,
+            s_unrolled.evaluate(lbda, angle).rho,
+            rtol=1e-8,
+        )
+        np.testing.assert_allclose(
+            s_repeated.evaluate(lbda, angle, solver=elli.Solver2x2).rho,
+            s_unrolled.evaluate(lbda, angle, solver=elli.Solver2x2).rho,
+        )
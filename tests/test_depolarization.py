@@ -0,0 +1,77 @@
+"""Tests for the depolarization by quadrature over distributions"""
+
+import elli
+import numpy as np
+from lmfit import Parameter
+from pytest import raises
+
+
+def mueller_matrix(jones_matrix):
+    """Returns the Mueller matrix of a Jones matrix, without normalization."""
+    kron = np.einsum("...ij,...kl->...ikjl", np.conjugate(jones_matrix), jones_matrix)
+    a = np.array([[1, 0, 0, 1], [1, 0, 0, -1], [0, 1, 1, 0], [0, 1j, -1j, 0]])
+    return np.real(
+        a @ kron.reshape(jones_matrix.shape[:-2] + (4, 4)) @ np.linalg.inv(a)
+    )
+
+
+def test_quadrature_nodes():
+    """The nodes integrate the moments of the distributions."""
+    for distribution, variance in [
+        (elli.GaussianDistribution(2), 4),
+        (elli.UniformDistribution(6), 3),
+        (elli.TriangularDistribution(3), 1.5),
+    ]:
+        x, w = distribution.nodes()
+        np.testing.assert_allclose(np.sum(w), 1)
+        np.testing.assert_allclose(np.sum(w * x), 0, atol=1e-14)
+        np.testing.assert_allclose(np.sum(w * x**2), variance)
+
+    with raises(ValueError):
+        elli.UniformDistribution(1, order=0)
+
+
+def test_depolarization():
+    """The batched quadrature equals the average over single evaluations."""
+    thickness = Parameter("thickness", value=300)
+    structure = elli.Structure(
+        elli.AIR,
+        [elli.Layer(elli.Cauchy(1.452, 36.0).get_mat(), thickness)],
+        elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat(),
+    )
+    lbda = np.linspace(400, 800, 20)
+    experiment = elli.Experiment(structure, lbda, [60, 70])
+
+    np.testing.assert_allclose(
+        elli.Depolarization().evaluate(experiment),
+        experiment.evaluate().mueller_matrix,
+        atol=1e-14,
+    )
+
+    distributions = [
+        elli.GaussianDistribution(5, order=4),
+        elli.UniformDistribution(2, order=2),
+        elli.TriangularDistribution(2, order=2),
+    ]
+    depolarization = elli.Depolarization(
+        {"thickness": distributions[0]}, *distributions[1:]
+    )
+    result = depolarization.evaluate(experiment, solver=elli.Solver2x2)
+
+    expected = 0
+    for d, w_d in zip(*distributions[0].nodes()):
+        for angle, w_angle in zip(*distributions[1].nodes()):
+            for bandwidth, w_bandwidth in zip(*distributions[2].nodes()):
+                thickness.value = 300 + d
+                jones_matrix = structure.evaluate(
+                    lbda + bandwidth, np.array([60, 70]) + angle
+                ).jones_matrix_r
+                expected = expected + w_d * w_angle * w_bandwidth * mueller_matrix(
+                    jones_matrix
+                )
+
+    np.testing.assert_allclose(result, expected / expected[..., :1, :1], atol=1e-12)
+    assert np.all(np.linalg.norm(result[..., 1:, :], axis=(-2, -1)) < np.sqrt(3))
+
+    with raises(ValueError):
+        elli.Depolarization({"unknown": distributions[0]}).evaluate(experiment)
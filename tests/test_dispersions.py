@@ -233,3 +233,75 @@ def test_correct_reconstruction_with_pseudo_dielectric():
         ).get_dielectric_df(check_lbda),
         gaussian.get_dielectric_df(check_lbda),
     )
+
+
+def test_dispersion_cache():
+    """Cached dielectric functions are reused until parameters or wavelengths change."""
+    from lmfit import Parameters
+
+    params = Parameters()
+    params.add("n0", value=1.5)
+
+    lbda = np.linspace(400, 800, 10)
+    cache = elli.DispersionCache(maxsize=2)
+    cauchy = elli.Cauchy(n0=params["n0"], n1=50.0)
+    table = elli.Table(lbda=lbda, n=np.linspace(1.4, 1.6, 10))
+    summed = elli.EpsilonInf(2.0) + elli.Sellmeier().add(1, 100)
+    for disp in [cauchy, table, summed]:
+        disp.set_cache(cache)
+
+    expected = cauchy.dielectric_function(lbda)
+    assert_array_equal(cauchy.get_dielectric(lbda), expected)
+    assert_array_equal(cauchy.get_dielectric(lbda), expected)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    params["n0"].value = 1.6
+    assert_array_equal(cauchy.get_dielectric(lbda), cauchy.dielectric_function(lbda))
+    assert_array_equal(table.get_dielectric(lbda), table.dielectric_function(lbda))
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert len(cache) == 2
+
+    summed.dispersions[1].rep_params[0]["A"] = 2
+    assert_array_equal(summed.get_dielectric(lbda), summed.dielectric_function(lbda))
+    assert_array_equal(
+        summed.get_dielectric(lbda[:5]), summed.dielectric_function(lbda[:5])
+    )
+    assert cache.misses == 5
+
+    material = cauchy.get_mat()
+    cache.clear()
+    assert_array_equal(
+        material.get_tensor(lbda)[:, 2, 2],
+        cauchy.dielectric_function(lbda),
+    )
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    with raises(ValueError):
+        cauchy.get_dielectric(lbda)[0] = 0
+
+
+def test_stacked_oscillators():
+    """Evaluating all oscillators at once matches the sum of single oscillators."""
+    lbda = np.linspace(200, 1500, 101)
+    oscillators = [(20, 3, 1), (5, 4.5, 0.7), (1, 6, 2)]
+    from lmfit import Parameters
+
+    params = Parameters()
+    params.add("A", value=8)
+
+    tauc_lorentz = elli.TaucLorentz(Eg=1.2)
+    for osc in oscillators:
+        tauc_lorentz.add(*osc)
+    tauc_lorentz.add(A=params["A"], E=5, C=1)
+
+    single = elli.DispersionSum(
+        *[elli.TaucLorentz(Eg=1.2).add(*osc) for osc in oscillators],
+        elli.TaucLorentz(Eg=1.2).add(8, 5, 1),
+    )
+    np.testing.assert_allclose(
+        tauc_lorentz.get_dielectric(lbda), single.get_dielectric(lbda), rtol=1e-12
+    )
+
+    lorentz = elli.LorentzEnergy()
+    assert lorentz.get_dielectric(lbda).shape == lbda.shape
+    assert lorentz.add(1, 4, 0.1).get_dielectric(500).shape == ()
@@ -90,3 +90,36 @@ def test_formula_against_predefined_model(structure, formula_structure):
     formula2x2 = formula_structure.evaluate(lbda, PHI, solver=elli.Solver2x2)
 
     assert_array_almost_equal(predefined2x2.rho, formula2x2.rho)
+
+
+@pytest.mark.parametrize(
+    "formula",
+    [
+        "eps = a + b / x**2",
+        "n = a + 1j * (b / x) - 3",
+        "eps = sum[A * E / (E**2 - (1240 / x)**2 - 1j * (1240 / x))] + a",
+        "eps = sum[x] + sin(x) + sqrt(0 - x) + ln(x) + log(x) + dawsn(x / 100)",
+        "eps = 2 * pi * eps_0 * hbar * h * c + a",
+    ],
+)
+def test_compiled_formula_matches_transformer(formula):
+    """The compiled formula gives the same values as the formula tree transformer"""
+    from elli.formula_parser.parser import (
+        FormulaTransformer,
+        compile_formula,
+        parse_formula,
+    )
+
+    x = np.linspace(300, 900, 7)
+    single_params = {"a": 1.5, "b": 2.0}
+    repeated_params = {"A": np.array([1.0, 2.0]), "E": np.array([2.0, 3.0])}
+
+    expected = FormulaTransformer("x", x, single_params, repeated_params).transform(
+        parse_formula(formula)
+    )
+    representation, values = compile_formula(formula, "x")(
+        x, single_params, repeated_params
+    )
+
+    assert representation == expected[0]
+    np.testing.assert_array_equal(values, expected[1])
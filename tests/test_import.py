@@ -0,0 +1,52 @@
+"""Tests for the lazy import of the package"""
+
+import subprocess
+import sys
+
+
+def test_lazy_import():
+    """Using the core classes does not import the importers, database or formula parser."""
+    code = (
+        "import sys, elli; "
+        "elli.Structure, elli.Layer, elli.Cauchy, elli.Solver4x4, elli.AIR; "
+        "print(' '.join(sys.modules))"
+    )
+    modules = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout.split()
+
+    for module in [
+        "chardet",
+        "h5py",
+        "lark",
+        "pint",
+        "rapidfuzz",
+        "yaml",
+        "elli.database.refractive_index_info",
+        "elli.formula_parser",
+        "elli.importer",
+    ]:
+        assert module not in modules
+
+
+def test_lazy_attributes():
+    """Lazy names are available as attributes and in the namespace."""
+    import elli
+
+    assert elli.Formula.__module__ == "elli.dispersions.formula"
+    assert elli.read_nexus_psi_delta.__module__ == "elli.importer.nexus"
+    assert elli.db.RII.__module__ == "elli.database.refractive_index_info"
+    assert "SolverSMatrix" in dir(elli) and "SolverSMatrix" in elli.__all__
+
+
+def test_star_import():
+    """The star import only contains the public names of the package."""
+    import elli
+
+    namespace = {}
+    exec("from elli import *", namespace)
+
+    for name in elli.__all__:
+        assert name in namespace
+    for name in ["np", "Any", "OrderedDict", "blake2b", "copy", "solver", "structure"]:
+        assert name not in namespace
@@ -141,6 +141,29 @@ class TestTirThickness:
         np.testing.assert_allclose(t2_p, self.t2_th_p)
         np.testing.assert_allclose(t2_s, self.t2_th_s)
 
+    def test_tir_thickness_smatrix(self):
+        data = elli.ResultList(
+            [
+                s.evaluate(self.lbda, np.rad2deg(self.Phi_i), solver=elli.SolverSMatrix)
+                for s in self.structures
+            ]
+        )
+
+        # Extraction of the transmission and reflexion coefficients
+        R_p = data.R_pp
+        R_s = data.R_ss
+        T_p = data.T_pp
+        T_s = data.T_ss
+        t2_p = np.abs(data.t_pp) ** 2  # Before power correction
+        t2_s = np.abs(data.t_ss) ** 2
+
+        np.testing.assert_allclose(R_p, self.R_th_p)
+        np.testing.assert_allclose(R_s, self.R_th_s)
+        np.testing.assert_allclose(T_p, self.T_th_p)
+        np.testing.assert_allclose(T_s, self.T_th_s)
+        np.testing.assert_allclose(t2_p, self.t2_th_p)
+        np.testing.assert_allclose(t2_s, self.t2_th_s)
+
     def test_tir_thickness_2x2(self):
         data = elli.ResultList(
             [
@@ -300,6 +323,29 @@ class TestTirAngle:
         np.testing.assert_allclose(t2_p, self.t2_th_p)
         np.testing.assert_allclose(t2_s, self.t2_th_s)
 
+    def test_tir_angle_smatrix(self):
+        data = elli.ResultList(
+            [
+                self.s.evaluate(self.lbda, np.rad2deg(Phi_i), solver=elli.SolverSMatrix)
+                for Phi_i in self.Phi_list
+            ]
+        )
+
+        # Extraction of the transmission and reflexion coefficients
+        R_p = data.R_pp
+        R_s = data.R_ss
+        T_p = data.T_pp
+        T_s = data.T_ss
+        t2_p = np.abs(data.t_pp) ** 2  # Before power correction
+        t2_s = np.abs(data.t_ss) ** 2
+
+        np.testing.assert_allclose(R_p, self.R_th_p)
+        np.testing.assert_allclose(R_s, self.R_th_s)
+        np.testing.assert_allclose(T_p, self.T_th_p)
+        np.testing.assert_allclose(T_s, self.T_th_s)
+        np.testing.assert_allclose(t2_p, self.t2_th_p)
+        np.testing.assert_allclose(t2_s, self.t2_th_s)
+
     def test_tir_angle_2x2(self):
         data = elli.ResultList(
             [
@@ -2,8 +2,9 @@
 
 import elli
 import numpy as np
-from elli.kkr import im2re, im2re_reciprocal
-from numpy.testing import assert_array_almost_equal
+import pytest
+from elli.kkr import im2re, im2re_reciprocal, kkr
+from numpy.testing import assert_allclose, assert_array_almost_equal
 
 
 def test_tauc_lorentz():
@@ -51,3 +52,55 @@ def test_gauss():
         g.get_dielectric(lbda).real[:-1000],
         decimal=2,
     )
+
+
+@pytest.mark.parametrize(
+    "trafo",
+    [kkr.re2im, kkr.im2re, kkr.re2im_reciprocal, kkr.im2re_reciprocal],
+)
+@pytest.mark.parametrize("start", [0.5, 1e-2])
+def test_fft_backend(trafo, start):
+    """The FFT backend reproduces the direct summation on equidistant axes."""
+    x = np.linspace(start, 10, 1001)
+    y = np.exp(-((x - 3) ** 2))
+
+    assert_allclose(
+        trafo(y, x, backend="fft"),
+        trafo(y, x, backend="maclaurin"),
+        rtol=0,
+        atol=1e-12,
+    )
+
+
+def test_blocked_maclaurin(monkeypatch):
+    """The blocked direct summation is independent of the block size."""
+    x = np.geomspace(0.1, 10, 501)
+    y = np.exp(-((x - 3) ** 2))
+    expected = kkr.im2re(y, x)
+
+    monkeypatch.setattr(kkr, "_BLOCK_SIZE", 1000)
+    assert_allclose(kkr.im2re(y, x), expected, rtol=1e-13, atol=0)
+
+
+def test_backend_selection():
+    """The FFT backend is rejected for non-equidistant axes."""
+    x = np.geomspace(0.1, 10, 101)
+
+    with pytest.raises(ValueError):
+        kkr.im2re(np.ones_like(x), x, backend="fft")
+
+
+@pytest.mark.parametrize("backend", ["fft", "maclaurin"])
+def test_batched_spectra(backend):
+    """Several spectra on the same axis are transformed at once."""
+    x = np.linspace(0.5, 10, 501)
+    y = np.exp(-((x - np.array([[2], [3], [5]])) ** 2))
+    kernel = kkr.KramersKronigKernel(x, "im2re_reciprocal", backend)
+
+    expected = [kkr.im2re_reciprocal(spectrum, x, backend) for spectrum in y]
+    assert_allclose(kernel.transform(y), expected, rtol=0, atol=1e-12)
+    assert_allclose(kkr.im2re_reciprocal(y, x, backend), expected, rtol=0, atol=1e-12)
+    assert_allclose(kernel.transform(y[1]), expected[1], rtol=0, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        kernel.transform(y[:, :-1])
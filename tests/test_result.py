@@ -50,3 +50,80 @@ def test_resultlist_shape(result):
 
     assert np.shape(result_list.mean.delta) == (50,)
     assert np.allclose(result_list.mean.delta, result.delta)
+
+
+def test_cached_properties():
+    """Derived properties are calculated once and reset with the delta range."""
+    SiO2 = elli.Cauchy(1.452, 36.0).get_mat()
+    structure = elli.Structure(
+        elli.AIR,
+        [elli.Layer(SiO2, 500)],
+        elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat(),
+    )
+    result = structure.evaluate(np.linspace(250, 800), 70)
+
+    assert result.mueller_matrix is result.mueller_matrix
+    assert result.rho_matrix is result.rho_matrix
+    with raises(ValueError):
+        result.psi[0] = 0
+
+    delta = result.delta
+    result.as_delta_range(0, 360)
+    assert result.delta is not delta
+    np.testing.assert_allclose(result.delta, np.mod(delta, 360))
+
+    uncached = elli.Result(
+        result.experiment, result.jones_matrix_r.copy(), result.jones_matrix_t.copy()
+    )
+    np.testing.assert_allclose(result.mueller_matrix, uncached.mueller_matrix)
+    np.testing.assert_allclose(result.r_LR, uncached.r_LR)
+
+
+def test_stacked_resultlist():
+    """A StackedResultList returns the same data as the ResultList."""
+    SiO2 = elli.Cauchy(1.452, 36.0).get_mat()
+    substrate = elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat()
+    results = [
+        elli.Structure(elli.AIR, [elli.Layer(SiO2, d)], substrate)
+        .evaluate(np.linspace(250, 800), 70)
+        .as_delta_range(0, 360)
+        for d in np.linspace(480, 520, 5)
+    ]
+    result_list = elli.ResultList(results)
+
+    # The arrays are allocated once for the initial results
+    assert len(elli.StackedResultList(results)._jones_matrix_r) == len(results)
+
+    stacked = elli.StackedResultList(results[:3])
+    assert len(stacked._jones_matrix_r) == 3
+    for result in results[3:]:
+        stacked.append(result)
+
+    assert len(stacked) == 5
+    assert len(stacked._jones_matrix_r) == 6
+    for name in ["delta", "psi_pp", "mueller_matrix", "T", "r_LR"]:
+        np.testing.assert_allclose(getattr(stacked, name), getattr(result_list, name))
+        np.testing.assert_allclose(
+            getattr(stacked.mean, name), getattr(result_list.mean, name)
+        )
+
+    with raises(ValueError):
+        stacked.mean.mean
+
+    with raises(ValueError):
+        stacked.append(elli.Result(None, np.zeros((3, 2, 2)), None))
+
+    other_range = elli.Structure(elli.AIR, [elli.Layer(SiO2, 500)], substrate).evaluate(
+        np.linspace(250, 800), 70
+    )
+    with raises(ValueError):
+        stacked.append(other_range)
+
+    # The averaged list is not affected by later appends
+    mean = stacked.mean
+    delta = mean.delta
+    for result in results:
+        stacked.append(result)
+    assert len(stacked) == 10
+    assert len(mean) == 5
+    np.testing.assert_array_equal(mean.delta, delta)
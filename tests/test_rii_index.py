@@ -0,0 +1,171 @@
+"""Tests for the binary index of the refractiveindex.info catalog,
+using a small database in a temporary directory."""
+
+import os
+import pickle
+
+import elli
+import numpy as np
+import pytest
+from elli.database import refractive_index_info as rii
+
+CATALOG = """
+- SHELF: main
+  name: "MAIN - simple inorganic materials"
+  content:
+    - DIVIDER: "Metals"
+    - BOOK: Au
+      name: "Au (Gold)"
+      content:
+        - DIVIDER: "Experimental data"
+        - PAGE: Johnson
+          name: "Johnson and Christy 1972: n,k 0.188–1.94 µm"
+          data: "main/Au/Johnson.yml"
+    - DIVIDER: "Dielectrics"
+    - BOOK: SrTiO3
+      name: "SrTiO3 (Strontium titanate)"
+      content:
+        - PAGE: Dodge
+          name: "Dodge 1986: n 0.43–3.8 µm"
+          data: "main/SrTiO3/Dodge.yml"
+"""
+
+PAGES = {
+    "main/Au/Johnson.yml": """
+REFERENCES: "P. B. Johnson and R. W. Christy"
+COMMENTS: "Room temperature"
+DATA:
+  - type: tabulated nk
+    data: |
+        0.1879 1.28 1.188
+        0.3107 1.53 1.893
+        0.6199 0.21 3.272
+        1.937 0.27 7.150
+""",
+    "main/SrTiO3/Dodge.yml": """
+REFERENCES: "M. J. Dodge"
+COMMENTS: "20 °C"
+DATA:
+  - type: formula 1
+    coefficients: 0 3.042143 0.1475902 1.170065 0.2953086 30.83326 9.827445
+""",
+}
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Creates a small database and uses a temporary cache directory."""
+    path = tmp_path / "database"
+    path.mkdir()
+    (path / "catalog-nk.yml").write_text(CATALOG, encoding="utf8")
+    for name, content in PAGES.items():
+        page = path / "data-nk" / name
+        page.parent.mkdir(parents=True, exist_ok=True)
+        page.write_text(content, encoding="utf8")
+
+    monkeypatch.setattr(rii, "files", lambda _: path)
+    monkeypatch.setattr(rii, "CACHE_DIR", str(tmp_path / "cache"))
+    return path
+
+
+def test_catalog_index(database, monkeypatch):
+    """The catalog is parsed once and loaded from the index afterwards."""
+    db = elli.db.RII()
+    assert list(db.catalog["book"]) == ["Au", "SrTiO3"]
+    assert list(db.catalog["author"]) == ["Johnson and Christy", "Dodge"]
+    assert list(db.catalog["upper_range"]) == [1940, 3800]
+    assert os.path.isfile(rii._index_path(database))
+
+    def fail(_):
+        raise AssertionError("The catalog was parsed again.")
+
+    monkeypatch.setattr(rii, "_parse_catalog", fail)
+    indexed = elli.db.RII()
+    assert indexed.catalog.equals(db.catalog)
+    assert list(indexed._filter_lists["book"]) == ["Au", "SrTiO3"]
+
+    with pytest.raises(AssertionError):
+        elli.db.RII(rebuild_index=True)
+
+
+def test_stale_catalog_index(database):
+    """The index is rebuilt after a change of the catalog file or a broken index."""
+    elli.db.RII()
+    catalog = database / "catalog-nk.yml"
+    catalog.write_text(CATALOG.replace("Johnson and Christy", "Johnson"), "utf8")
+    stat = os.stat(catalog)
+    os.utime(catalog, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert list(elli.db.RII().catalog["author"]) == ["Johnson", "Dodge"]
+
+    with open(rii._index_path(database), "wb") as file:
+        pickle.dump("broken", file)
+    assert len(elli.db.RII().catalog) == 2
+
+
+def test_dispersion_cache(database, monkeypatch):
+    """Pages are parsed once and dispersions are created once per process."""
+    monkeypatch.setattr(rii, "_DISPERSIONS", rii.OrderedDict())
+    db = elli.db.RII()
+
+    gold = db.get_dispersion("Au", "Johnson")
+    np.testing.assert_almost_equal(
+        gold.get_refractive_index(310.7), 1.53 + 1j * 1.893, decimal=3
+    )
+    sellmeier = elli.Sellmeier()
+    sellmeier.add(3.042143, 0.1475902**2)
+    sellmeier.add(1.170065, 0.2953086**2)
+    sellmeier.add(30.83326, 9.827445**2)
+    np.testing.assert_allclose(
+        db.get_dispersion("SrTiO3", "Dodge").get_dielectric(np.linspace(450, 3000)),
+        (sellmeier + elli.EpsilonInf(0)).get_dielectric(np.linspace(450, 3000)),
+    )
+    assert db.get_reference("Au", "Johnson") == "P. B. Johnson and R. W. Christy"
+    assert len(rii._DISPERSIONS) == 2
+
+    def fail(_):
+        raise AssertionError("The page was parsed again.")
+
+    # Created dispersions are copied from memory
+    monkeypatch.setattr(rii.RII, "_read_page", fail)
+    copy = db.get_dispersion("Au", "Johnson")
+    assert copy is not gold
+    np.testing.assert_array_equal(
+        copy.get_dielectric(np.linspace(300, 1000)),
+        gold.get_dielectric(np.linspace(300, 1000)),
+    )
+    monkeypatch.undo()
+
+    # Parsed pages are loaded from the cache directory
+    monkeypatch.setattr(rii, "files", lambda _: database)
+    monkeypatch.setattr(rii, "CACHE_DIR", str(database.parent / "cache"))
+    monkeypatch.setattr(rii, "_DISPERSIONS", rii.OrderedDict())
+    monkeypatch.setattr(rii, "_parse_page", fail)
+    assert db.get_comment("SrTiO3", "Dodge") == "20 °C"
+    db.get_mat("Au", "Johnson")
+
+    with pytest.raises(ValueError):
+        db.get_dispersion("Au", "Dodge")
+
+
+def test_search_index(database):
+    """Fuzzy, exact and prefix queries are answered from the search index."""
+    db = elli.db.RII()
+
+    assert list(db.search("Johnson", column="author").book) == ["Au"]
+    assert list(db.search("Johnsen and Christy").book) == ["Au"]
+    assert list(db.search(["Dodge", "Au"], fuzzy=False).book) == ["Au", "SrTiO3"]
+    assert list(db.search("Au", column="page", fuzzy=False).book) == []
+    assert list(db.search("Johnson", column="author").index) == [0]
+
+    assert list(db.search("s", column="book", prefix=True).book) == ["SrTiO3"]
+    assert list(db.search("SRT", prefix=True).page) == ["Dodge"]
+    assert list(db.search("", column="book", prefix=True).book) == ["Au", "SrTiO3"]
+    assert len(db.search("x", prefix=True)) == 0
+
+    assert list(db.search("", prefix=True, wavelength_filter=300).book) == ["Au"]
+    assert list(db.search("", prefix=True, wavelength_filter=[500, 3000]).book) == [
+        "SrTiO3"
+    ]
+
+    with pytest.raises(ValueError):
+        db.search("Au", wavelength_filter="visible")
@@ -23,3 +23,469 @@ def test_solver2x2_inverse_active_medium():
         s.evaluate([200, 300, 400, 500], 70, solver=elli.Solver2x2)
         assert len(w) == 1
         assert issubclass(w[-1].category, UserWarning)
+
+
+def test_multi_angle_evaluation():
+    """Batched angles give the same result as single angle evaluations."""
+    lbda = np.linspace(300, 800, 20)
+    angles = [45, 60, 70, 75]
+    s = elli.Structure(
+        elli.AIR,
+        [elli.Layer(elli.Cauchy(1.452, 36.0).get_mat(), 300)],
+        elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat(),
+    )
+
+    for solver in [elli.Solver2x2, elli.Solver4x4]:
+        result = s.evaluate(lbda, angles, solver=solver)
+
+        assert result.psi.shape == (len(angles), len(lbda))
+        assert result.mueller_matrix.shape == (len(angles), len(lbda), 4, 4)
+
+        for i, angle in enumerate(angles):
+            single = s.evaluate(lbda, angle, solver=solver)
+            np.testing.assert_allclose(result.rho[i], single.rho)
+            np.testing.assert_allclose(result.T[i], single.T)
+            np.testing.assert_allclose(result.r_ss[i], single.r_ss)
+
+
+def test_propagator_analytic():
+    """The closed-form propagator equals the matrix exponential for diagonal tensors."""
+    lbda = np.linspace(300, 800, 20)
+    propagator = elli.PropagatorAnalytic()
+
+    uniaxial = elli.UniaxialMaterial(
+        elli.ConstantRefractiveIndex(2.0), elli.ConstantRefractiveIndex(2.3 + 0.1j)
+    )
+    rotated = elli.UniaxialMaterial(
+        elli.ConstantRefractiveIndex(2.0), elli.ConstantRefractiveIndex(2.3 + 0.1j)
+    )
+    rotated.set_rotation(elli.rotation_euler(20, 30, 0))
+
+    for material in [elli.Cauchy(1.452, 36.0, k0=0.1).get_mat(), uniaxial, rotated]:
+        delta = elli.Solver4x4.build_delta_matrix(
+            np.full_like(lbda, 0.7), material.get_tensor(lbda)
+        )
+        np.testing.assert_allclose(
+            propagator.calculate_propagation(delta, -150, lbda),
+            elli.PropagatorExpm(backend="scipy").calculate_propagation(
+                delta, -150, lbda
+            ),
+            atol=1e-12,
+        )
+
+
+def test_transfer_matrix_cache():
+    """Incremental evaluation with a cache gives the same results."""
+    lbda = np.linspace(300, 800, 50)
+    layers = [
+        elli.Layer(elli.Cauchy(1.45 + 0.1 * i, 30).get_mat(), 50 + 10 * i)
+        for i in range(6)
+    ]
+    s = elli.Structure(elli.AIR, layers, elli.Cauchy(3.8, k0=0.02).get_mat())
+    cache = elli.TransferMatrixCache()
+
+    for i in [0, 3, 5, 0, 3]:
+        layers[i].set_thickness(layers[i].thickness + 1)
+        np.testing.assert_allclose(
+            s.evaluate(lbda, 70, cache=cache).rho, s.evaluate(lbda, 70).rho
+        )
+
+    # Only the changed layer is recalculated after the first evaluation
+    assert cache.misses == len(layers) + 4
+
+
+def test_jacobian():
+    """The derivatives of the solvers match finite differences."""
+    from lmfit import Parameters
+
+    params = Parameters()
+    params.add("n0", value=1.6)
+    params.add("n1", value=80.0)
+    params.add("d", value=120.0)
+    params.add("d_period", value=30.0)
+    params.add("n_back", value=1.5)
+
+    def model(params, angle, solver, **kwargs):
+        material = elli.Cauchy(n0=params["n0"], n1=params["n1"]).get_mat()
+        period = elli.Cauchy(n0=1.45, n1=params["n1"]).get_mat()
+        return elli.Structure(
+            elli.AIR,
+            [
+                elli.Layer(material, params["d"]),
+                elli.RepeatedLayers(
+                    [elli.Layer(period, params["d_period"]), elli.Layer(material, 40)],
+                    3,
+                ),
+            ],
+            elli.Cauchy(n0=params["n_back"]).get_mat(),
+        ).evaluate(np.linspace(400, 800, 10), angle, solver=solver, **kwargs)
+
+    for solver, kwargs in [
+        (elli.Solver2x2, {}),
+        (elli.Solver4x4, {}),
+        (elli.Solver4x4, {"propagator": elli.PropagatorExpm()}),
+        (elli.SolverSMatrix, {}),
+    ]:
+        for angle in [70, [50, 70]]:
+            result = model(params, angle, solver, **kwargs)
+            jacobian = result.jacobian("rho", list(params))
+
+            for derivative, name in zip(jacobian, params):
+                shifted = []
+                for sign in [1, -1]:
+                    shifted_params = params.copy()
+                    shifted_params[name].value += sign * 1e-5
+                    shifted.append(model(shifted_params, angle, solver, **kwargs).rho)
+
+                np.testing.assert_allclose(
+                    derivative, (shifted[0] - shifted[1]) / 2e-5, rtol=1e-6, atol=1e-9
+                )
+
+
+def test_parameter_sets():
+    """Batched parameter sets give the same result as single evaluations."""
+    from lmfit import Parameters
+
+    params = Parameters()
+    params.add("n0", value=1.6)
+    params.add("d", value=120.0)
+    params.add("d_period", value=30.0)
+
+    lbda = np.linspace(400, 800, 10)
+    material = elli.Cauchy(n0=params["n0"], n1=80.0).get_mat()
+    structure = elli.Structure(
+        elli.AIR,
+        [
+            elli.Layer(material, params["d"]),
+            elli.RepeatedLayers(
+                [
+                    elli.Layer(elli.Cauchy(n0=1.45).get_mat(), params["d_period"]),
+                    elli.Layer(material, 40),
+                ],
+                3,
+            ),
+        ],
+        elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat(),
+    )
+    parameter_sets = {
+        "n0": [1.5, 1.6, 1.7],
+        "d": [50.0, 120.0, 200.0],
+        "d_period": [20.0, 30.0, 10.0],
+    }
+
+    for solver in [elli.Solver2x2, elli.Solver4x4, elli.SolverSMatrix]:
+        for angle in [70, [50, 70]]:
+            result = structure.evaluate_batch(lbda, angle, parameter_sets, solver)
+            assert result.rho.shape == (3,) + np.shape(angle) + lbda.shape
+
+            for i in range(3):
+                for name, values in parameter_sets.items():
+                    params[name].value = values[i]
+                single = structure.evaluate(lbda, angle, solver)
+                np.testing.assert_allclose(result.rho[i], single.rho)
+                np.testing.assert_allclose(result.T[i], single.T)
+
+    with raises(ValueError):
+        structure.evaluate_batch(lbda, 70, {"unknown": [1.0, 2.0]})
+
+
+def test_parameter_substitution():
+    """Parameter sets are evaluated on copies, the structure keeps its parameters."""
+    from lmfit import Parameters
+
+    from elli.solver import _substitute_parameters
+
+    params = Parameters()
+    params.add("n0", value=1.6)
+    params.add("d", value=120.0)
+
+    lbda = np.linspace(400, 800, 10)
+    dispersion = elli.Cauchy(n0=params["n0"])
+    layer = elli.Layer(dispersion.get_mat(), params["d"])
+    structure = elli.Structure(
+        elli.AIR, [layer], elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat()
+    )
+
+    shifted = _substitute_parameters(structure, {"n0": 1.5})
+    assert shifted is not structure
+    assert shifted.layers[0].thickness is params["d"]
+    assert shifted.back_material is structure.back_material
+    assert dispersion.single_params["n0"] is params["n0"]
+    np.testing.assert_allclose(
+        shifted.layers[0].material.get_refractive_index(lbda)[:, 0, 0], 1.5
+    )
+    np.testing.assert_allclose(layer.material.get_refractive_index(lbda)[:, 0, 0], 1.6)
+    assert _substitute_parameters(structure, {"unknown": 1.0}) is structure
+
+    result = structure.evaluate_batch(lbda, 70, {"n0": [1.5, 1.7], "d": [50, 100]})
+    assert layer.thickness is params["d"]
+    params["n0"].value = 1.7
+    params["d"].value = 100
+    np.testing.assert_allclose(result.rho[1], structure.evaluate(lbda, 70).rho)
+
+
+def test_experiment_snapshot():
+    """Solvers work on a snapshot, which shares the materials with the structure."""
+    lbda = np.linspace(400, 800, 10)
+    material = elli.Cauchy(1.452, 36.0).get_mat()
+    layer = elli.Layer(material, 100)
+    structure = elli.Structure(
+        elli.AIR, [layer], elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat()
+    )
+
+    result = structure.evaluate(lbda, 70)
+    snapshot = result.experiment.structure
+    assert snapshot is not structure
+    assert snapshot.layers[0] is not layer
+    assert snapshot.layers[0].material is material
+    assert not result.experiment.lbda.flags.writeable
+
+    psi = result.psi.copy()
+    layer.set_thickness(200)
+    structure.layers.append(elli.Layer(material, 50))
+    np.testing.assert_array_equal(result.psi, psi)
+    assert result.permittivity_profile[1][0] == 100
+
+
+def test_packed_profile():
+    """Packed layer sequences give the same result as layer by layer propagation."""
+    from elli.solver import PackedProfile, RepeatedProfile, pack_profile
+
+    lbda = np.linspace(400, 800, 10)
+    uniaxial = elli.UniaxialMaterial(
+        elli.ConstantRefractiveIndex(1.5), elli.ConstantRefractiveIndex(1.7)
+    )
+    structure = elli.Structure(
+        elli.AIR,
+        [
+            elli.Layer(elli.Cauchy(1.452, 36.0).get_mat(), 100),
+            elli.TwistedLayer(uniaxial, 500, 20, 90),
+            elli.RepeatedLayers(
+                [
+                    elli.Layer(elli.ConstantRefractiveIndex(2.0).get_mat(), 30),
+                    elli.Layer(elli.ConstantRefractiveIndex(1.4).get_mat(), 40),
+                ],
+                5,
+            ),
+        ],
+        elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat(),
+    )
+
+    profile = structure.get_compact_permittivity_profile(lbda)[1:-1]
+    packed = pack_profile(profile)
+    assert isinstance(packed[0], PackedProfile)
+    assert isinstance(packed[1], RepeatedProfile)
+    assert len(packed[0]) == 21
+    np.testing.assert_array_equal(packed[0].isotropic, [True] + 20 * [False])
+    for (thickness, epsilon), entry in zip(packed[0].unpack(), profile):
+        assert thickness == entry[0]
+        np.testing.assert_array_equal(epsilon, entry[1])
+
+    solver = elli.Solver4x4(elli.Experiment(structure, lbda, 70))
+    result = solver.calculate()
+    solver.max_pack_size = 1
+    np.testing.assert_allclose(solver.calculate().rho, result.rho)
+
+
+def test_solver_smatrix():
+    """The scattering matrix solver matches the Solver4x4 and stays finite for thick absorbing layers."""
+    lbda = np.linspace(400, 800, 10)
+    isotropic = elli.Cauchy(1.5, k0=0.05).get_mat()
+    rotated = elli.UniaxialMaterial(
+        elli.Cauchy(1.5, k0=0.1), elli.ConstantRefractiveIndex(1.7)
+    )
+    rotated.set_rotation(elli.rotation_euler(30, 40, 10))
+
+    for back in [elli.Cauchy(3.8, k0=0.2).get_mat(), rotated]:
+        structure = elli.Structure(
+            elli.AIR,
+            [
+                elli.Layer(isotropic, 100),
+                elli.TwistedLayer(rotated, 100, 5, 90),
+                elli.RepeatedLayers(
+                    [
+                        elli.Layer(elli.Cauchy(2.1).get_mat(), 30),
+                        elli.Layer(isotropic, 40),
+                    ],
+                    4,
+                    1,
+                ),
+            ],
+            back,
+        )
+        for angle in [70, [30, 60]]:
+            expected = structure.evaluate(lbda, angle)
+            result = structure.evaluate(lbda, angle, solver=elli.SolverSMatrix)
+            np.testing.assert_allclose(
+                result.jones_matrix_r, expected.jones_matrix_r, atol=1e-12
+            )
+            np.testing.assert_allclose(
+                result.jones_matrix_t, expected.jones_matrix_t, atol=1e-12
+            )
+
+    metal = elli.Cauchy(0.2, k0=3.5).get_mat()
+    thick = elli.Structure(
+        elli.AIR, [elli.Layer(metal, 1e6)], elli.Cauchy(1.5).get_mat()
+    ).evaluate(lbda, 70, solver=elli.SolverSMatrix)
+    bulk = elli.Structure(elli.AIR, [], metal).evaluate(lbda, 70)
+    np.testing.assert_allclose(thick.rho, bulk.rho)
+    np.testing.assert_array_equal(thick.T, 0)
+
+
+def test_parallel_execution():
+    """Chunked evaluations in thread and process pools equal the single evaluation."""
+    lbda = np.linspace(400, 800, 10)
+    structure = elli.Structure(
+        elli.AIR,
+        [elli.Layer(elli.Cauchy(1.452, 36.0).get_mat(), 100)],
+        elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat(),
+    )
+    expected = structure.evaluate(lbda, [50, 70])
+
+    for executor in ["thread", "process"]:
+        execution = elli.ParallelExecution(executor, max_workers=2, chunk_size=3)
+        assert len(execution.chunks(lbda.shape[0])) == 4
+
+        result = structure.evaluate(lbda, [50, 70], execution=execution)
+        assert result.solver is None
+        np.testing.assert_allclose(result.rho, expected.rho)
+        np.testing.assert_allclose(result.T, expected.T)
+
+    with raises(ValueError):
+        elli.ParallelExecution("gpu")
+
+
+def test_parallel_parameter_sets():
+    """Chunks of parameter set batches share the structure in a thread pool."""
+    from lmfit import Parameters
+
+    params = Parameters()
+    params.add("n0", value=1.6)
+    params.add("d", value=120.0)
+
+    lbda = np.linspace(400, 800, 40)
+    layer = elli.Layer(elli.Cauchy(n0=params["n0"], n1=80.0).get_mat(), params["d"])
+    structure = elli.Structure(
+        elli.AIR, [layer], elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat()
+    )
+    parameter_sets = {"n0": np.linspace(1.4, 1.8, 200), "d": np.linspace(50, 200, 200)}
+    expected = structure.evaluate_batch(lbda, 70, parameter_sets)
+
+    execution = elli.ParallelExecution("thread", max_workers=8)
+    for _ in range(5):
+        result = structure.evaluate_batch(lbda, 70, parameter_sets, execution=execution)
+        np.testing.assert_allclose(result.rho, expected.rho)
+        assert layer.thickness is params["d"]
+
+
+def test_result_cache(tmp_path):
+    """Stored results are returned without solving and evicted by size."""
+    lbda = np.linspace(400, 800, 10)
+    layer = elli.Layer(elli.Cauchy(1.452, 36.0).get_mat(), 100)
+    structure = elli.Structure(
+        elli.AIR, [layer], elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat()
+    )
+    expected = structure.evaluate(lbda, [50, 70])
+
+    cache = elli.ResultCache(tmp_path)
+    result = structure.evaluate(lbda, [50, 70], result_cache=cache)
+    np.testing.assert_array_equal(result.rho, expected.rho)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 1, 1)
+
+    # A new cache object reads the results of earlier runs
+    cache = elli.ResultCache(tmp_path)
+    result = structure.evaluate(lbda, [50, 70], result_cache=cache)
+    np.testing.assert_array_equal(result.rho, expected.rho)
+    np.testing.assert_array_equal(result.T, expected.T)
+    assert result.solver is not None
+    assert (cache.hits, cache.misses) == (1, 0)
+
+    structure.evaluate(lbda, [50, 70], solver=elli.Solver2x2, result_cache=cache)
+    layer.set_thickness(120)
+    result = structure.evaluate(lbda, [50, 70], result_cache=cache)
+    np.testing.assert_array_equal(result.rho, structure.evaluate(lbda, [50, 70]).rho)
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 3)
+
+    cache.max_size = 1
+    structure.evaluate(lbda, 70, result_cache=cache)
+    assert len(cache) == 0
+
+    cache.clear()
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_result_cache_eviction(tmp_path, monkeypatch):
+    """The cache directory is only scanned when the size limit is exceeded."""
+    lbda = np.linspace(400, 800, 10)
+    layer = elli.Layer(elli.Cauchy(1.452, 36.0).get_mat(), 100)
+    structure = elli.Structure(
+        elli.AIR, [layer], elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat()
+    )
+    cache = elli.ResultCache(tmp_path)
+    structure.evaluate(lbda, 70, result_cache=cache)
+    (entry,) = cache._entries()
+    cache.max_size = 4 * entry[1]
+
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+    for thickness in [110, 120, 130]:
+        layer.set_thickness(thickness)
+        structure.evaluate(lbda, 70, result_cache=cache)
+    assert len(scans) == 0
+
+    # Exceeding the limit frees space down to the low-water mark
+    layer.set_thickness(140)
+    structure.evaluate(lbda, 70, result_cache=cache)
+    assert len(scans) == 1
+    assert sum(size for _, size, _ in entries()) <= 0.9 * cache.max_size
+    assert len(entries()) == 3
+
+
+def test_result_cache_parameters(tmp_path, monkeypatch):
+    """Fit models with Parameter thicknesses are cached,
+    parallel misses evaluate the permittivity profile once."""
+    from lmfit import Parameters
+
+    params = Parameters()
+    params.add("d", value=100.0)
+
+    lbda = np.linspace(400, 800, 10)
+    structure = elli.Structure(
+        elli.AIR,
+        [elli.Layer(elli.Cauchy(1.452, 36.0).get_mat(), params["d"])],
+        elli.ConstantRefractiveIndex(3.8 + 0.02j).get_mat(),
+    )
+    expected = structure.evaluate(lbda, [50, 70])
+
+    evaluations = []
+    get_profile = elli.Structure.get_compact_permittivity_profile
+
+    def count_profile(self, lbda):
+        evaluations.append(lbda.shape)
+        return get_profile(self, lbda)
+
+    monkeypatch.setattr(
+        elli.Structure, "get_compact_permittivity_profile", count_profile
+    )
+
+    cache = elli.ResultCache(tmp_path)
+    execution = elli.ParallelExecution("thread", max_workers=2, chunk_size=3)
+    for executor in [None, execution]:
+        cache.clear()
+        evaluations.clear()
+        result = structure.evaluate(
+            lbda, [50, 70], execution=executor, result_cache=cache
+        )
+        np.testing.assert_allclose(result.rho, expected.rho)
+        np.testing.assert_allclose(result.T, expected.T)
+        assert result.solver is not None
+        assert evaluations == [lbda.shape]
+
+    result = structure.evaluate(lbda, [50, 70], result_cache=cache)
+    assert cache.hits == 1
+
+    params["d"].value = 120
+    result = structure.evaluate(lbda, [50, 70], result_cache=cache)
+    assert cache.misses == 2
+    np.testing.assert_allclose(result.rho, structure.evaluate(lbda, [50, 70]).rho)
@@ -71,3 +71,70 @@ class TestStructures:
             vml.get_permittivity_profile(500)[1][1],
             (elli.AIR.get_tensor(500) + self.mat.get_tensor(500)) / 2,
         )
+
+    def test_vectorized_slices(self):
+        """Vectorized slice evaluation equals the evaluation slice by slice."""
+        lbda = np.linspace(400, 800, 10)
+        z = np.linspace(0, 100, 7)
+        uniaxial = elli.UniaxialMaterial(
+            elli.Cauchy(1.5, k0=0.1), elli.ConstantRefractiveIndex(1.7)
+        )
+        layers = [elli.TwistedLayer(uniaxial, 100, 6, 270)]
+        for mixture in [
+            elli.VCAMaterial,
+            elli.LooyengaEMA,
+            elli.MaxwellGarnettEMA,
+            elli.BruggemanEMA,
+        ]:
+            layers.append(
+                elli.VaryingMixtureLayer(
+                    mixture(self.mat, uniaxial, 0.5), 100, 6, lambda x: x**2
+                )
+            )
+
+        for layer in layers:
+            np.testing.assert_allclose(
+                layer.get_tensors(z, lbda),
+                [layer.get_tensor(z_i, lbda) for z_i in z],
+                atol=1e-14,
+            )
+
+    def test_epsilon_profile(self):
+        """The scalar profile of isotropic layers equals the xx component of the tensors."""
+        lbda = np.linspace(400, 800, 10)
+        isotropic = elli.Cauchy(1.5, k0=0.1).get_mat()
+        uniaxial = elli.UniaxialMaterial(
+            elli.Cauchy(1.5, k0=0.1), elli.ConstantRefractiveIndex(1.7)
+        )
+        assert isotropic.symmetry == "isotropic"
+        assert uniaxial.symmetry == "uniaxial"
+        with raises(ValueError):
+            uniaxial.get_epsilon(lbda)
+
+        layers = [
+            self.layer,
+            elli.Layer(uniaxial, 30),
+            elli.TwistedLayer(isotropic, 100, 4, 90),
+            elli.RepeatedLayers([self.layer, elli.Layer(isotropic, 10)], 3, 1),
+        ]
+        for mixture in [
+            elli.VCAMaterial,
+            elli.LooyengaEMA,
+            elli.MaxwellGarnettEMA,
+            elli.BruggemanEMA,
+        ]:
+            assert mixture(self.mat, isotropic, 0.3).symmetry == "isotropic"
+            layers.append(
+                elli.VaryingMixtureLayer(
+                    mixture(self.mat, isotropic, 0.5), 100, 6, lambda x: x**2
+                )
+            )
+        structure = elli.Structure(elli.AIR, layers, uniaxial)
+
+        profile = structure.get_permittivity_profile(lbda)
+        epsilon_profile = structure.get_epsilon_profile(lbda)
+        assert len(profile) == len(epsilon_profile)
+        for (d, tensor), (d_scalar, epsilon) in zip(profile, epsilon_profile):
+            assert d == d_scalar
+            assert epsilon.shape == lbda.shape
+            np.testing.assert_allclose(epsilon, tensor[:, 0, 0], rtol=1e-14)